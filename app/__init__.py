@@ -1,9 +1,8 @@
 import os
-import json
-import logging.config
+import sys
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
-from mongoengine import disconnect, connect
 from starlette.middleware.cors import CORSMiddleware
 
 # Carrega as variáveis de ambiente do arquivo .env
@@ -12,6 +11,83 @@ load_dotenv()
 # TODO: Defina o nome curto do seu projeto para ser usado nas classes e na nomeação de arquivos. Remover este comentário depois.
 APP_TITLE: str = "projeto"
 
+# Endereço do MongoDB usado pelos repositórios (a conexão é aberta apenas na inicialização da aplicação)
+host_mongo = os.getenv("MONGO_DB_URL")
+
+
+def iniciar_recursos():
+    """
+    Inicializa os recursos compartilhados da aplicação: logging, conexão mongoengine e estrutura de pastas.
+
+    É chamada pelo lifespan do FastAPI e pode ser chamada diretamente por scripts e workers
+    que utilizam os modelos sem subir a API.
+    """
+    from app.repository.mongo_client import conectar
+    from app.repository.tarefas_lease import iniciar_reaper
+    from app.services.jobs_service import iniciar_pool_jobs
+    from app.utils.files import Files
+    from app.utils.logs import iniciar_logging
+
+    iniciar_logging()
+
+    # Inicializa o banco de dados mongoengine (pool único por processo)
+    conectar()
+
+    # Criar a estrutura de pastas necessárias para rodar a aplicação.
+    Files.create_folder_structure()
+
+    # Libera periodicamente as filas de workers que pararam sem finalizar a tarefa.
+    iniciar_reaper()
+
+    # Consome a fila de jobs neste processo se JOBS_WORKERS > 0 (os handlers devem estar registrados).
+    iniciar_pool_jobs()
+
+
+def encerrar_recursos():
+    """
+    Libera os recursos abertos em `iniciar_recursos`.
+    """
+    from app.repository.mongo_client import desconectar
+    from app.repository.tarefas_lease import parar_reaper
+    from app.repository.tarefas_controle import encerrar_canais
+    from app.repository.tarefas_progresso import descarregar_buffers
+    from app.repository.tarefas_repository import TarefasRepository
+    from app.services.jobs_service import parar_pool_jobs
+    from app.utils.logs import encerrar_logging
+
+    parar_pool_jobs()
+    driver_pool = sys.modules.get("app.page.selenium.driver_pool")
+    if driver_pool is not None:
+        # Só encerra os pools de WebDriver se foram usados (evita importar o selenium no desligamento).
+        driver_pool.encerrar_pools_drivers()
+    upload_screenshots = sys.modules.get("app.services.upload_screenshots")
+    if upload_screenshots is not None:
+        upload_screenshots.descarregar_screenshots()
+    parar_reaper()
+    encerrar_canais()
+    descarregar_buffers()
+    if TarefasRepository._instance is not None and TarefasRepository._instance._initialized:
+        # Interrompe apenas as tarefas reivindicadas por este processo (as de outras instâncias seguem rodando).
+        TarefasRepository().interromper_execucoes_locais()
+    desconectar()
+    encerrar_logging()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Ciclo de vida da aplicação: inicializa os recursos na subida do servidor e os libera no desligamento.
+    """
+    from app.repository.tarefas_repository_async import encerrar_repositorio_async
+
+    iniciar_recursos()
+    try:
+        yield
+    finally:
+        await encerrar_repositorio_async()
+        encerrar_recursos()
+
+
 # Cria uma instância do FastAPI
 # TODO descreva a sua API aqui -  Remover este comentário depois.
 app = FastAPI(title="API de Automação de Dados",
@@ -29,6 +105,14 @@ app = FastAPI(title="API de Automação de Dados",
                   {
                       "name": "cadastro_dados",
                       "description": "Cadastar dados."
+                  },
+                  {
+                      "name": "tarefas",
+                      "description": "Histórico e estatísticas das filas de tarefas."
+                  },
+                  {
+                      "name": "metricas",
+                      "description": "Métricas do processo."
                   }
               ],
               swagger_ui_parameters={
@@ -37,7 +121,8 @@ app = FastAPI(title="API de Automação de Dados",
                   "defaultModelsExpandDepth": -1,
                   "filter": True,
                   "docExpansion": "none"
-              })
+              },
+              lifespan=lifespan)
 
 # Lista de origens permitidas (pode ser ajustada de acordo com suas necessidades)
 origins = [
@@ -53,30 +138,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Inicializa o banco de dados mongoengine
-host_mongo = os.getenv("MONGO_DB_URL")
-disconnect(alias='default')
-connect(db=os.getenv('MONGO_DB_NAME'), host=host_mongo)
-
 # Configura o app
 app.secret_key = os.getenv('APP_SECRET_KEY')
 
 app.max_request_size = 1000 * 1024 * 1024
 
-from app.utils.files import Files
-
-# Criar a estrutura de pastas necessárias para rodar a aplicação.
-Files.create_folder_structure()
-
-try:
-    if os.path.exists('logging.json'):
-        # Carrega o arquivo de configuração do logging
-        with open('logging.json', 'rt') as f:
-            config = json.load(f)
-        # Configura o logging com base no arquivo de configuração
-        logging.config.dictConfig(config)
-except Exception as e:
-    # Configura o logging com o nível de log INFO como padrão
-    logging.basicConfig(level=logging.INFO)
-
 from app.controllers import dados_controller
+from app.controllers import tarefas_controller
+from app.controllers import metricas_controller
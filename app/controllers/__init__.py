@@ -1,16 +1,18 @@
 import logging
-import random
-import string
 import time
 import typing as t
+import uuid
 from fastapi import Depends, HTTPException
 from fastapi.security.http import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
-from requests import Request
 from starlette import status
+from starlette.requests import Request
 from starlette.responses import JSONResponse
 from app import app
 from app.repository.tokens_repository import TokensRepository
+from app.utils.logs import request_id
+
+logger_requests = logging.getLogger("app.requests")
 
 
 def erro_400(mensagem: str):
@@ -119,15 +121,19 @@ async def log_requests(request: Request, call_next):
     Returns:
         Response: Resposta gerada pela requisição.
     """
-    idem = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    logging.info(f"rid={idem} start request path={request.url.path}")
-    start_time = time.time()
-
-    response = await call_next(request)
-
-    process_time = (time.time() - start_time) * 1000
-    formatted_process_time = '{0:.2f}'.format(process_time)
-    logging.info(
-        f"rid={idem} completed_in={formatted_process_time}ms status_code={response.status_code}")
-
-    return response
+    # Reaproveita o id enviado por um proxy/cliente para correlacionar os logs entre serviços
+    idem = request.headers.get("x-request-id", "")[:64] or uuid.uuid4().hex[:12]
+    token = request_id.set(idem)
+    try:
+        logger_requests.info("start request path=%s", request.url.path)
+        start_time = time.perf_counter()
+
+        response = await call_next(request)
+
+        process_time = (time.perf_counter() - start_time) * 1000
+        logger_requests.info("completed_in=%.2fms status_code=%s", process_time, response.status_code,
+                             extra={"path": request.url.path, "status_code": response.status_code, "duration_ms": round(process_time, 2)})
+        response.headers["X-Request-ID"] = idem
+        return response
+    finally:
+        request_id.reset(token)
@@ -0,0 +1,18 @@
+import sys
+
+from fastapi import Query
+
+from app import app
+from app.controllers import responses
+from app.utils.metricas import metricas
+
+
+@app.get("/metricas", response_model=dict, status_code=200, tags=["metricas"], responses=responses,
+         description="Contadores e tempos do processo (esperas do Selenium, aquisição de sessões no Selenoid...).")
+def obter_metricas(prefixo: str = Query("", description="Retorna apenas as métricas cujo nome começa com o prefixo.")):
+    """
+    Retorna as métricas em memória deste processo e o estado (status e disjuntor) dos endpoints do Selenoid.
+    """
+    # Só há estado do Selenoid se este processo já adquiriu sessões (evita importar o selenium na API).
+    aquisicao = sys.modules.get("app.page.selenium.aquisicao")
+    return {**metricas.resumo(prefixo), "selenoid": aquisicao.estado_aquisicao() if aquisicao is not None else []}
@@ -0,0 +1,42 @@
+import logging
+import traceback
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+
+from app import app
+from app.controllers import responses
+from app.repository.tarefas_repository_async import AsyncTarefasRepository
+
+
+@app.get("/tarefas/estatisticas", response_model=dict, status_code=200, tags=["tarefas"], responses=responses,
+         description="Vazão, duração (percentis) e taxa de falha das execuções das filas.")
+async def estatisticas_tarefas(fila: Optional[str] = Query(None, description="Família da fila (nome sem o número final)."),
+                               horas: int = Query(24, ge=1, le=24 * 90, description="Janela analisada, em horas.")):
+    """
+    Retorna as estatísticas das execuções finalizadas nas últimas `horas`, por fila e por hora.
+    """
+    try:
+        return await AsyncTarefasRepository().estatisticas(fila, horas)
+    except Exception as exc:
+        logging.error("Erro inesperado:\n%s", traceback.format_exc())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao calcular as estatísticas das tarefas."
+        ) from exc
+
+
+@app.get("/tarefas/painel/{familia}", response_model=list[dict], status_code=200, tags=["tarefas"], responses=responses,
+         description="Status, progresso, designado e horário de todas as filas de uma família.")
+async def painel_tarefas(familia: str):
+    """
+    Retorna o painel das filas `familia1..N` com uma única consulta, reaproveitada por alguns segundos.
+    """
+    try:
+        return await AsyncTarefasRepository().painel(familia)
+    except Exception as exc:
+        logging.error("Erro inesperado:\n%s", traceback.format_exc())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao consultar o painel das tarefas."
+        ) from exc
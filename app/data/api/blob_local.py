@@ -0,0 +1,48 @@
+import os
+
+from app.utils.constants import Constants
+
+# Pasta raiz dos containers do blob local.
+BLOB_LOCAL_DIR = os.getenv("BLOB_LOCAL_DIR", f"{Constants.ROOT_FOLDER}blob/")
+
+
+class BlobLocal:
+    """
+    Substituto do `AzureBlob` que grava os arquivos em disco, com a mesma interface usada pela
+    aplicação (`upload_file` e `connection_string`). Usado em desenvolvimento e testes (`BLOB_BACKEND=local`).
+
+    Atributos:
+        container_name (str): Nome do container (subpasta de `diretorio`).
+        diretorio (str): Pasta do container.
+        connection_string (str): URL `file://` da pasta do container.
+    """
+
+    def __init__(self, container_name: str, diretorio: str = None):
+        """
+        Args:
+            container_name (str): Nome do container.
+            diretorio (str, optional): Pasta raiz dos containers. Default é `BLOB_LOCAL_DIR`.
+        """
+        self.container_name = container_name
+        self.diretorio = os.path.join(diretorio or BLOB_LOCAL_DIR, container_name)
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.connection_string = f"file://{os.path.abspath(self.diretorio)}"
+
+    def upload_file(self, nome_arquivo: str, dados: bytes):
+        """
+        Grava o arquivo no container, substituindo se já existir.
+
+        Args:
+            nome_arquivo (str): Nome do blob.
+            dados (bytes): Conteúdo do arquivo.
+        """
+        caminho = os.path.join(self.diretorio, nome_arquivo)
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(dados)
+        os.replace(temporario, caminho)
+
+    def download_file(self, nome_arquivo: str) -> bytes:
+        """Lê o conteúdo de um arquivo do container."""
+        with open(os.path.join(self.diretorio, nome_arquivo), "rb") as arquivo:
+            return arquivo.read()
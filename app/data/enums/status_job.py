@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class StatusJob(Enum):
+    """
+        Enumeração que representa os status de um job da fila de execução.
+    """
+    PENDENTE = "PENDENTE"
+    EXECUTANDO = "EXECUTANDO"
+    CONCLUIDO = "CONCLUIDO"
+    FALHOU = "FALHOU"
+    CANCELADO = "CANCELADO"
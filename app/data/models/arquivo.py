@@ -1,8 +1,6 @@
 from datetime import datetime
 from mongoengine import StringField
 
-from app.data.api.api_blob_storage import AzureBlob
-from app.data.api.sharepoint import Sharepoint
 from app.data.models import BaseModel
 
 
@@ -27,12 +25,19 @@ class Arquivo(BaseModel):
     sharepoint_name: str = StringField()
     sharepoint_site: str = StringField()
 
+    # Envio em segundo plano (screenshots de erro): o documento é gravado antes do envio ao blob.
+    status_upload: str = StringField(choices=('PENDENTE', 'ENVIADO', 'FALHOU'))
+    erro_upload: str = StringField()
+
     def salvar_arquivo_blobstorage(self, arquivo_bytes: bytes, nome_arquivo: str, extencao: str = ".png", categoria: str = "SCREENSHOT", blob_bucket_name: str = "screenshots"):
         # Salva parcialmente para gerar o ID
         self.nome_arquivo = nome_arquivo
         self.extensao = extencao
         self.categoria = categoria
         self.save()  # Agora self.id existe
+        # Importado sob demanda para não carregar o SDK do Azure na inicialização da API
+        from app.data.api.api_blob_storage import AzureBlob
+
         filename = f"{nome_arquivo}-{str(self.id)}{extencao}"
         try:
             ab = AzureBlob(container_name=blob_bucket_name)
@@ -54,6 +59,8 @@ class Arquivo(BaseModel):
 
     def salvar_arquivo_sharepoint(self, arquivo_b64: str, site: str, diretorio: str, nome_arquivo: str, extencao: str = ".png",  categoria: str = "SCREENSHOT"):
         # Melhorar esse método deixar de modo generico
+        from app.data.api.sharepoint import Sharepoint
+
         sharepoint = Sharepoint()
         if site == 'NucleoJuridico-CSC' and diretorio == "/Robo de Calculo/2- Arquivos/":
             pasta_nome: str = datetime.now().strftime("%Y-%m-%d")
@@ -1,6 +1,7 @@
 import datetime
 import logging
-import time
+import os
+import shutil
 from typing import Union
 from contextlib import contextmanager
 
@@ -10,81 +11,107 @@ from selenium.webdriver import ActionChains
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.expected_conditions import presence_of_element_located
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.expected_conditions import presence_of_element_located, visibility_of_element_located
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.alert import Alert
 
 from app import APP_TITLE
-from app.data.api.api_blob_storage import AzureBlob
-from app.data.models.arquivo import Arquivo
+from app.page.selenium.aquisicao import adquirir_driver
 from app.page.selenium.class_name import ClassNameAbstract
 from app.page.selenium.css_selector import CssSelectorAbstract
+from app.page.selenium.downloads import SELENOID_DIRETORIO_DOWNLOAD, anexar_downloads, criar_diretorio_sessao
+from app.page.selenium.espera import MotorEspera
 from app.page.selenium.id import IdAbstract
+from app.page.selenium.instrumentacao import SELENIUM_INSTRUMENTACAO, instrumentar_driver, instrumentar_helpers
 from app.page.selenium.keys import KeysAbstract
+from app.page.selenium.lote import ConsultaDom, consultar_lote
+from app.page.selenium.perfil_leve import resolver_perfil
+from app.page.selenium.prontidao import documento_pronto, estrategia_carregamento, rede_ociosa
+from app.page.selenium.tabela import extrair_tabela
 from app.page.selenium.xpath import XpathAbstract
 from app.utils.constants import Constants
 
 WAITING_TIME = 60
 
 
-def iniciar_driver_prod(projeto_nome: str = None, headless: bool = False):
+def iniciar_driver_prod(projeto_nome: str = None, headless: bool = False, diretorio_download: str = None, perfil_leve=None,
+                        page_load_strategy: str = None):
     """
     Inicializa o WebDriver do Chrome para o ambiente de produção.
 
     Args:
         projeto_nome (str, optional): Nome do projeto para identificação no Selenoid. Default é "Reportar Contatos do Cliente Mercado Pago".
         headless (bool): Se True, o navegador será iniciado em modo headless (sem interface gráfica). Default é False.
+        diretorio_download (str, optional): Pasta de downloads no container do navegador. O Selenoid serve apenas
+            `SELENOID_DIRETORIO_DOWNLOAD` (a pasta lida por `driver.downloads`); outra pasta é rejeitada.
+        perfil_leve (bool | PerfilLeve, optional): Bloqueia imagens, fontes, mídia e rastreadores. Default é `SELENIUM_PERFIL_LEVE`.
+        page_load_strategy (str, optional): "normal", "eager" ou "none". Default é `SELENIUM_PAGE_LOAD_STRATEGY`.
 
     Returns:
-        WebDriver: Instância do WebDriver configurada para o ambiente de produção.
+        WebDriver: Instância do WebDriver configurada para o ambiente de produção, com `downloads` (`GerenciadorDownloads`).
 
     Raises:
+        ValueError: Se `diretorio_download` for diferente de `SELENOID_DIRETORIO_DOWNLOAD`.
+        DisjuntorAberto: Se o Selenoid estiver indisponível (disjuntor aberto em todos os endpoints).
         RuntimeError: Se não for possível criar a conexão com o ChromeDriver após várias tentativas.
 
     Logs:
         info: Indica o início da inicialização do WebDriver.
         error: Informa sobre erros ao tentar inicializar o WebDriver.
     """
+    if diretorio_download and os.path.normpath(diretorio_download) != os.path.normpath(SELENOID_DIRETORIO_DOWNLOAD):
+        raise ValueError(f"O Selenoid serve apenas a pasta de downloads {SELENOID_DIRETORIO_DOWNLOAD}; "
+                         "ajuste SELENOID_DIRETORIO_DOWNLOAD em vez de diretorio_download.")
     logging.info("Inicializando chrome webdriver")
-    qtd_erros = 0
-    while True:
+    perfil = resolver_perfil(perfil_leve)
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = estrategia_carregamento(page_load_strategy)
+    if headless:
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("window-size=1920x1080")
+    options.add_argument("--disable-infobars")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    prefs = {"download.default_directory": SELENOID_DIRETORIO_DOWNLOAD, "download.prompt_for_download": False, "download.directory_upgrade": True, "safebrowsing.enabled": True}
+    options.add_experimental_option("prefs", perfil.aplicar_preferencias(prefs) if perfil else prefs)
+    options.set_capability("browserName", 'chrome')
+    options.set_capability("browserVersion", '112.0')
+    options.set_capability("selenoid:options", {"enableVNC": True, "enableVideo": False, "sessionTimeout": "12m", "name": projeto_nome or APP_TITLE})
+
+    def criar(url: str) -> WebDriver:
+        driver = webdriver.Remote(command_executor=url, options=options)
         try:
-            options = webdriver.ChromeOptions()
-            if headless:
-                options.add_argument("--headless")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-gpu")
-                options.add_argument("window-size=1920x1080")
-            options.add_argument("--disable-infobars")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            options.add_experimental_option("prefs",
-                                            {"download.default_directory": Constants.TEMP_DIR, "download.prompt_for_download": False, "download.directory_upgrade": True, "safebrowsing.enabled": True})
-            options.set_capability("browserName", 'chrome')
-            options.set_capability("browserVersion", '112.0')
-            options.set_capability("selenoid:options", {"enableVNC": True, "enableVideo": False, "sessionTimeout": "12m", "name": projeto_nome or APP_TITLE})
-            driver = webdriver.Remote(command_executor="http://10.67.5.209:4444/wd/hub", options=options)
             driver.maximize_window()
-            return driver
-        except Exception as e:
-            if qtd_erros <= 10:
-                time.sleep(50)
-                qtd_erros += 1
-                logging.error(f"Erro ao buscar o driver no selenoid: {e}")
-            else:
-                raise RuntimeError(f'ERRO ao criar a conexão com o chrome driver: {e.args}')
+        except Exception:
+            driver.quit()
+            raise
+        if perfil:
+            perfil.instalar(driver)
+        driver.perfil_leve = perfil
+        anexar_downloads(driver, url_selenoid=url)
+        return instrumentar_driver(driver) if SELENIUM_INSTRUMENTACAO else driver
 
+    return adquirir_driver(criar)
 
-def iniciar_driver_local(headless: bool = False):
+
+def iniciar_driver_local(headless: bool = False, diretorio_download: str = None, perfil_leve=None, page_load_strategy: str = None):
     """
     Inicializa o WebDriver do Chrome para o ambiente local.
 
+    Args:
+        headless (bool): Se True, o navegador será iniciado em modo headless. Default é False.
+        diretorio_download (str, optional): Pasta de downloads do navegador. Default é uma pasta exclusiva da
+            sessão (`criar_diretorio_sessao`), removida no `quit`.
+        perfil_leve (bool | PerfilLeve, optional): Bloqueia imagens, fontes, mídia e rastreadores. Default é `SELENIUM_PERFIL_LEVE`.
+        page_load_strategy (str, optional): "normal", "eager" ou "none". Default é `SELENIUM_PAGE_LOAD_STRATEGY`.
+
     Returns:
-        WebDriver: Instância do WebDriver configurada para o ambiente local.
+        WebDriver: Instância do WebDriver configurada para o ambiente local, com `downloads` (`GerenciadorDownloads`).
 
     Raises:
         RuntimeError: Se não for possível criar a conexão com o ChromeDriver.
@@ -92,16 +119,19 @@ def iniciar_driver_local(headless: bool = False):
     Logs:
         error: Informa sobre erros ao tentar inicializar o WebDriver.
     """
+    diretorio_proprio = diretorio_download is None
+    diretorio_download = diretorio_download or criar_diretorio_sessao()
     try:
+        perfil = resolver_perfil(perfil_leve)
+        prefs = {
+            "download.default_directory": diretorio_download,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "safebrowsing.enabled": True
+        }
         options = Options()
-        options.add_experimental_option(
-            "prefs", {
-                "download.default_directory": Constants.TEMP_DIR,
-                "download.prompt_for_download": False,
-                "download.directory_upgrade": True,
-                "safebrowsing.enabled": True
-            }
-        )
+        options.page_load_strategy = estrategia_carregamento(page_load_strategy)
+        options.add_experimental_option("prefs", perfil.aplicar_preferencias(prefs) if perfil else prefs)
         if headless:
             options.add_argument("--headless")
         options.add_argument("--disable-infobars")  # Desativa barras de informação
@@ -111,59 +141,69 @@ def iniciar_driver_local(headless: bool = False):
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
-        return webdriver.Chrome(options=options)
+        driver = webdriver.Chrome(options=options)
+        if perfil:
+            perfil.instalar(driver)
+        driver.perfil_leve = perfil
+        anexar_downloads(driver, diretorio=diretorio_download, proprio=diretorio_proprio)
+        return instrumentar_driver(driver) if SELENIUM_INSTRUMENTACAO else driver
     except Exception as e:
+        if diretorio_proprio:
+            shutil.rmtree(diretorio_download, ignore_errors=True)
         raise RuntimeError(f'ERRO ao criar a conexão com o chrome driver: {e.args}')
 
 
 @contextmanager
-def iniciar_driver_context(projeto: str = "Webdriver - Remoto TESTE"):
-    driver = iniciar_driver_prod(projeto)
+def iniciar_driver_context(projeto: str = "Webdriver - Remoto TESTE", page_load_strategy: str = None):
+    driver = iniciar_driver_prod(projeto, page_load_strategy=page_load_strategy)
     try:
         yield driver
     except Exception as e:
-        logging.error(f"Erro ao inicializar o WebDriver remoto: {str(e)}")
+        logging.error("Erro ao inicializar o WebDriver remoto: %s", e)
         raise RuntimeError(f"Erro ao inicializar o WebDriver remoto: {str(e)}")
     finally:
         driver.quit()
 
 
 @contextmanager
-def iniciar_driver_context_local():
-    driver = iniciar_driver_local()
+def iniciar_driver_context_local(page_load_strategy: str = None):
+    driver = iniciar_driver_local(page_load_strategy=page_load_strategy)
     try:
         yield driver
     except Exception as e:
-        logging.error(f"Erro ao inicializar o WebDriver local: {str(e)}")
+        logging.error("Erro ao inicializar o WebDriver local: %s", e)
         raise RuntimeError(f"Erro ao inicializar o WebDriver local: {str(e)}")
     finally:
         driver.quit()
 
 
 @contextmanager
-def iniciar_driver_context_selecionado(projeto: str = None, driver_prod=True):
+def iniciar_driver_context_selecionado(projeto: str = None, driver_prod=True, page_load_strategy: str = None):
     """
     Inicializa o WebDriver no ambiente correto (local ou remoto) e gerencia seu ciclo de vida.
 
     Args:
         projeto (str): Nome do projeto (usado apenas se for ambiente de produção).
         driver_prod (bool): Define se será usado o driver remoto (True) ou local (False).
+        page_load_strategy (str, optional): "normal", "eager" ou "none". Com "eager"/"none" o `get` retorna
+            antes de todos os recursos carregarem; use `_abrir_pagina`/`_aguardar_*` para esperar o necessário.
 
     Yields:
         WebDriver: Instância do WebDriver já configurada.
     """
     try:
         if driver_prod:
-            with iniciar_driver_context(projeto) as driver:  # Usa o driver remoto
+            with iniciar_driver_context(projeto, page_load_strategy) as driver:  # Usa o driver remoto
                 yield driver
         else:
-            with iniciar_driver_context_local() as driver:  # Usa o driver local
+            with iniciar_driver_context_local(page_load_strategy) as driver:  # Usa o driver local
                 yield driver
     except Exception as e:
-        logging.error(f"Erro ao inicializar o WebDriver: {str(e)}")
+        logging.error("Erro ao inicializar o WebDriver: %s", e)
         raise RuntimeError(f"Erro ao inicializar o WebDriver: {str(e)}")
 
 
+@instrumentar_helpers
 class SeleniumAbstract(XpathAbstract, IdAbstract, CssSelectorAbstract, ClassNameAbstract, KeysAbstract):
     """
     Classe abstrata para interações com o Selenium WebDriver.
@@ -176,56 +216,210 @@ class SeleniumAbstract(XpathAbstract, IdAbstract, CssSelectorAbstract, ClassName
         - webbot (WebDriver): Instância do WebDriver.
         - wait_d (WebDriverWait): Instância do WebDriverWait para espera padrão.
         - wait_r (WebDriverWait): Instância do WebDriverWait para espera rápida.
+        - espera (MotorEspera): Motor de espera compartilhado por todos os mixins de localização.
         - azure_blob (AzureBlob): Instância do AzureBlob para upload de arquivos.
     """
 
-    def __init__(self, webbot: WebDriver, projeto_nome: str = None):
+    def __init__(self, webbot: WebDriver, projeto_nome: str = None, espera: MotorEspera = None):
         """
         Inicializa a classe SeleniumAbstract com o WebDriver e o nome do projeto.
         :param webbot:
         :param proejto_nome:
+        :param espera: Motor de espera (intervalo de tentativas e timeouts). Default usa `ESPERA_POLL_SEGUNDOS`/`ESPERA_VERIFICACAO_SEGUNDOS`.
         """
         self.projeto_nome = projeto_nome or APP_TITLE
         self.webbot: WebDriver = webbot
-        self.wait_d = WebDriverWait(webbot, WAITING_TIME)
-        self.wait_r = WebDriverWait(webbot, 20)
-        XpathAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r)
-        IdAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r)
-        CssSelectorAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r)
-        ClassNameAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r)
-        KeysAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r)
-        self.azure_blob = AzureBlob(container_name="screenshots")
+        self.espera = espera or MotorEspera(webbot)
+        self.wait_d = self.espera.wait(WAITING_TIME)
+        self.wait_r = self.espera.wait(20)
+        XpathAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r, self.espera)
+        IdAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r, self.espera)
+        CssSelectorAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r, self.espera)
+        ClassNameAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r, self.espera)
+        KeysAbstract.__init__(self, self.webbot, self.wait_d, self.wait_r, self.espera)
+        self._azure_blob = None
+
+    @property
+    def azure_blob(self):
+        """
+        Cliente do blob storage de screenshots, criado apenas no primeiro uso.
+
+        Returns:
+            AzureBlob: Instância do AzureBlob (ou `BlobLocal`, conforme `BLOB_BACKEND`) para o container "screenshots".
+        """
+        if self._azure_blob is None:
+            from app.services.upload_screenshots import criar_blob
+
+            self._azure_blob = criar_blob("screenshots")
+        return self._azure_blob
 
     def _limpar_input_por_id(self, id_element: str):
         self.wait_d.until(presence_of_element_located((By.ID, id_element))).clear()
 
     def _existe_class_por_id(self, id_element: str, class_html: str):
-        time.sleep(1)
-        return class_html in self.webbot.find_element(By.ID, id_element).get_attribute("class")
+        return self.espera.verificar(lambda driver: class_html in driver.find_element(By.ID, id_element).get_attribute("class"),
+                                     nome="_existe_class_por_id")
 
     def _existe_tag_name(self, tag_element: str) -> bool:
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.TAG_NAME, tag_element)) > 0
+        return self.espera.existe(By.TAG_NAME, tag_element, nome="_existe_tag_name")
 
     def _existe_id(self, id_element: str) -> bool:
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.ID, id_element)) > 0
+        return self.espera.existe(By.ID, id_element, nome="_existe_id")
 
     def _existe_xpath(self, id_element: str) -> bool:
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.XPATH, id_element)) > 0
+        return self.espera.existe(By.XPATH, id_element, nome="_existe_xpath")
 
     def _existe_css_selector(self, css_element: str) -> bool:
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.CSS_SELECTOR, css_element)) > 0
+        return self.espera.existe(By.CSS_SELECTOR, css_element, nome="_existe_css_selector")
 
     def _existe_css_selector_text(self, css_element: str, texto: str) -> bool:
-        time.sleep(1)
-        return self._existe_css_selector(css_element) and texto in [text.text for text in self.webbot.find_elements(By.CSS_SELECTOR, css_element)]
+        consulta = ConsultaDom("c", By.CSS_SELECTOR, css_element, ("texto",), todos=True)
+        return self.espera.verificar(lambda driver: texto in [item["texto"] for item in consultar_lote(driver, [consulta])["c"]],
+                                     nome="_existe_css_selector_text")
+
+    def _consultar_lote(self, consultas: list, propriedades: tuple[str, ...] = ("existe", "texto")) -> dict:
+        """
+        Lê vários elementos da página em uma única chamada ao navegador (`execute_script`).
+
+        Exemplo:
+            dados = self._consultar_lote([
+                ("nome", By.ID, "txtNome"),
+                ("situacao", By.XPATH, "//span[@class='situacao']"),
+                ConsultaDom("linhas", By.CSS_SELECTOR, "table#resultado tr", ("texto",), atributos=("data-id",), todos=True),
+            ])
+            dados["nome"]["texto"], [linha["atributos"]["data-id"] for linha in dados["linhas"]]
+
+        Args:
+            consultas (list[ConsultaDom | tuple[str, str, str]]): Consultas, como `ConsultaDom` ou tuplas (chave, by, valor).
+            propriedades (tuple[str, ...]): Propriedades lidas nas consultas informadas como tupla. Default é ("existe", "texto").
+
+        Returns:
+            dict: O resultado de cada consulta pela chave (ver `app.page.selenium.lote.consultar_lote`).
+        """
+        consultas = [consulta if isinstance(consulta, ConsultaDom) else ConsultaDom(*consulta, propriedades=propriedades)
+                     for consulta in consultas]
+        return consultar_lote(self.webbot, consultas)
+
+    def _extrair_tabela(self, by: str = None, valor: str = None, seletor: str = "table", indice: int = 0, cabecalho: bool = True,
+                        mapa_cabecalho: dict[str, str] = None, somente_mapeadas: bool = False, dataframe: bool = False):
+        """
+        Lê uma tabela inteira com uma única chamada ao navegador (`outerHTML` do contêiner ou `page_source`)
+        e a interpreta com BeautifulSoup, em vez de ler célula por célula pelo WebDriver.
+
+        Exemplo:
+            processos = self._extrair_tabela(By.ID, "tabelaResultado", mapa_cabecalho={"Nº do Processo": "numero", "Situação": "situacao"})
+            df = self._extrair_tabela(By.XPATH, "//div[@class='grid']", dataframe=True)
+
+        Args:
+            by (str, optional): Estratégia de localização do contêiner (ou da própria tabela). Default é a página inteira.
+            valor (str, optional): Valor do localizador do contêiner.
+            seletor (str): Seletor CSS da tabela dentro do HTML lido. Default é "table".
+            indice (int): Qual das tabelas encontradas pelo seletor. Default é a primeira.
+            cabecalho (bool): Se True, retorna dicts com os nomes das colunas; se False, listas de textos.
+            mapa_cabecalho (dict[str, str], optional): Título da coluna -> nome usado no código.
+            somente_mapeadas (bool): Se True, mantém apenas as colunas do `mapa_cabecalho`.
+            dataframe (bool): Se True, retorna um `pandas.DataFrame`.
+
+        Returns:
+            list[dict] | list[list[str]] | pandas.DataFrame: As linhas da tabela.
+
+        Raises:
+            TimeoutException: Se o contêiner não aparecer dentro do tempo de espera padrão.
+            ValueError: Se a tabela não for encontrada no HTML.
+        """
+        if by is not None:
+            html = self.wait_d.until(presence_of_element_located((by, valor))).get_attribute("outerHTML")
+        else:
+            html = self.webbot.page_source
+        return extrair_tabela(html, seletor, indice, cabecalho, mapa_cabecalho, somente_mapeadas, dataframe)
 
     def _verificar_texto_por_id(self, id_element: str, text: str) -> bool:
-        time.sleep(1)
-        return self.webbot.find_element(By.ID, id_element).text.upper() == text.upper()
+        return self.espera.texto_igual(By.ID, id_element, text, nome="_verificar_texto_por_id")
+
+    def _aguardar_documento_pronto(self, completo: bool = False, timeout: float = WAITING_TIME) -> bool:
+        """
+        Aguarda o DOM da página atual ficar pronto.
+
+        Args:
+            completo (bool): Se True, aguarda também imagens e demais recursos (`readyState` "complete").
+            timeout (float): Tempo máximo de espera, em segundos.
+
+        Raises:
+            TimeoutException: Se a página não ficar pronta dentro do `timeout`.
+        """
+        estados = ("complete",) if completo else ("interactive", "complete")
+        return self.espera.ate(documento_pronto(estados), timeout, nome="_aguardar_documento_pronto")
+
+    def _aguardar_rede_ociosa(self, ociosidade: float = 0.5, timeout: float = WAITING_TIME) -> bool:
+        """
+        Aguarda a página parar de fazer requisições (XHR/fetch e recursos) por `ociosidade` segundos.
+
+        Args:
+            ociosidade (float): Tempo sem atividade de rede, em segundos.
+            timeout (float): Tempo máximo de espera, em segundos.
+
+        Raises:
+            TimeoutException: Se a rede não ficar ociosa dentro do `timeout`.
+        """
+        return self.espera.ate(rede_ociosa(ociosidade), timeout, nome="_aguardar_rede_ociosa")
+
+    def _aguardar_elemento(self, by: str, valor: str, visivel: bool = False, timeout: float = WAITING_TIME):
+        """
+        Aguarda o elemento que o fluxo vai usar, sem esperar o restante da página.
+
+        Args:
+            by (str): Estratégia de localização (`By.ID`, `By.XPATH`...).
+            valor (str): Valor do localizador.
+            visivel (bool): Se True, aguarda o elemento ficar visível (não apenas presente no DOM).
+            timeout (float): Tempo máximo de espera, em segundos.
+
+        Returns:
+            WebElement: O elemento encontrado.
+
+        Raises:
+            TimeoutException: Se o elemento não aparecer dentro do `timeout`.
+        """
+        condicao = visibility_of_element_located if visivel else presence_of_element_located
+        return self.espera.ate(condicao((by, valor)), timeout, nome="_aguardar_elemento")
+
+    def _abrir_pagina(self, url: str, aguardar: str = "documento", by: str = None, valor: str = None,
+                      timeout: float = WAITING_TIME):
+        """
+        Abre a URL e aguarda apenas a condição necessária ao fluxo. Com `page_load_strategy` "eager" ou
+        "none" o `get` retorna cedo e a espera fica a cargo desta condição.
+
+        Exemplo:
+            self._abrir_pagina(url, aguardar="elemento", by=By.ID, valor="tabelaResultado")
+
+        Args:
+            url (str): Endereço da página.
+            aguardar (str): "documento" (DOM pronto), "completo" (todos os recursos), "rede" (rede ociosa),
+                "elemento" (localizador `by`/`valor`) ou "nada".
+            by (str, optional): Estratégia de localização, se `aguardar` for "elemento".
+            valor (str, optional): Valor do localizador, se `aguardar` for "elemento".
+            timeout (float): Tempo máximo de espera, em segundos.
+
+        Returns:
+            WebElement | bool | None: O elemento aguardado, o resultado da condição ou None com "nada".
+
+        Raises:
+            ValueError: Se `aguardar` for inválido ou "elemento" sem localizador.
+            TimeoutException: Se a condição não for satisfeita dentro do `timeout`.
+        """
+        if aguardar == "elemento" and not (by and valor):
+            raise ValueError('aguardar="elemento" exige `by` e `valor`.')
+        if aguardar not in ("documento", "completo", "rede", "elemento", "nada"):
+            raise ValueError(f"Condição de espera inválida: {aguardar}")
+        self.webbot.get(url)
+        if aguardar == "documento":
+            return self._aguardar_documento_pronto(timeout=timeout)
+        if aguardar == "completo":
+            return self._aguardar_documento_pronto(completo=True, timeout=timeout)
+        if aguardar == "rede":
+            return self._aguardar_rede_ociosa(timeout=timeout)
+        if aguardar == "elemento":
+            return self._aguardar_elemento(by, valor, timeout=timeout)
+        return None
 
     def _acessar_janela_atual(self):
         """
@@ -269,20 +463,29 @@ class SeleniumAbstract(XpathAbstract, IdAbstract, CssSelectorAbstract, ClassName
         """
         try:
             self.webbot.save_screenshot(Constants.SCREENSHOT + filename)
-            logging.info(f"Screenshot salvo: {filename}")
+            logging.info("Screenshot salvo: %s", filename)
         except Exception as e:
-            logging.error(f"Erro ao salvar screenshot: {str(e)}")
+            logging.error("Erro ao salvar screenshot: %s", e)
 
     def take_screenshot_erros(self):
+        """
+        Captura a tela atual e agenda o envio para o blob em segundo plano (`UploaderScreenshots`).
+
+        No passo que falhou acontecem apenas a captura e a gravação do `Arquivo` como PENDENTE; a
+        conversão e o envio são feitos depois pela thread do uploader, que marca o documento como
+        ENVIADO ou FALHOU (`status_upload`).
+
+        Returns:
+            Arquivo | None: O documento do screenshot, ou None se não foi possível capturar ou a fila de
+            envio estiver cheia.
+        """
+        from app.services.upload_screenshots import obter_uploader_screenshots
+
         try:
-            filename = f"{self.projeto_nome}-{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png"
-            screenshot = Arquivo(nome_arquivo=filename, extensao="png", categoria="SCREENSHOT", blob_bucket_name="screenshots", blob_connection_string=self.azure_blob.connection_string).save()
-            screenshot_bytes = self.webbot.get_screenshot_as_png()
-            self.azure_blob.upload_file(filename, screenshot_bytes)
-            logging.info(f"Screenshot de erro enviado para o blob com sucesso: {filename}")
-            return screenshot
+            prefixo = f"{self.projeto_nome}-{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+            return obter_uploader_screenshots().enviar(self.webbot.get_screenshot_as_png(), prefixo)
         except Exception as e:
-            logging.error(f"Erro ao enviar screenshot de erro para o blob: {str(e)}")
+            logging.error("Erro ao capturar screenshot de erro: %s", e)
 
     def enter(self):
         action = ActionChains(self.webbot)
@@ -0,0 +1,297 @@
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable
+
+import requests
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from app.utils.metricas import metricas
+
+# Endpoints do Selenoid (separados por vírgula); a sessão é criada no mais saudável.
+SELENOID_URLS = [url.strip() for url in os.getenv("SELENOID_URLS", "http://10.67.5.209:4444/wd/hub").split(",") if url.strip()]
+# Tempo máximo da consulta ao /status de cada endpoint e por quanto tempo a resposta é reaproveitada.
+SELENOID_STATUS_TIMEOUT_SEGUNDOS = float(os.getenv("SELENOID_STATUS_TIMEOUT_SEGUNDOS", 2))
+SELENOID_STATUS_CACHE_SEGUNDOS = float(os.getenv("SELENOID_STATUS_CACHE_SEGUNDOS", 5))
+# Tentativas de criação da sessão e backoff exponencial (com jitter) entre elas. Com os valores padrão, um
+# Selenoid sem vagas é aguardado por cerca de 9 minutos, como no retry fixo anterior (11 esperas de 50s).
+AQUISICAO_TENTATIVAS = int(os.getenv("AQUISICAO_TENTATIVAS", 16))
+AQUISICAO_BACKOFF_SEGUNDOS = float(os.getenv("AQUISICAO_BACKOFF_SEGUNDOS", 5))
+AQUISICAO_BACKOFF_MAX_SEGUNDOS = float(os.getenv("AQUISICAO_BACKOFF_MAX_SEGUNDOS", 60))
+# Falhas seguidas que abrem o disjuntor de um endpoint e por quanto tempo ele fica aberto. Por padrão o
+# disjuntor fica aberto pelo teto do backoff: com o Selenoid fora do ar, as tentativas seguintes aguardam a
+# reabertura (uma tentativa de teste por janela) e as tentativas padrão somam cerca de 7 minutos.
+DISJUNTOR_FALHAS = int(os.getenv("DISJUNTOR_FALHAS", 3))
+DISJUNTOR_ABERTO_SEGUNDOS = float(os.getenv("DISJUNTOR_ABERTO_SEGUNDOS", AQUISICAO_BACKOFF_MAX_SEGUNDOS))
+# Trechos das mensagens de erro do Selenoid/Grid sem vaga (fila cheia), que não contam como falha do endpoint.
+ERROS_CAPACIDADE = ("queue", "no free", "timed out waiting", "retry count exceeded", "attempts to create new session failed")
+
+
+class DisjuntorAberto(RuntimeError):
+    """Exceção para quando todos os endpoints do Selenoid estão com o disjuntor aberto."""
+
+    def __init__(self, message="Selenoid indisponível: disjuntor aberto, tente novamente mais tarde."):
+        super().__init__(message)
+
+
+class Disjuntor:
+    """
+    Disjuntor (circuit breaker) de um endpoint, compartilhado por todas as threads do processo.
+
+    Após `falhas_para_abrir` falhas seguidas o disjuntor abre e as aquisições falham imediatamente
+    por `aberto_segundos`. Depois disso uma única aquisição de teste é liberada (meio aberto): se
+    der certo o disjuntor fecha, se falhar volta a abrir.
+
+    Atributos:
+        nome (str): Nome do disjuntor (a URL do endpoint).
+        estado (str): "fechado", "aberto" ou "meio_aberto".
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, nome: str, falhas_para_abrir: int = DISJUNTOR_FALHAS, aberto_segundos: float = DISJUNTOR_ABERTO_SEGUNDOS):
+        self.nome = nome
+        self.falhas_para_abrir = max(1, falhas_para_abrir)
+        self.aberto_segundos = aberto_segundos
+        self.estado = self.FECHADO
+        self._falhas = 0
+        self._aberto_ate = 0.0
+        self._lock = threading.Lock()
+
+    def disponivel(self) -> bool:
+        """Indica, sem reservar, se uma aquisição seria permitida agora."""
+        with self._lock:
+            if self.estado == self.ABERTO:
+                return time.monotonic() >= self._aberto_ate
+            return self.estado == self.FECHADO
+
+    def segundos_para_reabrir(self) -> float | None:
+        """
+        Returns:
+            float | None: Segundos até a próxima aquisição de teste (0 se já permitida), ou None se
+            outra aquisição de teste estiver em andamento (meio aberto).
+        """
+        with self._lock:
+            if self.estado == self.ABERTO:
+                return max(0.0, self._aberto_ate - time.monotonic())
+            return 0.0 if self.estado == self.FECHADO else None
+
+    def permitir(self) -> bool:
+        """
+        Reserva uma aquisição: sempre permitida com o disjuntor fechado; com o disjuntor aberto,
+        apenas uma (a de teste) depois de `aberto_segundos`.
+        """
+        with self._lock:
+            if self.estado == self.FECHADO:
+                return True
+            if self.estado == self.ABERTO and time.monotonic() >= self._aberto_ate:
+                self.estado = self.MEIO_ABERTO
+                return True
+            return False
+
+    def registrar_sucesso(self):
+        with self._lock:
+            if self.estado != self.FECHADO:
+                logging.info("Disjuntor %s fechado.", self.nome)
+            self.estado = self.FECHADO
+            self._falhas = 0
+
+    def registrar_falha(self):
+        with self._lock:
+            self._falhas += 1
+            if self.estado == self.MEIO_ABERTO or self._falhas >= self.falhas_para_abrir:
+                self.estado = self.ABERTO
+                self._aberto_ate = time.monotonic() + self.aberto_segundos
+                metricas.incrementar("selenoid.disjuntor.aberto", endpoint=self.nome)
+                logging.warning("Disjuntor %s aberto por %ss após %s falha(s).", self.nome, self.aberto_segundos, self._falhas)
+
+    def resumo(self) -> dict:
+        with self._lock:
+            restante = max(0.0, self._aberto_ate - time.monotonic()) if self.estado == self.ABERTO else 0.0
+            return {"estado": self.estado, "falhas_seguidas": self._falhas, "aberto_restante_segundos": round(restante, 1)}
+
+
+class EndpointSelenoid:
+    """
+    Um endpoint do Selenoid, com seu disjuntor e a última leitura do `/status`.
+
+    Atributos:
+        url (str): URL do executor (ex.: http://host:4444/wd/hub).
+        disjuntor (Disjuntor): Disjuntor do endpoint.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.disjuntor = Disjuntor(url)
+        self._status: dict | None = None
+        self._status_em = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def url_status(self) -> str:
+        base = self.url.rstrip("/")
+        if base.endswith("/wd/hub"):
+            base = base[:-len("/wd/hub")]
+        return f"{base}/status"
+
+    def capacidade(self, atualizar: bool = False) -> int | None:
+        """
+        Sessões livres segundo o `/status` do Selenoid (total - usadas - na fila - pendentes).
+
+        Args:
+            atualizar (bool): Se True, consulta o `/status` mesmo com uma leitura recente em cache.
+
+        Returns:
+            int | None: As sessões livres, ou None se o status não puder ser lido.
+        """
+        with self._lock:
+            if atualizar or time.monotonic() - self._status_em > SELENOID_STATUS_CACHE_SEGUNDOS:
+                try:
+                    resposta = requests.get(self.url_status, timeout=SELENOID_STATUS_TIMEOUT_SEGUNDOS)
+                    resposta.raise_for_status()
+                    self._status = resposta.json()
+                except Exception as e:
+                    logging.debug("Não foi possível ler o status de %s: %s", self.url, e)
+                    self._status = None
+                self._status_em = time.monotonic()
+            status = self._status
+        if not status or "total" not in status:
+            return None
+        return int(status.get("total", 0)) - sum(int(status.get(campo, 0)) for campo in ("used", "queued", "pending"))
+
+    def resumo(self) -> dict:
+        return {"url": self.url, "status": self._status, **self.disjuntor.resumo()}
+
+
+_endpoints = [EndpointSelenoid(url) for url in SELENOID_URLS]
+
+
+def calcular_backoff(tentativa: int, base: float = AQUISICAO_BACKOFF_SEGUNDOS, maximo: float = AQUISICAO_BACKOFF_MAX_SEGUNDOS) -> float:
+    """
+    Calcula a espera antes da próxima tentativa: backoff exponencial com jitter.
+
+    O jitter evita que os workers que falharam juntos voltem ao Selenoid ao mesmo tempo.
+
+    Args:
+        tentativa (int): Número da tentativa que falhou (começando em 1).
+        base (float): Espera da primeira tentativa, em segundos.
+        maximo (float): Teto da espera, em segundos.
+
+    Returns:
+        float: Segundos até a próxima tentativa.
+    """
+    teto = min(maximo, base * 2 ** max(0, tentativa - 1))
+    return random.uniform(teto / 2, teto)
+
+
+def falha_do_endpoint(endpoint: EndpointSelenoid, erro: Exception) -> bool:
+    """
+    Indica se o erro na criação da sessão conta como falha do endpoint para o disjuntor.
+
+    Falta de vaga (fila cheia) e erros com o `/status` do endpoint respondendo não contam: o Selenoid
+    está no ar, apenas ocupado, e abrir o disjuntor faria todos os workers do processo falharem.
+
+    Args:
+        endpoint (EndpointSelenoid): Endpoint em que a sessão foi pedida.
+        erro (Exception): Erro da criação da sessão.
+
+    Returns:
+        bool: True se o endpoint parece fora do ar.
+    """
+    mensagem = str(erro).lower()
+    if any(trecho in mensagem for trecho in ERROS_CAPACIDADE):
+        return False
+    return endpoint.capacidade(atualizar=True) is None
+
+
+def _espera_reabertura(endpoints: list[EndpointSelenoid], tentativa: int) -> float:
+    """Segundos até algum disjuntor liberar uma aquisição (o backoff se todos estiverem em teste)."""
+    esperas = [espera for espera in (e.disjuntor.segundos_para_reabrir() for e in endpoints) if espera is not None]
+    # Jitter para que os workers que aguardam a mesma janela não disputem a aquisição de teste juntos.
+    return min(esperas) + random.uniform(0, AQUISICAO_BACKOFF_SEGUNDOS) if esperas else calcular_backoff(tentativa)
+
+
+def ordenar_endpoints(endpoints: list[EndpointSelenoid] = None) -> list[EndpointSelenoid]:
+    """
+    Ordena os endpoints com disjuntor disponível do mais para o menos saudável: primeiro os com
+    mais sessões livres, depois os sem status (ex.: Selenium Grid sem `/status` compatível).
+    Empates são embaralhados para distribuir a carga.
+
+    Args:
+        endpoints (list[EndpointSelenoid], optional): Endpoints considerados. Default são os de `SELENOID_URLS`.
+
+    Returns:
+        list[EndpointSelenoid]: Os endpoints candidatos, em ordem de preferência.
+    """
+    candidatos = [endpoint for endpoint in (_endpoints if endpoints is None else endpoints) if endpoint.disjuntor.disponivel()]
+    random.shuffle(candidatos)
+    capacidades = {id(endpoint): endpoint.capacidade() for endpoint in candidatos}
+    return sorted(candidatos, key=lambda e: (capacidades[id(e)] is None, -(capacidades[id(e)] or 0)))
+
+
+def adquirir_driver(criar: Callable[[str], WebDriver], tentativas: int = AQUISICAO_TENTATIVAS,
+                    endpoints: list[EndpointSelenoid] = None) -> WebDriver:
+    """
+    Cria uma sessão no endpoint mais saudável, com backoff exponencial e jitter entre as tentativas.
+
+    Com todos os disjuntores abertos, a tentativa aguarda a reabertura do primeiro (sem chamar o
+    Selenoid enquanto isso); `DisjuntorAberto` só é lançada quando não restam tentativas. Erros de
+    falta de vaga não abrem o disjuntor (ver `falha_do_endpoint`).
+
+    Args:
+        criar (Callable[[str], WebDriver]): Cria a sessão recebendo a URL do executor.
+        tentativas (int): Quantidade máxima de tentativas. Default é `AQUISICAO_TENTATIVAS`.
+        endpoints (list[EndpointSelenoid], optional): Endpoints considerados. Default são os de `SELENOID_URLS`.
+
+    Returns:
+        WebDriver: A sessão criada.
+
+    Raises:
+        DisjuntorAberto: Se nenhum endpoint estiver aceitando aquisições na última tentativa.
+        RuntimeError: Se a sessão não puder ser criada após todas as tentativas.
+    """
+    endpoints = _endpoints if endpoints is None else endpoints
+    ultimo_erro = None
+    for tentativa in range(1, max(1, tentativas) + 1):
+        endpoint = next((e for e in ordenar_endpoints(endpoints) if e.disjuntor.permitir()), None)
+        if endpoint is None:
+            metricas.incrementar("selenoid.aquisicao.rejeitada")
+            if tentativa >= tentativas:
+                raise DisjuntorAberto() from ultimo_erro
+            espera = _espera_reabertura(endpoints, tentativa)
+            logging.warning("Selenoid com disjuntor aberto (tentativa %s/%s), nova tentativa em %.1fs.", tentativa, tentativas, espera)
+            time.sleep(espera)
+            continue
+        inicio = time.perf_counter()
+        try:
+            driver = criar(endpoint.url)
+        except Exception as e:
+            ultimo_erro = e
+            if falha_do_endpoint(endpoint, e):
+                endpoint.disjuntor.registrar_falha()
+            else:
+                # O endpoint respondeu (apenas sem vaga): não conta para o disjuntor e encerra um teste meio aberto.
+                endpoint.disjuntor.registrar_sucesso()
+                metricas.incrementar("selenoid.aquisicao.sem_vaga", endpoint=endpoint.url)
+            metricas.registrar_tempo("selenoid.aquisicao", time.perf_counter() - inicio, endpoint=endpoint.url, resultado="falha")
+            metricas.incrementar("selenoid.aquisicao.falhas", endpoint=endpoint.url)
+            if tentativa >= tentativas:
+                break
+            espera = calcular_backoff(tentativa)
+            logging.error("Erro ao buscar o driver no selenoid %s (tentativa %s/%s), nova tentativa em %.1fs: %s",
+                          endpoint.url, tentativa, tentativas, espera, e)
+            time.sleep(espera)
+            continue
+        endpoint.disjuntor.registrar_sucesso()
+        metricas.registrar_tempo("selenoid.aquisicao", time.perf_counter() - inicio, endpoint=endpoint.url, resultado="ok")
+        return driver
+    raise RuntimeError(f'ERRO ao criar a conexão com o chrome driver: {ultimo_erro.args if ultimo_erro else ""}')
+
+
+def estado_aquisicao() -> list[dict]:
+    """Retorna o status e o disjuntor de cada endpoint do Selenoid."""
+    return [endpoint.resumo() for endpoint in _endpoints]
@@ -1,15 +1,18 @@
-import time
 from abc import ABC
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.expected_conditions import element_to_be_clickable
 
+from app.page.selenium.espera import MotorEspera
+from app.page.selenium.lote import ConsultaDom, consultar_lote
+
 
 class ClassNameAbstract(ABC):
-    def __init__(self, webbot, wait_d, wait_r):
+    def __init__(self, webbot, wait_d, wait_r, espera: MotorEspera = None):
         self.webbot = webbot
         self.wait_d = wait_d
         self.wait_r = wait_r
+        self.espera = espera or MotorEspera(webbot)
 
     def _click_por_class(self, class_element: str, rapido=False) -> bool:
         """
@@ -39,8 +42,8 @@ class ClassNameAbstract(ABC):
         Returns:
             bool: True se a classe existir no elemento, False caso contrário.
         """
-        time.sleep(1)
-        return class_html in self.webbot.find_element(By.ID, id_element).get_attribute("class")
+        return self.espera.verificar(lambda driver: class_html in driver.find_element(By.ID, id_element).get_attribute("class"),
+                                     nome="_existe_class_por_id")
 
     def _verificar_texto_por_class(self, class_element: str, texto: str) -> bool:
         """
@@ -53,9 +56,9 @@ class ClassNameAbstract(ABC):
         Returns:
             bool: True se o texto for encontrado, False caso contrário.
         """
-        time.sleep(1)
-        elementos = self.webbot.find_elements(By.CLASS_NAME, class_element)
-        return any(texto in elemento.text for elemento in elementos)
+        consulta = ConsultaDom("c", By.CLASS_NAME, class_element, ("texto",), todos=True)
+        return self.espera.verificar(lambda driver: any(texto in item["texto"] for item in consultar_lote(driver, [consulta])["c"]),
+                                     nome="_verificar_texto_por_class")
 
     def _obter_texto_por_class(self, class_element: str) -> str:
         """
@@ -1,15 +1,18 @@
-import time
 from abc import ABC
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.expected_conditions import presence_of_element_located, element_to_be_clickable
 
+from app.page.selenium.espera import MotorEspera
+from app.page.selenium.lote import ConsultaDom, consultar_lote
+
 
 class CssSelectorAbstract(ABC):
-    def __init__(self, webbot, wait_d, wait_r):
+    def __init__(self, webbot, wait_d, wait_r, espera: MotorEspera = None):
         self.webbot = webbot
         self.wait_d = wait_d
         self.wait_r = wait_r
+        self.espera = espera or MotorEspera(webbot)
 
     def _preencher_input_por_css_selector(self, css_element: str, value: str, rapido=False) -> bool:
         """
@@ -58,8 +61,7 @@ class CssSelectorAbstract(ABC):
         Returns:
             bool: True se pelo menos um elemento com o seletor CSS existir, False caso contrário.
         """
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.CSS_SELECTOR, css_element)) > 0
+        return self.espera.existe(By.CSS_SELECTOR, css_element, nome="_existe_css_selector")
 
     def _existe_css_selector_text(self, css_element: str, texto: str) -> bool:
         """
@@ -72,8 +74,9 @@ class CssSelectorAbstract(ABC):
         Returns:
             bool: True se pelo menos um elemento com o seletor CSS e texto especificado existir, False caso contrário.
         """
-        time.sleep(1)
-        return self._existe_css_selector(css_element) and texto in [text.text for text in self.webbot.find_elements(By.CSS_SELECTOR, css_element)]
+        consulta = ConsultaDom("c", By.CSS_SELECTOR, css_element, ("texto",), todos=True)
+        return self.espera.verificar(lambda driver: texto in [item["texto"] for item in consultar_lote(driver, [consulta])["c"]],
+                                     nome="_existe_css_selector_text")
 
     def _verificar_atributo_por_css_selector(self, css_element: str, atributo: str, valor: str, rapido=False) -> bool:
         """
@@ -0,0 +1,262 @@
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Iterator
+from urllib.parse import quote, urlparse
+
+import requests
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from app.utils.constants import Constants
+from app.utils.metricas import metricas
+
+# Tempo máximo de espera pelos downloads, em segundos.
+DOWNLOAD_TIMEOUT_SEGUNDOS = float(os.getenv("DOWNLOAD_TIMEOUT_SEGUNDOS", 120))
+# Tempo em que o tamanho dos arquivos deve ficar estável para o download ser considerado concluído.
+DOWNLOAD_ESTABILIDADE_SEGUNDOS = float(os.getenv("DOWNLOAD_ESTABILIDADE_SEGUNDOS", 1))
+DOWNLOAD_POLL_SEGUNDOS = float(os.getenv("DOWNLOAD_POLL_SEGUNDOS", 0.5))
+# Pasta de downloads do navegador nos containers do Selenoid (servida em /download/<sessão>/).
+SELENOID_DIRETORIO_DOWNLOAD = os.getenv("SELENOID_DIRETORIO_DOWNLOAD", "/home/selenium/Downloads")
+
+# Sufixos dos arquivos ainda sendo baixados.
+SUFIXOS_PARCIAIS = (".crdownload", ".part", ".tmp", ".download")
+
+
+def criar_diretorio_sessao() -> str:
+    """Cria uma pasta de downloads exclusiva para uma sessão."""
+    base = os.path.join(Constants.TEMP_DIR, "downloads")
+    os.makedirs(base, exist_ok=True)
+    return tempfile.mkdtemp(prefix="sessao-", dir=base)
+
+
+def _parcial(nome: str) -> bool:
+    return nome.lower().endswith(SUFIXOS_PARCIAIS)
+
+
+class GerenciadorDownloads:
+    """
+    Downloads de uma sessão: pasta exclusiva, detecção de término e entrega dos arquivos como stream.
+
+    Um download é considerado concluído quando não há arquivos parciais (`.crdownload`...) e o tamanho
+    dos arquivos novos fica estável por `DOWNLOAD_ESTABILIDADE_SEGUNDOS`. Em sessões locais os arquivos
+    são lidos da pasta da sessão; no Selenoid, do endpoint `/download/<sessão>/` do executor.
+
+    Exemplo:
+        downloads = driver.downloads
+        downloads.marcar()
+        self._click_por_id("btnExportar")
+        downloads.processar(lambda nome, fluxo: importar_planilha(fluxo))
+
+    Atributos:
+        diretorio (str | None): Pasta local da sessão (None em sessões remotas).
+        url_selenoid (str | None): URL base do Selenoid (sessões remotas).
+    """
+
+    def __init__(self, driver: WebDriver, diretorio: str = None, url_selenoid: str = None, proprio: bool = False):
+        """
+        Args:
+            driver (WebDriver): Sessão dona dos downloads.
+            diretorio (str, optional): Pasta de downloads local da sessão.
+            url_selenoid (str, optional): URL do executor Selenoid (ex.: http://host:4444/wd/hub), para sessões remotas.
+            proprio (bool): Se True, a pasta local é removida quando a sessão é encerrada.
+        """
+        self.driver = driver
+        self.diretorio = diretorio
+        self.url_selenoid = None
+        if url_selenoid:
+            partes = urlparse(url_selenoid)
+            self.url_selenoid = f"{partes.scheme}://{partes.netloc}"
+        self.proprio = proprio
+        self._conhecidos: set[str] = set()
+
+    @property
+    def remoto(self) -> bool:
+        return self.url_selenoid is not None
+
+    def _url_arquivo(self, nome: str = "") -> str:
+        return f"{self.url_selenoid}/download/{self.driver.session_id}/{quote(nome)}"
+
+    def listar(self) -> dict[str, int]:
+        """
+        Returns:
+            dict[str, int]: Nome -> tamanho em bytes de cada arquivo da pasta de downloads (inclusive parciais).
+        """
+        if self.remoto:
+            # Sem `?json` o Selenoid devolve a listagem da pasta em HTML.
+            resposta = requests.get(self._url_arquivo(), params={"json": ""}, timeout=10)
+            if resposta.status_code == 404:
+                return {}
+            resposta.raise_for_status()
+            tamanhos = {}
+            for nome in resposta.json() or []:
+                if _parcial(nome):
+                    tamanhos[nome] = -1
+                    continue
+                try:
+                    cabecalho = requests.head(self._url_arquivo(nome), timeout=10)
+                except requests.RequestException as e:
+                    # Falha transitória ou arquivo sendo renomeado: tamanho desconhecido (ainda não estável).
+                    logging.debug("Erro ao consultar o download %s: %s", nome, e)
+                    tamanhos[nome] = -1
+                    continue
+                tamanhos[nome] = int(cabecalho.headers.get("Content-Length", -1)) if cabecalho.ok else -1
+            return tamanhos
+        if not self.diretorio or not os.path.isdir(self.diretorio):
+            return {}
+        tamanhos = {}
+        for entrada in os.scandir(self.diretorio):
+            if entrada.is_file():
+                try:
+                    tamanhos[entrada.name] = entrada.stat().st_size
+                except FileNotFoundError:
+                    continue
+        return tamanhos
+
+    def marcar(self):
+        """Registra os arquivos já existentes; `aguardar` considera apenas os que surgirem depois."""
+        self._conhecidos = set(self.listar())
+
+    def aguardar(self, quantidade: int = 1, timeout: float = DOWNLOAD_TIMEOUT_SEGUNDOS,
+                 estabilidade: float = DOWNLOAD_ESTABILIDADE_SEGUNDOS) -> list[str]:
+        """
+        Aguarda a conclusão de `quantidade` downloads novos (desde `marcar`).
+
+        Args:
+            quantidade (int): Arquivos esperados.
+            timeout (float): Tempo máximo de espera, em segundos.
+            estabilidade (float): Tempo sem mudança de tamanho para considerar o arquivo completo.
+
+        Returns:
+            list[str]: Nomes dos arquivos concluídos.
+
+        Raises:
+            TimeoutError: Se os downloads não forem concluídos dentro do `timeout`.
+        """
+        inicio = time.monotonic()
+        limite = inicio + timeout
+        anterior: dict[str, int] = {}
+        estavel_desde = inicio
+        while True:
+            try:
+                listados = self.listar()
+                erro = None
+            except requests.RequestException as e:
+                # Falha transitória do Selenoid: a espera continua, sem considerar os arquivos estáveis.
+                listados, erro = {}, e
+                logging.debug("Erro ao listar os downloads: %s", e)
+            atuais = {nome: tamanho for nome, tamanho in listados.items() if nome not in self._conhecidos}
+            parciais = [nome for nome in atuais if _parcial(nome)]
+            completos = {nome: tamanho for nome, tamanho in atuais.items() if not _parcial(nome) and tamanho >= 0}
+            agora = time.monotonic()
+            if erro is not None:
+                estavel_desde = agora
+            elif completos != anterior or parciais:
+                anterior = completos
+                estavel_desde = agora
+            elif len(completos) >= quantidade and agora - estavel_desde >= estabilidade:
+                metricas.registrar_tempo("selenium.download", agora - inicio, origem="selenoid" if self.remoto else "local")
+                self._conhecidos.update(completos)
+                return sorted(completos)
+            if agora >= limite:
+                metricas.incrementar("selenium.download.timeout")
+                raise TimeoutError(f"Download não concluído em {timeout}s (concluídos: {sorted(completos)}, em andamento: {parciais}).")
+            time.sleep(DOWNLOAD_POLL_SEGUNDOS)
+
+    @contextmanager
+    def abrir(self, nome: str) -> Iterator[IO[bytes]]:
+        """
+        Abre um arquivo baixado como stream binário (sem carregá-lo inteiro em memória).
+
+        Args:
+            nome (str): Nome do arquivo.
+
+        Yields:
+            IO[bytes]: Stream de leitura.
+        """
+        if self.remoto:
+            with requests.get(self._url_arquivo(nome), stream=True, timeout=60) as resposta:
+                resposta.raise_for_status()
+                resposta.raw.decode_content = True
+                yield resposta.raw
+        else:
+            with open(os.path.join(self.diretorio, nome), "rb") as arquivo:
+                yield arquivo
+
+    def remover(self, nome: str):
+        """Remove um arquivo da pasta de downloads."""
+        self._conhecidos.discard(nome)
+        if self.remoto:
+            requests.delete(self._url_arquivo(nome), timeout=10)
+            return
+        try:
+            os.remove(os.path.join(self.diretorio, nome))
+        except FileNotFoundError:
+            pass
+
+    def processar(self, callback: Callable[[str, IO[bytes]], Any], quantidade: int = 1, timeout: float = DOWNLOAD_TIMEOUT_SEGUNDOS,
+                  remover: bool = True) -> list:
+        """
+        Aguarda os downloads e entrega cada arquivo ao `callback` como stream.
+
+        Args:
+            callback (Callable[[str, IO[bytes]], Any]): Recebe o nome e o stream do arquivo (ex.: ingestão de planilha).
+            quantidade (int): Arquivos esperados.
+            timeout (float): Tempo máximo de espera, em segundos.
+            remover (bool): Se True, remove cada arquivo depois de processado.
+
+        Returns:
+            list: O retorno do `callback` para cada arquivo.
+        """
+        resultados = []
+        for nome in self.aguardar(quantidade, timeout):
+            try:
+                with self.abrir(nome) as fluxo:
+                    resultados.append(callback(nome, fluxo))
+            finally:
+                if remover:
+                    self.remover(nome)
+        return resultados
+
+    def limpar(self):
+        """Remove todos os arquivos da pasta de downloads da sessão."""
+        for nome in self.listar():
+            try:
+                self.remover(nome)
+            except Exception as e:
+                logging.debug("Erro ao remover download %s: %s", nome, e)
+        self._conhecidos.clear()
+
+    def encerrar(self):
+        """Remove a pasta local da sessão, se foi criada para ela."""
+        if self.proprio and self.diretorio:
+            shutil.rmtree(self.diretorio, ignore_errors=True)
+
+
+def anexar_downloads(driver: WebDriver, diretorio: str = None, url_selenoid: str = None, proprio: bool = False) -> WebDriver:
+    """
+    Cria o `GerenciadorDownloads` da sessão (atributo `downloads`) e remove a pasta própria ao encerrá-la.
+
+    Args:
+        driver (WebDriver): Sessão.
+        diretorio (str, optional): Pasta local de downloads.
+        url_selenoid (str, optional): URL do executor, em sessões remotas.
+        proprio (bool): Se True, a pasta local foi criada para a sessão e é removida no `quit`.
+
+    Returns:
+        WebDriver: A mesma sessão.
+    """
+    driver.downloads = GerenciadorDownloads(driver, diretorio, url_selenoid, proprio)
+    if proprio:
+        quit_original = driver.quit
+
+        def quit():
+            try:
+                quit_original()
+            finally:
+                driver.downloads.encerrar()
+
+        driver.quit = quit
+    return driver
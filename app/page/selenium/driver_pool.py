@@ -0,0 +1,327 @@
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from app.page.selenium.instrumentacao import emitir_resumo
+from app.page.selenium.perfil_leve import executar_cdp
+from app.utils.constants import Constants
+from app.utils.periodico import ExecutorPeriodico
+
+# Sessões mantidas abertas por pool.
+POOL_DRIVERS_TAMANHO = int(os.getenv("POOL_DRIVERS_TAMANHO", 2))
+# Empréstimos de uma sessão antes de ser substituída por uma nova.
+POOL_DRIVERS_MAX_USOS = int(os.getenv("POOL_DRIVERS_MAX_USOS", 50))
+# Intervalo da verificação das sessões ociosas; também evita o sessionTimeout do Selenoid.
+POOL_DRIVERS_VERIFICACAO_SEGUNDOS = float(os.getenv("POOL_DRIVERS_VERIFICACAO_SEGUNDOS", 60))
+
+_pools: dict[tuple, "PoolDrivers"] = {}
+_lock_pools = threading.Lock()
+
+
+class SlotDriver:
+    """
+    Uma posição do pool: a sessão atual, sua pasta de downloads exclusiva e a quantidade de usos.
+
+    Atributos:
+        indice (int): Posição no pool.
+        diretorio_download (str): Pasta de downloads da sessão, limpa a cada devolução.
+        driver (WebDriver | None): Sessão atual, ou None se precisar ser criada.
+        usos (int): Empréstimos da sessão atual.
+        origens (set[str]): Origens abertas com `driver.get` desde a última limpeza.
+    """
+
+    def __init__(self, indice: int, diretorio_download: str):
+        self.indice = indice
+        self.diretorio_download = diretorio_download
+        self.driver: WebDriver | None = None
+        self.usos = 0
+        self.origens: set[str] = set()
+
+
+def _origem(url: str) -> str | None:
+    """Origem (esquema://host[:porta]) de uma URL http(s); None para about:blank, data: etc."""
+    partes = urlparse(url or "")
+    if partes.scheme in ("http", "https") and partes.netloc:
+        return f"{partes.scheme}://{partes.netloc}"
+    return None
+
+
+def _rastrear_origens(slot: SlotDriver):
+    """Registra em `slot.origens` a origem de cada `driver.get` da sessão do slot."""
+    get_original = slot.driver.get
+
+    def get(url: str):
+        origem = _origem(url)
+        if origem:
+            slot.origens.add(origem)
+        return get_original(url)
+
+    slot.driver.get = get
+
+
+class PoolDrivers:
+    """
+    Pool de sessões WebDriver aquecidas, emprestadas por `emprestar()`.
+
+    As sessões são criadas antecipadamente (em paralelo) e reaproveitadas entre execuções. Na
+    devolução a sessão é limpa (abas extras, cookies, storage e downloads); sessões que falham na
+    verificação de saúde, que geraram erro do WebDriver ou que atingiram `max_usos` são substituídas.
+
+    Exemplo:
+        pool = obter_pool_drivers(driver_prod=True, projeto="Consulta")
+        with pool.emprestar() as driver:
+            driver.get("https://...")
+
+    Atributos:
+        tamanho (int): Quantidade de sessões do pool.
+        max_usos (int): Empréstimos de uma sessão antes de ser recriada.
+    """
+
+    def __init__(self, fabrica: Callable[[str], WebDriver], tamanho: int = POOL_DRIVERS_TAMANHO, max_usos: int = POOL_DRIVERS_MAX_USOS,
+                 nome: str = "pool", intervalo_verificacao: float = POOL_DRIVERS_VERIFICACAO_SEGUNDOS):
+        """
+        Args:
+            fabrica (Callable[[str], WebDriver]): Cria uma sessão recebendo a pasta de downloads (ex.: `iniciar_driver_local`).
+            tamanho (int): Quantidade de sessões. Default é `POOL_DRIVERS_TAMANHO`.
+            max_usos (int): Empréstimos antes de recriar a sessão. Default é `POOL_DRIVERS_MAX_USOS`.
+            nome (str): Nome do pool, usado nas pastas de download e nos logs.
+            intervalo_verificacao (float): Intervalo da verificação das sessões ociosas, em segundos.
+        """
+        self.tamanho = max(1, tamanho)
+        self.max_usos = max_usos
+        self.nome = nome
+        self._fabrica = fabrica
+        self._livres: queue.Queue[SlotDriver] = queue.Queue()
+        self._slots = [SlotDriver(i, os.path.join(Constants.TEMP_DIR, "drivers", nome, str(i))) for i in range(self.tamanho)]
+        for slot in self._slots:
+            self._livres.put(slot)
+        self._verificacao = ExecutorPeriodico(f"verificacao-{nome}", intervalo_verificacao, self.verificar_ociosos, executar_ao_iniciar=False)
+        self._encerrado = False
+
+    def aquecer(self):
+        """Cria em paralelo as sessões que ainda não existem e inicia a verificação periódica."""
+        self._encerrado = False
+        pendentes = [slot for slot in self._slots if slot.driver is None]
+        if pendentes:
+            with ThreadPoolExecutor(len(pendentes), thread_name_prefix=f"aquecer-{self.nome}") as executor:
+                for slot, erro in zip(pendentes, executor.map(self._tentar_criar, pendentes)):
+                    if erro is not None:
+                        logging.error("Pool %s: não foi possível aquecer a sessão %s: %s", self.nome, slot.indice, erro)
+        self._verificacao.iniciar()
+
+    @contextmanager
+    def emprestar(self, timeout: float = None):
+        """
+        Empresta uma sessão saudável do pool e a devolve limpa ao final do bloco.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera por uma sessão livre, em segundos.
+
+        Yields:
+            WebDriver: Sessão exclusiva durante o bloco.
+
+        Raises:
+            TimeoutError: Se nenhuma sessão ficar livre dentro do `timeout`.
+        """
+        if self._encerrado:
+            raise RuntimeError(f"Pool de drivers {self.nome} encerrado.")
+        try:
+            slot = self._livres.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Nenhuma sessão livre no pool {self.nome} após {timeout}s.")
+        descartar = False
+        try:
+            if slot.driver is None or not self._saudavel(slot.driver):
+                self._recriar(slot)
+            slot.usos += 1
+            yield slot.driver
+        except WebDriverException:
+            # A sessão pode ter ficado em estado inconsistente; não é reaproveitada.
+            descartar = True
+            raise
+        finally:
+            emitir_resumo(slot.driver)
+            try:
+                if descartar or slot.usos >= self.max_usos or self._encerrado or not self._limpar(slot):
+                    self._descartar(slot)
+            finally:
+                self._livres.put(slot)
+
+    def verificar_ociosos(self):
+        """
+        Verifica as sessões livres e descarta as que não respondem.
+
+        O comando enviado também mantém a sessão ativa no Selenoid.
+        """
+        for _ in range(self._livres.qsize()):
+            try:
+                slot = self._livres.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if slot.driver is not None and not self._saudavel(slot.driver):
+                    logging.warning("Pool %s: sessão %s sem resposta; será recriada no próximo uso.", self.nome, slot.indice)
+                    self._descartar(slot)
+            finally:
+                self._livres.put(slot)
+
+    def encerrar(self):
+        """Encerra a verificação periódica e todas as sessões livres; as emprestadas são encerradas na devolução."""
+        self._encerrado = True
+        self._verificacao.parar()
+        for _ in range(self._livres.qsize()):
+            try:
+                slot = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(slot)
+            self._livres.put(slot)
+
+    def _tentar_criar(self, slot: SlotDriver):
+        try:
+            self._recriar(slot)
+            return None
+        except Exception as e:
+            return e
+
+    def _recriar(self, slot: SlotDriver):
+        self._descartar(slot)
+        os.makedirs(slot.diretorio_download, exist_ok=True)
+        inicio = time.perf_counter()
+        slot.driver = self._fabrica(slot.diretorio_download)
+        slot.usos = 0
+        slot.origens.clear()
+        _rastrear_origens(slot)
+        logging.info("Pool %s: sessão %s criada em %.1fs.", self.nome, slot.indice, time.perf_counter() - inicio)
+
+    @staticmethod
+    def _descartar(slot: SlotDriver):
+        if slot.driver is not None:
+            try:
+                slot.driver.quit()
+            except Exception as e:
+                logging.debug("Erro ao encerrar sessão do pool: %s", e)
+        slot.driver = None
+        slot.usos = 0
+
+    @staticmethod
+    def _saudavel(driver: WebDriver) -> bool:
+        try:
+            return driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    def _limpar(self, slot: SlotDriver) -> bool:
+        """
+        Deixa a sessão pronta para o próximo uso: uma única aba em about:blank, sem cookies,
+        storage ou downloads do uso anterior.
+
+        O Chrome não limpa o storage de todas as origens de uma vez (`Storage.clearDataForOrigin`
+        exige uma origem), então são limpas, via CDP, as origens abertas com `driver.get`, as das abas
+        abertas na devolução e as dos domínios com cookies. Os cookies de todos os domínios são
+        removidos com `Network.clearBrowserCookies`. Se o CDP não estiver disponível, a sessão é
+        descartada em vez de reaproveitada sem isolamento.
+
+        Returns:
+            bool: False se a limpeza falhar (a sessão é descartada).
+        """
+        driver = slot.driver
+        if driver is None:
+            return False
+        try:
+            origens = set(slot.origens)
+            abas = driver.window_handles
+            for aba in reversed(abas):
+                driver.switch_to.window(aba)
+                origens.add(_origem(driver.current_url))
+                if aba != abas[0]:
+                    driver.close()
+            for cookie in executar_cdp(driver, "Network.getAllCookies").get("cookies", []):
+                dominio = cookie.get("domain", "").lstrip(".")
+                if dominio:
+                    origens.update({f"https://{dominio}", f"http://{dominio}"})
+            for origem in origens - {None}:
+                executar_cdp(driver, "Storage.clearDataForOrigin", {"origin": origem, "storageTypes": "all"})
+            executar_cdp(driver, "Network.clearBrowserCookies")
+            slot.origens.clear()
+            driver.get("about:blank")
+        except Exception as e:
+            logging.warning("Pool %s: falha ao limpar a sessão %s: %s", self.nome, slot.indice, e)
+            return False
+        downloads = getattr(driver, "downloads", None)
+        if downloads is not None:
+            try:
+                downloads.limpar()
+            except Exception as e:
+                logging.warning("Pool %s: falha ao limpar os downloads da sessão %s: %s", self.nome, slot.indice, e)
+                return False
+        else:
+            shutil.rmtree(slot.diretorio_download, ignore_errors=True)
+            os.makedirs(slot.diretorio_download, exist_ok=True)
+        return True
+
+
+def obter_pool_drivers(driver_prod: bool = True, projeto: str = None, headless: bool = False) -> PoolDrivers:
+    """
+    Retorna o pool de sessões do processo para o ambiente (Selenoid ou Chrome local) e projeto,
+    criando e aquecendo-o no primeiro uso.
+
+    Args:
+        driver_prod (bool): True para sessões remotas (`iniciar_driver_prod`), False para locais (`iniciar_driver_local`).
+        projeto (str, optional): Nome do projeto no Selenoid.
+        headless (bool): Se True, inicia os navegadores em modo headless.
+
+    Returns:
+        PoolDrivers: O pool compartilhado.
+    """
+    from app.page.selenium import iniciar_driver_local, iniciar_driver_prod
+
+    chave = (driver_prod, projeto, headless)
+    with _lock_pools:
+        pool = _pools.get(chave)
+        if pool is None:
+            if driver_prod:
+                # Sessões remotas baixam no container; a pasta local do slot não é usada.
+                fabrica = lambda _diretorio: iniciar_driver_prod(projeto, headless=headless)
+            else:
+                fabrica = lambda diretorio: iniciar_driver_local(headless=headless, diretorio_download=diretorio)
+            pool = _pools[chave] = PoolDrivers(fabrica, nome=f"{'prod' if driver_prod else 'local'}-{len(_pools)}")
+            pool.aquecer()
+        return pool
+
+
+@contextmanager
+def iniciar_driver_context_pool(projeto: str = None, driver_prod=True, timeout: float = None):
+    """
+    Equivalente a `iniciar_driver_context_selecionado`, mas empresta uma sessão aquecida do pool em
+    vez de criar (e encerrar) uma sessão nova.
+
+    Args:
+        projeto (str): Nome do projeto (usado apenas se for ambiente de produção).
+        driver_prod (bool): Define se será usado o driver remoto (True) ou local (False).
+        timeout (float, optional): Tempo máximo de espera por uma sessão livre, em segundos.
+
+    Yields:
+        WebDriver: Sessão exclusiva durante o bloco.
+    """
+    with obter_pool_drivers(driver_prod, projeto).emprestar(timeout) as driver:
+        yield driver
+
+
+def encerrar_pools_drivers():
+    """Encerra as sessões de todos os pools do processo; chamada no desligamento da aplicação."""
+    with _lock_pools:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.encerrar()
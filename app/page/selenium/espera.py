@@ -0,0 +1,145 @@
+import logging
+import os
+import time
+from typing import Any, Callable
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from app.page.selenium.instrumentacao import fase_espera
+from app.utils.metricas import metricas
+
+# Intervalo entre as tentativas das esperas, em segundos.
+ESPERA_POLL_SEGUNDOS = float(os.getenv("ESPERA_POLL_SEGUNDOS", 0.1))
+# Tempo máximo das verificações `_existe_*`/`_verificar_texto_*` (antes um `time.sleep(1)` fixo).
+ESPERA_VERIFICACAO_SEGUNDOS = float(os.getenv("ESPERA_VERIFICACAO_SEGUNDOS", 1))
+
+# Exceções tratadas como "condição ainda não satisfeita" durante a espera.
+EXCECOES_IGNORADAS = (NoSuchElementException, StaleElementReferenceException)
+
+
+class EsperaMedida(WebDriverWait):
+    """`WebDriverWait` que identifica, na instrumentação da sessão, os comandos feitos durante a espera."""
+
+    def until(self, method, message: str = ""):
+        with fase_espera(self._driver):
+            return super().until(method, message)
+
+    def until_not(self, method, message: str = ""):
+        with fase_espera(self._driver):
+            return super().until_not(method, message)
+
+
+class MotorEspera:
+    """
+    Motor de espera compartilhado pelos mixins de localização (`IdAbstract`, `XpathAbstract`...).
+
+    Consulta a condição a cada `poll` segundos e retorna assim que ela for satisfeita, em vez de
+    dormir um tempo fixo. A duração de cada espera é registrada em `app.utils.metricas` com o nome
+    do helper e o resultado (ok/timeout).
+
+    Atributos:
+        webbot (WebDriver): Instância do WebDriver.
+        poll (float): Intervalo entre as tentativas, em segundos.
+        timeout_verificacao (float): Tempo máximo padrão de `verificar`/`existe`.
+    """
+
+    def __init__(self, webbot, poll: float = ESPERA_POLL_SEGUNDOS, timeout_verificacao: float = ESPERA_VERIFICACAO_SEGUNDOS):
+        """
+        Args:
+            webbot (WebDriver): Instância do WebDriver.
+            poll (float): Intervalo entre as tentativas, em segundos. Default é `ESPERA_POLL_SEGUNDOS`.
+            timeout_verificacao (float): Tempo máximo das verificações. Default é `ESPERA_VERIFICACAO_SEGUNDOS`.
+        """
+        self.webbot = webbot
+        self.poll = poll
+        self.timeout_verificacao = timeout_verificacao
+
+    def wait(self, timeout: float) -> WebDriverWait:
+        """
+        Cria um `WebDriverWait` com o intervalo de tentativas do motor.
+
+        Args:
+            timeout (float): Tempo máximo de espera, em segundos.
+        """
+        return EsperaMedida(self.webbot, timeout, poll_frequency=self.poll, ignored_exceptions=EXCECOES_IGNORADAS)
+
+    def ate(self, condicao: Callable[[Any], Any], timeout: float, nome: str = "espera") -> Any:
+        """
+        Aguarda até a condição retornar um valor verdadeiro.
+
+        Args:
+            condicao (Callable[[WebDriver], Any]): Função chamada com o WebDriver a cada tentativa.
+            timeout (float): Tempo máximo de espera, em segundos.
+            nome (str): Nome registrado nas métricas (normalmente o helper que está esperando).
+
+        Returns:
+            Any: O valor retornado pela condição.
+
+        Raises:
+            TimeoutException: Se a condição não for satisfeita dentro do `timeout`.
+        """
+        inicio = time.perf_counter()
+        try:
+            resultado = self.wait(timeout).until(condicao)
+        except TimeoutException:
+            self._registrar(nome, inicio, "timeout")
+            raise
+        self._registrar(nome, inicio, "ok")
+        return resultado
+
+    def verificar(self, condicao: Callable[[Any], Any], timeout: float = None, nome: str = "verificacao") -> Any:
+        """
+        Aguarda até a condição ser satisfeita e retorna seu resultado, sem lançar exceção no timeout.
+
+        No timeout a condição é avaliada uma última vez sem ignorar exceções, preservando o
+        comportamento dos helpers que usavam `find_element` após o `time.sleep` (ex.: lançar
+        `NoSuchElementException` se o elemento não existir).
+
+        Args:
+            condicao (Callable[[WebDriver], Any]): Função chamada com o WebDriver a cada tentativa.
+            timeout (float, optional): Tempo máximo de espera. Default é `timeout_verificacao`.
+            nome (str): Nome registrado nas métricas.
+
+        Returns:
+            Any: O resultado da condição (falso se não foi satisfeita a tempo).
+        """
+        inicio = time.perf_counter()
+        try:
+            resultado = self.wait(self.timeout_verificacao if timeout is None else timeout).until(condicao)
+            self._registrar(nome, inicio, "ok")
+            return resultado
+        except TimeoutException:
+            self._registrar(nome, inicio, "timeout")
+        return condicao(self.webbot)
+
+    def existe(self, by: str, valor: str, timeout: float = None, nome: str = None) -> bool:
+        """
+        Verifica se existe pelo menos um elemento para o localizador, aguardando até `timeout`.
+
+        Args:
+            by (str): Estratégia de localização (`By.ID`, `By.XPATH`...).
+            valor (str): Valor do localizador.
+            timeout (float, optional): Tempo máximo de espera. Default é `timeout_verificacao`.
+            nome (str, optional): Nome registrado nas métricas.
+
+        Returns:
+            bool: True se o elemento aparecer dentro do tempo.
+        """
+        return bool(self.verificar(lambda driver: len(driver.find_elements(by, valor)) > 0, timeout, nome or f"existe_{by}"))
+
+    def texto_igual(self, by: str, valor: str, texto: str, timeout: float = None, nome: str = None) -> bool:
+        """
+        Verifica se o texto do elemento é igual a `texto` (sem diferenciar maiúsculas), aguardando até `timeout`.
+
+        Raises:
+            NoSuchElementException: Se o elemento não existir ao fim da espera.
+        """
+        return self.verificar(lambda driver: driver.find_element(by, valor).text.upper() == texto.upper(), timeout,
+                              nome or f"texto_{by}")
+
+    def _registrar(self, nome: str, inicio: float, resultado: str):
+        duracao = time.perf_counter() - inicio
+        metricas.registrar_tempo("selenium.espera", duracao, helper=nome, resultado=resultado)
+        logging.debug("Espera %s: %s em %.3fs", nome, resultado, duracao)
+
@@ -1,16 +1,20 @@
-import time
 from abc import ABC
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.expected_conditions import presence_of_element_located, element_to_be_clickable
+from selenium.webdriver.support.ui import Select
+
+from app.page.selenium.espera import MotorEspera
 
 
 class IdAbstract(ABC):
-    def __init__(self, webbot, wait_d, wait_r):
+    def __init__(self, webbot, wait_d, wait_r, espera: MotorEspera = None):
         self.webbot = webbot
         self.wait_d = wait_d
         self.wait_r = wait_r
+        self.espera = espera or MotorEspera(webbot)
 
     def _selecionar_option_por_id_visible_text_js(self, id_element: str, value_element: str, rapido=False) -> bool:
         """
@@ -45,7 +49,7 @@ class IdAbstract(ABC):
             bool: True se a operação for bem-sucedida, False caso contrário.
         """
         try:
-            (self.wait_r if rapido else self.wait_d).until(presence_of_element_located((By.ID, id_element))).select_by_value(value_element)
+            Select((self.wait_r if rapido else self.wait_d).until(presence_of_element_located((By.ID, id_element)))).select_by_value(value_element)
             return True
         except Exception:
             return False
@@ -63,7 +67,7 @@ class IdAbstract(ABC):
             bool: True se a operação for bem-sucedida, False caso contrário.
         """
         try:
-            (self.wait_r if rapido else self.wait_d).until(presence_of_element_located((By.ID, id_element))).select_by_visible_text(value_element)
+            Select((self.wait_r if rapido else self.wait_d).until(presence_of_element_located((By.ID, id_element)))).select_by_visible_text(value_element)
             return True
         except Exception:
             return False
@@ -81,33 +85,32 @@ class IdAbstract(ABC):
             bool: True se a operação for bem-sucedida, False caso contrário.
         """
         try:
-            (self.wait_r if rapido else self.wait_d).until(presence_of_element_located((By.ID, id_element))).select_by_visible_text(value_element)
+            Select((self.wait_r if rapido else self.wait_d).until(presence_of_element_located((By.ID, id_element)))).select_by_visible_text(value_element)
             return True
         except Exception:
             return False
 
-    def _selecionar_option_por_id_visible_text_loop(self, id_element: str, value_element: str):
+    def _selecionar_option_por_id_visible_text_loop(self, id_element: str, value_element: str, timeout: float = 20):
         """
         Seleciona uma opção de um elemento <select> pelo seu ID, baseado no texto visível da opção,
-        com tentativas repetidas.
+        tentando novamente até o <select> e a opção existirem.
 
         Args:
             id_element (str): O ID do elemento <select>.
             value_element (str): O texto visível da opção a ser selecionada.
+            timeout (float, optional): Tempo máximo de espera, em segundos. Default é 20.
 
         Raises:
-            RuntimeError: Se a opção não puder ser selecionada após 20 tentativas.
-        """
-        i = 0
-        while True:
-            try:
-                self._selecionar_option_por_id_visible_text(id_element, value_element)
-                break
-            except Exception as e:
-                if i > 19:
-                    raise RuntimeError(f"Erro ao tentar selecionar a ação: {e}")
-                i += 1
-                time.sleep(1)
+            RuntimeError: Se a opção não puder ser selecionada dentro do `timeout`.
+        """
+        def selecionar(driver) -> bool:
+            Select(driver.find_element(By.ID, id_element)).select_by_visible_text(value_element)
+            return True
+
+        try:
+            self.espera.ate(selecionar, timeout, nome="_selecionar_option_por_id_visible_text_loop")
+        except TimeoutException as e:
+            raise RuntimeError(f"Erro ao tentar selecionar a ação: {e}")
 
     def _preencher_input_por_id(self, id_element: str, value: str, rapido=False) -> bool:
         """
@@ -212,8 +215,7 @@ class IdAbstract(ABC):
         Returns:
             bool: True se pelo menos um elemento com o ID existir, False caso contrário.
         """
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.ID, id_element)) > 0
+        return self.espera.existe(By.ID, id_element, nome="_existe_id")
 
     def _verificar_texto_por_id(self, id_element: str, text: str) -> bool:
         """
@@ -226,8 +228,7 @@ class IdAbstract(ABC):
         Returns:
             bool: True se o texto corresponder, False caso contrário.
         """
-        time.sleep(1)
-        return self.webbot.find_element(By.ID, id_element).text.upper() == text.upper()
+        return self.espera.texto_igual(By.ID, id_element, text, nome="_verificar_texto_por_id")
 
     def _verificar_atributo_por_id(self, id_element: str, atributo: str, valor: str) -> bool:
         """
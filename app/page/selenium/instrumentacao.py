@@ -0,0 +1,234 @@
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from app.utils.metricas import EstatisticaTempo, metricas
+
+# Mede os comandos WebDriver das sessões criadas por `iniciar_driver_prod`/`iniciar_driver_local`.
+SELENIUM_INSTRUMENTACAO = os.getenv("SELENIUM_INSTRUMENTACAO", "true").lower() in ("1", "true", "sim")
+
+SEM_HELPER = "-"
+
+# Helper (`_click_por_xpath`...) em execução na thread/contexto atual; apenas o mais externo é considerado.
+_helper_atual: ContextVar[str | None] = ContextVar("selenium_helper_atual", default=None)
+# True enquanto uma espera (`WebDriverWait.until`) está em andamento.
+_em_espera: ContextVar[bool] = ContextVar("selenium_em_espera", default=False)
+
+
+class _EstatisticaHelper:
+    __slots__ = ("chamadas", "total", "espera", "comandos", "comandos_segundos", "comandos_espera", "comandos_espera_segundos")
+
+    def __init__(self):
+        self.chamadas = 0
+        self.total = 0.0
+        self.espera = 0.0
+        self.comandos = 0
+        self.comandos_segundos = 0.0
+        self.comandos_espera = 0
+        self.comandos_espera_segundos = 0.0
+
+    def resumo(self) -> dict:
+        return {
+            "chamadas": self.chamadas,
+            "total_segundos": round(self.total, 4),
+            "espera_segundos": round(self.espera, 4),
+            "comandos": self.comandos,
+            "comandos_segundos": round(self.comandos_segundos, 4),
+            "comandos_na_espera": self.comandos_espera,
+            "comandos_na_espera_segundos": round(self.comandos_espera_segundos, 4),
+        }
+
+
+class InstrumentacaoDriver:
+    """
+    Tempos dos comandos WebDriver de uma sessão, por comando, estratégia de localização e helper.
+
+    Cada comando enviado ao driver (ou ao Selenoid) é medido no `command_executor`. O tempo dos
+    helpers é separado em espera (`WebDriverWait`, incluindo os intervalos entre as tentativas) e
+    comandos fora da espera; os comandos feitos durante a espera (tentativas) são contados à parte.
+
+    Atributos:
+        inicio (float): Início da execução atual (`time.monotonic`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.inicio = time.monotonic()
+        self._helpers: dict[str, _EstatisticaHelper] = {}
+        self._comandos: dict[tuple[str, str], EstatisticaTempo] = {}
+
+    def _helper(self, nome: str) -> _EstatisticaHelper:
+        estatistica = self._helpers.get(nome)
+        if estatistica is None:
+            estatistica = self._helpers[nome] = _EstatisticaHelper()
+        return estatistica
+
+    def registrar_comando(self, comando: str, estrategia: str, segundos: float):
+        helper = _helper_atual.get() or SEM_HELPER
+        na_espera = _em_espera.get()
+        with self._lock:
+            estatistica = self._helper(helper)
+            if na_espera:
+                estatistica.comandos_espera += 1
+                estatistica.comandos_espera_segundos += segundos
+            else:
+                estatistica.comandos += 1
+                estatistica.comandos_segundos += segundos
+            chave = (comando, estrategia)
+            if chave not in self._comandos:
+                self._comandos[chave] = EstatisticaTempo()
+            self._comandos[chave].registrar(segundos)
+        metricas.registrar_tempo("selenium.comando", segundos, comando=comando, estrategia=estrategia, helper=helper,
+                                 fase="espera" if na_espera else "comando")
+
+    def registrar_espera(self, segundos: float):
+        with self._lock:
+            self._helper(_helper_atual.get() or SEM_HELPER).espera += segundos
+
+    def registrar_helper(self, nome: str, segundos: float):
+        with self._lock:
+            estatistica = self._helper(nome)
+            estatistica.chamadas += 1
+            estatistica.total += segundos
+        metricas.registrar_tempo("selenium.helper", segundos, helper=nome)
+
+    def resumo(self) -> dict:
+        """
+        Returns:
+            dict: duracao_segundos da execução, `helpers` (tempo total, espera e comandos de cada helper)
+            e `comandos` (estatísticas por comando e estratégia de localização).
+        """
+        with self._lock:
+            return {
+                "duracao_segundos": round(time.monotonic() - self.inicio, 3),
+                "helpers": {nome: estatistica.resumo() for nome, estatistica in self._helpers.items()},
+                "comandos": [{"comando": comando, "estrategia": estrategia, **estatistica.resumo()}
+                             for (comando, estrategia), estatistica in self._comandos.items()],
+            }
+
+    def reiniciar(self):
+        """Zera os tempos, iniciando uma nova execução."""
+        with self._lock:
+            self.inicio = time.monotonic()
+            self._helpers.clear()
+            self._comandos.clear()
+
+
+def instrumentar_driver(driver: WebDriver) -> WebDriver:
+    """
+    Passa a medir todos os comandos da sessão e registra o resumo da execução no log ao encerrá-la.
+
+    Args:
+        driver (WebDriver): Sessão criada pelos `iniciar_driver_*`.
+
+    Returns:
+        WebDriver: A mesma sessão, com o atributo `instrumentacao` (`InstrumentacaoDriver`).
+    """
+    if getattr(driver, "instrumentacao", None) is not None:
+        return driver
+    instrumentacao = InstrumentacaoDriver()
+    executor = driver.command_executor
+    executar_original = executor.execute
+
+    def executar(comando, parametros):
+        inicio = time.perf_counter()
+        try:
+            return executar_original(comando, parametros)
+        finally:
+            estrategia = parametros.get("using", "-") if isinstance(parametros, dict) else "-"
+            instrumentacao.registrar_comando(comando, estrategia, time.perf_counter() - inicio)
+
+    executor.execute = executar
+    quit_original = driver.quit
+
+    def quit():
+        try:
+            emitir_resumo(driver)
+        finally:
+            quit_original()
+
+    driver.quit = quit
+    driver.instrumentacao = instrumentacao
+    return driver
+
+
+def emitir_resumo(driver: WebDriver, reiniciar: bool = True) -> dict | None:
+    """
+    Registra no log o resumo da execução da sessão (ex.: ao devolver uma sessão do pool ou ao encerrá-la).
+
+    Args:
+        driver (WebDriver): Sessão instrumentada.
+        reiniciar (bool): Se True, zera os tempos para a próxima execução.
+
+    Returns:
+        dict | None: O resumo, ou None se a sessão não é instrumentada.
+    """
+    instrumentacao = getattr(driver, "instrumentacao", None)
+    if instrumentacao is None:
+        return None
+    resumo = instrumentacao.resumo()
+    if resumo["helpers"]:
+        lentos = sorted(resumo["helpers"].items(), key=lambda item: item[1]["total_segundos"], reverse=True)[:10]
+        logging.info("Resumo WebDriver (%ss): %s", resumo["duracao_segundos"],
+                     "; ".join(f"{nome}: {dados['total_segundos']}s (espera {dados['espera_segundos']}s, "
+                               f"{dados['comandos'] + dados['comandos_na_espera']} comandos)" for nome, dados in lentos))
+    if reiniciar:
+        instrumentacao.reiniciar()
+    return resumo
+
+
+@contextmanager
+def fase_espera(driver: WebDriver):
+    """Marca os comandos do bloco como tentativas de uma espera e soma sua duração ao helper atual."""
+    instrumentacao = getattr(driver, "instrumentacao", None)
+    if instrumentacao is None or _em_espera.get():
+        yield
+        return
+    token = _em_espera.set(True)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _em_espera.reset(token)
+        instrumentacao.registrar_espera(time.perf_counter() - inicio)
+
+
+def _medir_helper(nome: str, funcao):
+    @functools.wraps(funcao)
+    def medido(self, *args, **kwargs):
+        instrumentacao = getattr(getattr(self, "webbot", None), "instrumentacao", None)
+        if instrumentacao is None or _helper_atual.get() is not None:
+            return funcao(self, *args, **kwargs)
+        token = _helper_atual.set(nome)
+        inicio = time.perf_counter()
+        try:
+            return funcao(self, *args, **kwargs)
+        finally:
+            _helper_atual.reset(token)
+            instrumentacao.registrar_helper(nome, time.perf_counter() - inicio)
+    medido.__instrumentado__ = True
+    return medido
+
+
+def instrumentar_helpers(cls):
+    """
+    Decorator de classe que identifica os helpers (`_click_por_xpath`, `_preencher_input_por_id`...)
+    da classe e dos mixins de `app.page.selenium`, para que os comandos sejam atribuídos ao helper chamado.
+
+    Só tem efeito em sessões instrumentadas; nas demais o custo é uma verificação de atributo.
+    """
+    for base in reversed(cls.__mro__):
+        if not base.__module__.startswith("app.page.selenium"):
+            continue
+        for nome, funcao in list(vars(base).items()):
+            if (nome.startswith("_") and not nome.startswith("__") and inspect.isfunction(funcao)
+                    and not getattr(funcao, "__instrumentado__", False)):
+                setattr(cls, nome, _medir_helper(nome, funcao))
+    return cls
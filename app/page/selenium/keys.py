@@ -4,12 +4,15 @@ from abc import ABC
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.keys import Keys
 
+from app.page.selenium.espera import MotorEspera
+
 
 class KeysAbstract(ABC):
-    def __init__(self, webbot, wait_d, wait_r):
+    def __init__(self, webbot, wait_d, wait_r, espera: MotorEspera = None):
         self.webbot = webbot
         self.wait_d = wait_d
         self.wait_r = wait_r
+        self.espera = espera or MotorEspera(webbot)
 
     def esc(self):
         """
@@ -0,0 +1,117 @@
+from selenium.webdriver.common.by import By
+
+# Propriedades que podem ser lidas de cada elemento.
+PROPRIEDADES = ("existe", "texto", "valor", "visivel", "habilitado", "selecionado", "quantidade")
+
+# Estratégias do Selenium aceitas pela consulta em lote.
+_TIPOS = {By.ID: "id", By.XPATH: "xpath", By.CSS_SELECTOR: "css", By.CLASS_NAME: "class", By.TAG_NAME: "tag", By.NAME: "name"}
+
+# Resolve todas as consultas no navegador e devolve apenas os dados pedidos (uma única ida e volta).
+_SCRIPT_LOTE = """
+const consultas = arguments[0];
+function buscar(c) {
+    switch (c.tipo) {
+        case 'id': { const el = document.getElementById(c.valor); return el ? [el] : []; }
+        case 'css': return Array.from(document.querySelectorAll(c.valor));
+        case 'class': return Array.from(document.getElementsByClassName(c.valor));
+        case 'tag': return Array.from(document.getElementsByTagName(c.valor));
+        case 'name': return Array.from(document.getElementsByName(c.valor));
+        case 'xpath': {
+            const r = document.evaluate(c.valor, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const els = [];
+            for (let i = 0; i < r.snapshotLength; i++) els.push(r.snapshotItem(i));
+            return els;
+        }
+    }
+    throw new Error('Tipo de localizador inválido: ' + c.tipo);
+}
+function visivel(el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    const estilo = window.getComputedStyle(el);
+    return estilo.visibility !== 'hidden' && estilo.opacity !== '0';
+}
+function ler(el, c) {
+    const r = {};
+    for (const p of c.props) {
+        if (p === 'existe') r.existe = true;
+        else if (p === 'texto') r.texto = visivel(el) ? (el.innerText || '').trim() : '';
+        else if (p === 'valor') r.valor = el.value === undefined ? null : el.value;
+        else if (p === 'visivel') r.visivel = visivel(el);
+        else if (p === 'habilitado') r.habilitado = !el.disabled;
+        else if (p === 'selecionado') r.selecionado = !!(el.checked || el.selected);
+    }
+    if (c.atributos.length) {
+        r.atributos = {};
+        for (const a of c.atributos) r.atributos[a] = el.getAttribute(a);
+    }
+    return r;
+}
+const resultado = {};
+for (const c of consultas) {
+    try {
+        const els = buscar(c);
+        if (c.todos) {
+            resultado[c.chave] = els.map(el => ler(el, c));
+        } else if (els.length) {
+            resultado[c.chave] = ler(els[0], c);
+            if (c.props.includes('quantidade')) resultado[c.chave].quantidade = els.length;
+        } else {
+            resultado[c.chave] = {existe: false, quantidade: 0};
+        }
+    } catch (e) {
+        resultado[c.chave] = {existe: false, erro: String(e && e.message || e)};
+    }
+}
+return resultado;
+"""
+
+
+class ConsultaDom:
+    """
+    Uma consulta da leitura em lote: um localizador e o que ler do(s) elemento(s) encontrado(s).
+
+    Atributos:
+        chave (str): Nome da consulta no resultado.
+        by (str): Estratégia de localização (`By.ID`, `By.XPATH`, `By.CSS_SELECTOR`, `By.CLASS_NAME`, `By.TAG_NAME`, `By.NAME`).
+        valor (str): Valor do localizador.
+        propriedades (tuple[str, ...]): Propriedades lidas (ver `PROPRIEDADES`).
+        atributos (tuple[str, ...]): Atributos HTML lidos.
+        todos (bool): Se True, lê todos os elementos encontrados (lista); senão, apenas o primeiro.
+    """
+
+    __slots__ = ("chave", "by", "valor", "propriedades", "atributos", "todos")
+
+    def __init__(self, chave: str, by: str, valor: str, propriedades: tuple[str, ...] = ("existe", "texto"),
+                 atributos: tuple[str, ...] = (), todos: bool = False):
+        if by not in _TIPOS:
+            raise ValueError(f"Localizador não suportado na consulta em lote: {by}")
+        invalidas = set(propriedades) - set(PROPRIEDADES)
+        if invalidas:
+            raise ValueError(f"Propriedades inválidas: {sorted(invalidas)}")
+        self.chave = chave
+        self.by = by
+        self.valor = valor
+        self.propriedades = tuple(propriedades)
+        self.atributos = tuple(atributos)
+        self.todos = todos
+
+    def para_script(self) -> dict:
+        return {"chave": self.chave, "tipo": _TIPOS[self.by], "valor": self.valor, "props": list(self.propriedades),
+                "atributos": list(self.atributos), "todos": self.todos}
+
+
+def consultar_lote(webbot, consultas: list[ConsultaDom]) -> dict:
+    """
+    Resolve todas as consultas em um único `execute_script`.
+
+    Args:
+        webbot (WebDriver): Instância do WebDriver.
+        consultas (list[ConsultaDom]): Consultas a resolver.
+
+    Returns:
+        dict: Para cada `chave`, um dict com as propriedades lidas (`{"existe": False}` se o elemento não
+        existir, com `erro` se o localizador for inválido) ou, para consultas com `todos=True`, uma lista de dicts.
+    """
+    if not consultas:
+        return {}
+    return webbot.execute_script(_SCRIPT_LOTE, [consulta.para_script() for consulta in consultas])
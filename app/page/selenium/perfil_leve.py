@@ -0,0 +1,170 @@
+import logging
+import os
+from urllib.parse import urlparse
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from app.utils.metricas import metricas
+
+# Usa o perfil leve por padrão em `iniciar_driver_prod`/`iniciar_driver_local`.
+SELENIUM_PERFIL_LEVE = os.getenv("SELENIUM_PERFIL_LEVE", "false").lower() in ("1", "true", "sim")
+# Sites (host, separados por vírgula) em que as imagens continuam liberadas (ex.: páginas com captcha).
+SELENIUM_PERFIL_LEVE_SITES_PERMITIDOS = [site.strip() for site in os.getenv("SELENIUM_PERFIL_LEVE_SITES_PERMITIDOS", "").split(",") if site.strip()]
+# Padrões de URL adicionais bloqueados (separados por vírgula, `*` como curinga).
+SELENIUM_PERFIL_LEVE_BLOQUEAR = [padrao.strip() for padrao in os.getenv("SELENIUM_PERFIL_LEVE_BLOQUEAR", "").split(",") if padrao.strip()]
+
+PADROES_FONTES = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+PADROES_MIDIA = ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.m3u8"]
+PADROES_RASTREADORES = ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+                        "*hotjar.com*", "*clarity.ms*", "*newrelic.com*", "*nr-data.net*"]
+
+# Lê da Performance API o volume transferido pela página atual, por tipo de recurso.
+_SCRIPT_TRANSFERENCIA = """
+const entradas = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+const porTipo = {};
+let total = 0;
+for (const e of entradas) {
+    const tipo = e.entryType === 'navigation' ? 'document' : (e.initiatorType || 'other');
+    const bytes = e.transferSize || 0;
+    porTipo[tipo] = porTipo[tipo] || {requisicoes: 0, bytes: 0};
+    porTipo[tipo].requisicoes += 1;
+    porTipo[tipo].bytes += bytes;
+    total += bytes;
+}
+return {url: location.href, requisicoes: entradas.length, bytes: total, por_tipo: porTipo};
+"""
+
+
+def executar_cdp(driver: WebDriver, comando: str, parametros: dict = None) -> dict:
+    """
+    Executa um comando do Chrome DevTools Protocol no Chrome local ou remoto (Selenoid).
+
+    O Chrome local usa `execute_cdp_cmd`; a sessão remota envia o mesmo comando pelo endpoint
+    `goog/cdp/execute` do chromedriver.
+
+    Args:
+        driver (WebDriver): Sessão do Chrome.
+        comando (str): Comando CDP (ex.: "Network.setBlockedURLs").
+        parametros (dict, optional): Parâmetros do comando.
+
+    Returns:
+        dict: Resposta do comando.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(comando, parametros or {})
+    return driver.execute("executeCdpCommand", {"cmd": comando, "params": parametros or {}})["value"]
+
+
+def _host(site: str) -> str:
+    return urlparse(site).hostname if "://" in site else site
+
+
+class PerfilLeve:
+    """
+    Perfil de navegação que não baixa recursos pesados (imagens, fontes, mídia e rastreadores),
+    já que os fluxos só leem texto e preenchem formulários.
+
+    As imagens são bloqueadas pelas preferências do Chrome, com exceção por site para
+    `sites_permitidos`; fontes, mídia, rastreadores e padrões extras são bloqueados por URL com
+    `Network.setBlockedURLs` (CDP) após a criação da sessão, valendo para todos os sites.
+
+    Exemplo:
+        driver = iniciar_driver_local(perfil_leve=PerfilLeve(sites_permitidos=["portal.exemplo.gov.br"]))
+        driver.get(url)
+        relatorio_transferencia(driver)
+
+    Atributos:
+        bloquear_imagens (bool): Bloqueia imagens (exceto em `sites_permitidos`).
+        padroes_bloqueados (list[str]): Padrões de URL bloqueados via CDP.
+        sites_permitidos (list[str]): Hosts em que as imagens são carregadas.
+    """
+
+    def __init__(self, bloquear_imagens: bool = True, bloquear_fontes: bool = True, bloquear_midia: bool = True,
+                 bloquear_rastreadores: bool = True, padroes_extras: list[str] = None, sites_permitidos: list[str] = None):
+        """
+        Args:
+            bloquear_imagens (bool): Bloqueia imagens. Default é True.
+            bloquear_fontes (bool): Bloqueia fontes web. Default é True.
+            bloquear_midia (bool): Bloqueia áudio e vídeo. Default é True.
+            bloquear_rastreadores (bool): Bloqueia analytics e rastreadores conhecidos. Default é True.
+            padroes_extras (list[str], optional): Padrões de URL adicionais. Default é `SELENIUM_PERFIL_LEVE_BLOQUEAR`.
+            sites_permitidos (list[str], optional): Hosts com imagens liberadas. Default é `SELENIUM_PERFIL_LEVE_SITES_PERMITIDOS`.
+        """
+        self.bloquear_imagens = bloquear_imagens
+        self.padroes_bloqueados = ((PADROES_FONTES if bloquear_fontes else []) + (PADROES_MIDIA if bloquear_midia else [])
+                                   + (PADROES_RASTREADORES if bloquear_rastreadores else [])
+                                   + (SELENIUM_PERFIL_LEVE_BLOQUEAR if padroes_extras is None else padroes_extras))
+        self.sites_permitidos = [_host(site) for site in (SELENIUM_PERFIL_LEVE_SITES_PERMITIDOS if sites_permitidos is None else sites_permitidos)]
+
+    def aplicar_preferencias(self, prefs: dict) -> dict:
+        """
+        Acrescenta às preferências do Chrome o bloqueio de imagens e as exceções por site.
+
+        Args:
+            prefs (dict): Preferências passadas em `options.add_experimental_option("prefs", ...)`.
+
+        Returns:
+            dict: As mesmas preferências, alteradas.
+        """
+        if self.bloquear_imagens:
+            # Padrão do usuário (não o "managed_default", de política, que ignoraria as exceções por site).
+            prefs["profile.default_content_setting_values.images"] = 2
+            if self.sites_permitidos:
+                prefs["profile.content_settings.exceptions.images"] = {f"[*.]{site},*": {"setting": 1} for site in self.sites_permitidos}
+        prefs["profile.default_content_setting_values.notifications"] = 2
+        return prefs
+
+    def instalar(self, driver: WebDriver) -> bool:
+        """
+        Ativa o bloqueio por URL na sessão criada.
+
+        Args:
+            driver (WebDriver): Sessão do Chrome.
+
+        Returns:
+            bool: False se o CDP não estiver disponível (apenas as preferências ficam valendo).
+        """
+        if not self.padroes_bloqueados:
+            return True
+        try:
+            executar_cdp(driver, "Network.enable")
+            executar_cdp(driver, "Network.setBlockedURLs", {"urls": self.padroes_bloqueados})
+            return True
+        except Exception as e:
+            logging.warning("Perfil leve: bloqueio por URL indisponível nesta sessão (%s); apenas as preferências foram aplicadas.", e)
+            return False
+
+
+def resolver_perfil(perfil_leve) -> PerfilLeve | None:
+    """
+    Converte o parâmetro `perfil_leve` dos launchers: None usa `SELENIUM_PERFIL_LEVE`, bool liga/desliga
+    o perfil padrão e uma instância de `PerfilLeve` é usada como está.
+    """
+    if perfil_leve is None:
+        perfil_leve = SELENIUM_PERFIL_LEVE
+    if isinstance(perfil_leve, PerfilLeve):
+        return perfil_leve
+    return PerfilLeve() if perfil_leve else None
+
+
+def relatorio_transferencia(driver: WebDriver, perfil: str = None) -> dict:
+    """
+    Retorna o volume transferido pela página atual (documento e recursos), por tipo de recurso, e o
+    soma em `app.utils.metricas` ("selenium.transferencia_bytes" e "selenium.transferencia_paginas",
+    rotulados pelo perfil e host).
+
+    Comparando a média de bytes por página dos perfis "padrao" e "leve" em `/metricas` obtém-se a economia de banda.
+
+    Args:
+        driver (WebDriver): Sessão do Chrome.
+        perfil (str, optional): Rótulo do perfil. Default é "leve" se a sessão foi criada com o perfil leve.
+
+    Returns:
+        dict: url, requisicoes, bytes e por_tipo ({tipo: {requisicoes, bytes}}).
+    """
+    relatorio = driver.execute_script(_SCRIPT_TRANSFERENCIA)
+    perfil = perfil or ("leve" if getattr(driver, "perfil_leve", None) else "padrao")
+    host = urlparse(relatorio["url"]).hostname or ""
+    metricas.incrementar("selenium.transferencia_bytes", relatorio["bytes"], perfil=perfil, host=host)
+    metricas.incrementar("selenium.transferencia_paginas", perfil=perfil, host=host)
+    return relatorio
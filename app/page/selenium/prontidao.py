@@ -0,0 +1,81 @@
+import os
+import time
+from typing import Callable
+
+# Estratégia de carregamento padrão das sessões: "normal" (aguarda todos os recursos), "eager" (DOM pronto) ou "none".
+SELENIUM_PAGE_LOAD_STRATEGY = os.getenv("SELENIUM_PAGE_LOAD_STRATEGY", "normal").lower()
+ESTRATEGIAS_CARREGAMENTO = ("normal", "eager", "none")
+
+# Conta as requisições XHR/fetch em andamento (instalado uma vez por documento) e devolve o estado da página.
+_SCRIPT_REDE = """
+if (!window.__requisicoesPendentes) {
+    window.__requisicoesPendentes = {total: 0};
+    const pendentes = window.__requisicoesPendentes;
+    const enviar = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        pendentes.total++;
+        this.addEventListener('loadend', () => pendentes.total--, {once: true});
+        return enviar.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const buscar = window.fetch;
+        window.fetch = function () {
+            pendentes.total++;
+            return buscar.apply(this, arguments).finally(() => pendentes.total--);
+        };
+    }
+}
+return {
+    estado: document.readyState,
+    pendentes: window.__requisicoesPendentes.total,
+    recursos: performance.getEntriesByType('resource').length
+};
+"""
+
+
+def estrategia_carregamento(estrategia: str = None) -> str:
+    """
+    Valida a estratégia de carregamento (`page_load_strategy`) das sessões.
+
+    Args:
+        estrategia (str, optional): "normal", "eager" ou "none". Default é `SELENIUM_PAGE_LOAD_STRATEGY`.
+
+    Returns:
+        str: A estratégia validada.
+
+    Raises:
+        ValueError: Se a estratégia não for suportada.
+    """
+    estrategia = (estrategia or SELENIUM_PAGE_LOAD_STRATEGY).lower()
+    if estrategia not in ESTRATEGIAS_CARREGAMENTO:
+        raise ValueError(f"page_load_strategy inválida: {estrategia}. Use {', '.join(ESTRATEGIAS_CARREGAMENTO)}.")
+    return estrategia
+
+
+def documento_pronto(estados: tuple[str, ...] = ("interactive", "complete")) -> Callable:
+    """Condição de espera: `document.readyState` em `estados`."""
+    return lambda driver: driver.execute_script("return document.readyState") in estados
+
+
+def rede_ociosa(ociosidade: float = 0.5) -> Callable:
+    """
+    Condição de espera: DOM pronto, nenhuma requisição XHR/fetch em andamento e nenhum recurso novo
+    carregado há `ociosidade` segundos.
+
+    Requisições iniciadas antes da primeira verificação não são contadas como pendentes, mas seus
+    recursos aparecem na Performance API ao terminar, o que reinicia a contagem da ociosidade.
+
+    Args:
+        ociosidade (float): Tempo sem atividade de rede, em segundos.
+    """
+    ultimo = {"recursos": None, "desde": 0.0}
+
+    def condicao(driver) -> bool:
+        estado = driver.execute_script(_SCRIPT_REDE)
+        agora = time.monotonic()
+        if estado["estado"] == "loading" or estado["pendentes"] > 0 or estado["recursos"] != ultimo["recursos"]:
+            ultimo["recursos"] = estado["recursos"]
+            ultimo["desde"] = agora
+            return False
+        return agora - ultimo["desde"] >= ociosidade
+    return condicao
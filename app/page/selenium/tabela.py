@@ -0,0 +1,134 @@
+import importlib.util
+import re
+import unicodedata
+
+from bs4 import BeautifulSoup
+
+# Parser do BeautifulSoup: lxml, se instalado (mais rápido), ou o parser da biblioteca padrão.
+PARSER_HTML = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+def _normalizar(texto: str) -> str:
+    """Chave de comparação dos cabeçalhos: sem acentos, minúsculas e espaços simples."""
+    sem_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"\s+", " ", sem_acentos).strip().lower()
+
+
+def _texto(celula) -> str:
+    return re.sub(r"\s+", " ", celula.get_text(" ", strip=True)).strip()
+
+
+def _span(celula, atributo: str) -> int:
+    valor = str(celula.get(atributo, "1")).strip()
+    return max(1, int(valor)) if valor.isdigit() else 1
+
+
+def _linhas_da_tabela(tabela) -> list[list[str]]:
+    """
+    Lê as linhas de uma `<table>` (sem as de tabelas aninhadas), repetindo o valor das células
+    com `colspan`/`rowspan` nas posições que ocupam.
+    """
+    linhas: list[list[str]] = []
+    ocupadas: dict[tuple[int, int], str] = {}
+    for i, tr in enumerate(tr for tr in tabela.find_all("tr") if tr.find_parent("table") is tabela):
+        linha: list[str] = []
+        coluna = 0
+        for celula in tr.find_all(["td", "th"], recursive=False):
+            while (i, coluna) in ocupadas:
+                linha.append(ocupadas.pop((i, coluna)))
+                coluna += 1
+            texto = _texto(celula)
+            rowspan = _span(celula, "rowspan")
+            for _ in range(_span(celula, "colspan")):
+                linha.append(texto)
+                for deslocamento in range(1, rowspan):
+                    ocupadas[(i + deslocamento, coluna)] = texto
+                coluna += 1
+        while (i, coluna) in ocupadas:
+            linha.append(ocupadas.pop((i, coluna)))
+            coluna += 1
+        linhas.append(linha)
+    return linhas
+
+
+def mapear_cabecalho(cabecalho: list[str], mapa_cabecalho: dict[str, str] = None, somente_mapeadas: bool = False) -> list[str | None]:
+    """
+    Converte os títulos das colunas para os nomes usados no código.
+
+    A comparação ignora acentos, maiúsculas e espaços extras. Títulos repetidos recebem sufixo (`_2`, `_3`...).
+
+    Args:
+        cabecalho (list[str]): Títulos lidos da tabela.
+        mapa_cabecalho (dict[str, str], optional): Título -> nome da coluna (ex.: {"Nº do Processo": "numero"}).
+        somente_mapeadas (bool): Se True, as colunas fora do mapa são descartadas (nome None).
+
+    Returns:
+        list[str | None]: Nome de cada coluna (None para as descartadas).
+    """
+    mapa = {_normalizar(titulo): nome for titulo, nome in (mapa_cabecalho or {}).items()}
+    nomes: list[str | None] = []
+    vistos: dict[str, int] = {}
+    for titulo in cabecalho:
+        nome = mapa.get(_normalizar(titulo))
+        if nome is None:
+            nome = None if somente_mapeadas else titulo
+        if nome is not None:
+            vistos[nome] = vistos.get(nome, 0) + 1
+            if vistos[nome] > 1:
+                nome = f"{nome}_{vistos[nome]}"
+        nomes.append(nome)
+    return nomes
+
+
+def extrair_tabela(html: str, seletor: str = "table", indice: int = 0, cabecalho: bool = True,
+                   mapa_cabecalho: dict[str, str] = None, somente_mapeadas: bool = False, dataframe: bool = False):
+    """
+    Extrai uma tabela do HTML (da página ou do `outerHTML` de um contêiner) em uma única passada.
+
+    Exemplo:
+        linhas = extrair_tabela(driver.page_source, "table#resultado", mapa_cabecalho={"Nº do Processo": "numero"})
+        linhas[0]["numero"]
+
+    Args:
+        html (str): HTML da página ou de um trecho dela.
+        seletor (str): Seletor CSS da tabela (ou de um contêiner com a tabela). Default é "table".
+        indice (int): Qual das tabelas encontradas pelo seletor. Default é a primeira.
+        cabecalho (bool): Se True, a primeira linha (ou o `<thead>`) dá os nomes das colunas e o retorno é
+            uma lista de dicts; se False, o retorno é a lista de linhas (listas de textos).
+        mapa_cabecalho (dict[str, str], optional): Título -> nome da coluna (ver `mapear_cabecalho`).
+        somente_mapeadas (bool): Se True, mantém apenas as colunas do `mapa_cabecalho`.
+        dataframe (bool): Se True, retorna um `pandas.DataFrame`.
+
+    Returns:
+        list[dict] | list[list[str]] | pandas.DataFrame: As linhas da tabela.
+
+    Raises:
+        ValueError: Se a tabela não for encontrada.
+    """
+    sopa = BeautifulSoup(html, PARSER_HTML)
+    tabelas = sopa.select(seletor) if seletor else sopa.find_all("table")
+    if len(tabelas) <= indice:
+        raise ValueError(f"Tabela não encontrada: {seletor} (índice {indice}).")
+    tabela = tabelas[indice]
+    if tabela.name != "table":
+        tabela = tabela.find("table")
+        if tabela is None:
+            raise ValueError(f"O elemento {seletor} não contém uma tabela.")
+
+    linhas = [linha for linha in _linhas_da_tabela(tabela) if any(linha)]
+    if not cabecalho:
+        if dataframe:
+            import pandas as pd
+
+            return pd.DataFrame(linhas)
+        return linhas
+
+    titulos, dados = (linhas[0], linhas[1:]) if linhas else ([], [])
+    colunas = mapear_cabecalho(titulos, mapa_cabecalho, somente_mapeadas)
+    registros = [{nome: (linha[i] if i < len(linha) else None) for i, nome in enumerate(colunas) if nome is not None}
+                 for linha in dados]
+    if dataframe:
+        import pandas as pd
+
+        return pd.DataFrame(registros, columns=[nome for nome in colunas if nome is not None])
+    return registros
@@ -1,14 +1,16 @@
-import time
 from abc import ABC
 
 from selenium.webdriver.common.by import By
 
+from app.page.selenium.espera import MotorEspera
 
-class CssSelectorAbstract(ABC):
-    def __init__(self, webbot, wait_d, wait_r):
+
+class TagNameAbstract(ABC):
+    def __init__(self, webbot, wait_d, wait_r, espera: MotorEspera = None):
         self.webbot = webbot
         self.wait_d = wait_d
         self.wait_r = wait_r
+        self.espera = espera or MotorEspera(webbot)
 
     def _existe_tag_name(self, tag_element: str) -> bool:
         """
@@ -20,8 +22,7 @@ class CssSelectorAbstract(ABC):
         Returns:
             bool: True se pelo menos um elemento com o nome da tag existir, False caso contrário.
         """
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.TAG_NAME, tag_element)) > 0
+        return self.espera.existe(By.TAG_NAME, tag_element, nome="_existe_tag_name")
 
     def _existe_class_name(self, class_name: str) -> bool:
         """
@@ -33,8 +34,7 @@ class CssSelectorAbstract(ABC):
         Returns:
             bool: True se pelo menos um elemento com o nome da classe existir, False caso contrário.
         """
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.CLASS_NAME, class_name)) > 0
+        return self.espera.existe(By.CLASS_NAME, class_name, nome="_existe_class_name")
 
     def _existe_id(self, id_element: str) -> bool:
         """
@@ -46,8 +46,7 @@ class CssSelectorAbstract(ABC):
         Returns:
             bool: True se pelo menos um elemento com o ID existir, False caso contrário.
         """
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.ID, id_element)) > 0
+        return self.espera.existe(By.ID, id_element, nome="_existe_id")
 
     def _obter_texto_por_css_selector(self, css_selector: str) -> str:
         """
@@ -1,15 +1,17 @@
-import time
 from abc import ABC
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.expected_conditions import presence_of_element_located, element_to_be_clickable
 
+from app.page.selenium.espera import MotorEspera
+
 
 class XpathAbstract(ABC):
-    def __init__(self, webbot, wait_d, wait_r):
+    def __init__(self, webbot, wait_d, wait_r, espera: MotorEspera = None):
         self.webbot = webbot
         self.wait_d = wait_d
         self.wait_r = wait_r
+        self.espera = espera or MotorEspera(webbot)
 
     def _selecionar_option_por_xpath_visible_text(self, xpath_element: str, value_element: str, rapido=False) -> bool:
         """
@@ -94,8 +96,7 @@ class XpathAbstract(ABC):
         Returns:
             bool: True se pelo menos um elemento com o XPath existir, False caso contrário.
         """
-        time.sleep(1)
-        return len(self.webbot.find_elements(By.XPATH, id_element)) > 0
+        return self.espera.existe(By.XPATH, id_element, nome="_existe_xpath")
 
     def _verificar_texto_por_xpath(self, id_element: str, text: str) -> bool:
         """
@@ -108,8 +109,7 @@ class XpathAbstract(ABC):
         Returns:
             bool: True se o texto corresponder, False caso contrário.
         """
-        time.sleep(1)
-        return self.webbot.find_element(By.XPATH, id_element).text.upper() == text.upper()
+        return self.espera.texto_igual(By.XPATH, id_element, text, nome="_verificar_texto_por_xpath")
 
     def _verificar_atributo_por_xpath(self, xpath_element: str, atributo: str, valor: str, rapido=False) -> bool:
         """
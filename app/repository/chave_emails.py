@@ -1,12 +1,10 @@
-import pymongo
-
-from app import host_mongo
+from app.repository.mongo_client import obter_cliente
 
 
 class ChaveEmailsRepository:
 
     def __init__(self):
-        self._db = pymongo.MongoClient(host_mongo)
+        self._db = obter_cliente()
         self._banco = self._db['CORE_SECURITY']
         self._colecao = self._banco["chave_emails"]
 
@@ -1,9 +1,4 @@
-import pymongo
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-import os
+from app.repository.mongo_client import obter_cliente
 
 
 class CredenciaisRepository:
@@ -15,7 +10,7 @@ class CredenciaisRepository:
         """
         Inicializa a conexão com o banco de dados MongoDB utilizando variáveis de ambiente.
         """
-        self._db = pymongo.MongoClient(os.getenv("MONGO_DB_URL"))
+        self._db = obter_cliente()
         self._banco = self._db['usuarios']
         self._colecao = self._banco["credenciais"]
 
@@ -67,6 +62,10 @@ def __senha_derivar(senha):
     Returns:
         bytes: Chave derivada.
     """
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
     cr = CredenciaisRepository()
     cr._colecao = cr.banco["cryptography"]
     salt = cr.colecao.find_one()["salt"].encode('utf-8')
@@ -86,6 +85,9 @@ def _descriptografar(ciphertext, private_key, salt_key):
     Returns:
         str: Texto descriptografado.
     """
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+
     private_key = serialization.load_pem_private_key(private_key.encode('utf-8'), password=__senha_derivar(salt_key))
     texto_bytes = private_key.decrypt(ciphertext, padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA512()),
                                                                algorithm=hashes.SHA512(), label=None))
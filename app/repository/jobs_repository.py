@@ -0,0 +1,284 @@
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pymongo
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+from app.data.enums.status_job import StatusJob
+from app.repository.mongo_client import obter_cliente
+from app.repository.tarefas_repository import TarefasRepository
+
+# Validade do lease de um job em execução; renovado pelo pool enquanto o handler roda.
+JOBS_LEASE = timedelta(seconds=int(os.getenv("JOBS_LEASE_SEGUNDOS", 60)))
+# Quantidade padrão de execuções de um job antes de ser marcado como FALHOU.
+JOBS_MAX_TENTATIVAS = int(os.getenv("JOBS_MAX_TENTATIVAS", 3))
+# Base e teto do backoff exponencial entre tentativas, em segundos.
+JOBS_BACKOFF_SEGUNDOS = float(os.getenv("JOBS_BACKOFF_SEGUNDOS", 30))
+JOBS_BACKOFF_MAX_SEGUNDOS = float(os.getenv("JOBS_BACKOFF_MAX_SEGUNDOS", 1800))
+# Espera antes de um job devolvido por designado no limite voltar a ser reivindicado, em segundos.
+JOBS_ESPERA_DESIGNADO_SEGUNDOS = float(os.getenv("JOBS_ESPERA_DESIGNADO_SEGUNDOS", 15))
+
+
+def calcular_backoff(tentativa: int) -> timedelta:
+    """
+    Calcula a espera antes da próxima tentativa: backoff exponencial com jitter.
+
+    O jitter espalha as novas tentativas de jobs que falharam juntos (ex.: site fora do ar),
+    evitando que todos sejam reivindicados ao mesmo tempo.
+
+    Args:
+        tentativa (int): Número da tentativa que falhou (começando em 1).
+
+    Returns:
+        timedelta: Tempo até o job voltar a ficar disponível.
+    """
+    teto = min(JOBS_BACKOFF_MAX_SEGUNDOS, JOBS_BACKOFF_SEGUNDOS * 2 ** max(0, tentativa - 1))
+    return timedelta(seconds=random.uniform(teto / 2, teto))
+
+
+class JobsRepository:
+    """
+    Repositório da fila de jobs de automação no MongoDB.
+
+    Os jobs são enfileirados com tipo, prioridade e payload e reivindicados atomicamente com
+    `find_one_and_update`, de modo que qualquer quantidade de workers (threads, processos ou
+    instâncias) pode consumir a mesma fila sem receber o mesmo job.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(JobsRepository, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        """Inicializa uma instância de `JobsRepository`, conectando-se ao banco MongoDB."""
+        self._db = obter_cliente()
+        self._banco = self._db[os.getenv('MONGO_DB_NAME')]
+        self._colecao = self._banco["core_security.jobs"]
+        self._garantir_indices()
+        self._initialized = True
+
+    def _garantir_indices(self):
+        """Cria os índices usados pela reivindicação e pelos limites por designado (idempotente)."""
+        self._colecao.create_index([("status", pymongo.ASCENDING), ("prioridade", pymongo.DESCENDING),
+                                    ("disponivel_em", pymongo.ASCENDING), ("criado_em", pymongo.ASCENDING)])
+        self._colecao.create_index([("designado", pymongo.ASCENDING), ("status", pymongo.ASCENDING)])
+        self._colecao.create_index([("status", pymongo.ASCENDING), ("lease_until", pymongo.ASCENDING)])
+
+    def enfileirar(self, tipo: str, payload: dict = None, prioridade: int = 0, designado: str = None,
+                   max_tentativas: int = None, disponivel_em: datetime = None, solicitante=None) -> ObjectId:
+        """
+        Adiciona um job à fila.
+
+        Args:
+            tipo (str): Tipo do job; define o handler que irá executá-lo.
+            payload (dict, optional): Dados passados ao handler.
+            prioridade (int): Jobs de maior prioridade são reivindicados primeiro. Default é 0.
+            designado (str, optional): Usuário/credencial usado pelo job, sujeito ao limite de concorrência.
+            max_tentativas (int, optional): Execuções antes de marcar o job como FALHOU. Default é `JOBS_MAX_TENTATIVAS`.
+            disponivel_em (datetime, optional): Momento a partir do qual o job pode ser executado. Default é agora.
+            solicitante (optional): Quem solicitou o job.
+
+        Returns:
+            ObjectId: O id do job criado.
+        """
+        agora = datetime.now()
+        result = self._colecao.insert_one({
+            "tipo": tipo,
+            "payload": payload or {},
+            "prioridade": prioridade,
+            "designado": designado,
+            "solicitante": solicitante,
+            "status": StatusJob.PENDENTE.value,
+            "tentativas": 0,
+            "max_tentativas": max_tentativas or JOBS_MAX_TENTATIVAS,
+            "criado_em": agora,
+            "disponivel_em": disponivel_em or agora,
+        })
+        return result.inserted_id
+
+    def reivindicar(self, tipos: list[str] = None, worker: str = None, limite_por_designado: int = None,
+                    tentativas_limite: int = 5) -> Optional[dict]:
+        """
+        Reivindica atomicamente o próximo job disponível, por prioridade e ordem de chegada.
+
+        Se `limite_por_designado` for informado, o designado do job reivindicado não pode estar em uso
+        em mais execuções que o limite, somando os jobs em execução e as filas de `TarefasRepository`
+        (`contar_filas_do_designado`). Um job acima do limite é devolvido à fila sem contar tentativa e o
+        designado é ignorado nas próximas buscas desta chamada.
+
+        Args:
+            tipos (list[str], optional): Tipos aceitos pelo worker. Default (None) são todos; uma lista vazia não reivindica nada.
+            worker (str, optional): Identificação do worker, gravada no job.
+            limite_por_designado (int, optional): Execuções simultâneas permitidas por designado.
+            tentativas_limite (int): Quantidade máxima de buscas quando designados estão no limite.
+
+        Returns:
+            dict | None: O job reivindicado (com `lease_token`), ou None se não houver job disponível.
+        """
+        if tipos is not None and not tipos:
+            return None
+        bloqueados: list[str] = []
+        for _ in range(tentativas_limite):
+            agora = datetime.now()
+            filtro = {"status": StatusJob.PENDENTE.value, "disponivel_em": {"$lte": agora}}
+            if tipos is not None:
+                filtro["tipo"] = {"$in": list(tipos)}
+            if bloqueados:
+                filtro["designado"] = {"$nin": bloqueados}
+            token = uuid.uuid4().hex
+            job = self._colecao.find_one_and_update(
+                filtro,
+                {"$set": {"status": StatusJob.EXECUTANDO.value, "inicio": agora, "worker": worker,
+                          "lease_token": token, "lease_until": agora + JOBS_LEASE},
+                 "$inc": {"tentativas": 1}},
+                sort=[("prioridade", pymongo.DESCENDING), ("disponivel_em", pymongo.ASCENDING), ("criado_em", pymongo.ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+            if job is None:
+                return None
+            designado = job.get("designado")
+            if limite_por_designado is None or designado is None or self._em_uso(designado) <= limite_por_designado:
+                return job
+            self._devolver(job)
+            bloqueados.append(designado)
+        return None
+
+    def _em_uso(self, designado: str) -> int:
+        """Execuções simultâneas do designado: jobs em execução mais filas de tarefas rodando."""
+        jobs = self._colecao.count_documents({"designado": designado, "status": StatusJob.EXECUTANDO.value})
+        return jobs + TarefasRepository().contar_filas_do_designado(designado)
+
+    def _devolver(self, job: dict):
+        """
+        Devolve à fila um job reivindicado que não pôde ser executado, sem contar a tentativa.
+
+        O job só volta a ficar disponível após `JOBS_ESPERA_DESIGNADO_SEGUNDOS`, para que um job de alta
+        prioridade bloqueado pelo limite do designado não seja reivindicado a cada busca, atrasando os demais.
+        """
+        self._colecao.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"]},
+            {"$set": {"status": StatusJob.PENDENTE.value,
+                      "disponivel_em": datetime.now() + timedelta(seconds=JOBS_ESPERA_DESIGNADO_SEGUNDOS)},
+             "$unset": {"lease_token": "", "lease_until": "", "worker": ""},
+             "$inc": {"tentativas": -1}}
+        )
+
+    def concluir(self, job_id: ObjectId, lease_token: str, resultado=None) -> bool:
+        """
+        Marca o job como CONCLUIDO.
+
+        Args:
+            job_id (ObjectId): O id do job.
+            lease_token (str): O token recebido na reivindicação.
+            resultado (optional): Retorno do handler, gravado no job.
+
+        Returns:
+            bool: False se o job não pertencer mais a este lease (vencido e reivindicado por outro worker).
+        """
+        result = self._colecao.update_one(
+            {"_id": job_id, "lease_token": lease_token, "status": StatusJob.EXECUTANDO.value},
+            {"$set": {"status": StatusJob.CONCLUIDO.value, "fim": datetime.now(), "resultado": resultado},
+             "$unset": {"lease_until": ""}}
+        )
+        return result.matched_count > 0
+
+    def falhar(self, job: dict, erro: str) -> StatusJob | None:
+        """
+        Registra a falha de uma execução: agenda nova tentativa com backoff ou marca o job como FALHOU.
+
+        Args:
+            job (dict): O job reivindicado.
+            erro (str): Descrição do erro.
+
+        Returns:
+            StatusJob | None: O novo status do job, ou None se o job não pertencer mais a este lease.
+        """
+        agora = datetime.now()
+        if job["tentativas"] < job.get("max_tentativas", JOBS_MAX_TENTATIVAS):
+            status = StatusJob.PENDENTE
+            campos = {"disponivel_em": agora + calcular_backoff(job["tentativas"])}
+        else:
+            status = StatusJob.FALHOU
+            campos = {"fim": agora}
+        result = self._colecao.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"], "status": StatusJob.EXECUTANDO.value},
+            {"$set": {"status": status.value, "ultimo_erro": erro, **campos},
+             "$push": {"erros": {"$each": [{"em": agora, "erro": erro}], "$slice": -10}},
+             "$unset": {"lease_until": ""}}
+        )
+        return status if result.matched_count else None
+
+    def cancelar(self, job_id: ObjectId) -> bool:
+        """Cancela um job que ainda não começou a ser executado."""
+        result = self._colecao.update_one({"_id": job_id, "status": StatusJob.PENDENTE.value},
+                                          {"$set": {"status": StatusJob.CANCELADO.value, "fim": datetime.now()}})
+        return result.modified_count > 0
+
+    def renovar_leases(self, leases: dict[ObjectId, str]) -> set[ObjectId]:
+        """
+        Renova em lote o lease dos jobs em execução por mais `JOBS_LEASE`.
+
+        Args:
+            leases (dict[ObjectId, str]): Token de lease de cada job em execução.
+
+        Returns:
+            set[ObjectId]: Os jobs cujo lease não pôde ser renovado (perdidos).
+        """
+        if not leases:
+            return set()
+        agora = datetime.now()
+        self._colecao.bulk_write([
+            UpdateOne({"_id": job_id, "lease_token": token, "status": StatusJob.EXECUTANDO.value},
+                      {"$set": {"lease_until": agora + JOBS_LEASE, "heartbeat": agora}})
+            for job_id, token in leases.items()
+        ], ordered=False)
+        renovados = self._colecao.find({"_id": {"$in": list(leases)}, "status": StatusJob.EXECUTANDO.value,
+                                        "heartbeat": agora}, {"_id": True})
+        return set(leases) - {doc["_id"] for doc in renovados}
+
+    def liberar_leases_expirados(self) -> int:
+        """
+        Devolve à fila os jobs cujo worker parou sem concluí-los (lease vencido).
+
+        Jobs que já esgotaram as tentativas são marcados como FALHOU.
+
+        Returns:
+            int: A quantidade de jobs liberados.
+        """
+        agora = datetime.now()
+        filtro = {"status": StatusJob.EXECUTANDO.value, "lease_until": {"$lt": agora}}
+        falhos = self._colecao.update_many(
+            {**filtro, "$expr": {"$gte": ["$tentativas", "$max_tentativas"]}},
+            {"$set": {"status": StatusJob.FALHOU.value, "fim": agora, "ultimo_erro": "Lease vencido"}}
+        )
+        devolvidos = self._colecao.update_many(
+            filtro,
+            {"$set": {"status": StatusJob.PENDENTE.value, "disponivel_em": agora, "ultimo_erro": "Lease vencido"}}
+        )
+        return falhos.modified_count + devolvidos.modified_count
+
+    def obter(self, job_id: ObjectId) -> Optional[dict]:
+        """Retorna o job pelo id."""
+        return self._colecao.find_one({"_id": job_id})
+
+    def contar_por_status(self, tipo: str = None) -> dict[str, int]:
+        """
+        Retorna a quantidade de jobs em cada status.
+
+        Args:
+            tipo (str, optional): Restringe a contagem a um tipo de job.
+        """
+        pipeline = [{"$match": {"tipo": tipo}}] if tipo else []
+        pipeline.append({"$group": {"_id": "$status", "total": {"$sum": 1}}})
+        return {doc["_id"]: doc["total"] for doc in self._colecao.aggregate(pipeline)}
@@ -0,0 +1,106 @@
+import os
+import threading
+
+import pymongo
+from mongoengine import connect, disconnect
+from mongoengine.connection import ConnectionFailure, get_connection
+
+from app import host_mongo
+
+_lock = threading.Lock()
+_cliente_async: pymongo.AsyncMongoClient | None = None
+# Processo que abriu a conexão padrão por `conectar` (a herdada de um fork não é reaproveitada).
+_pid_conexao: int | None = None
+
+
+def _conexao_atual() -> pymongo.MongoClient | None:
+    """Retorna o cliente da conexão padrão se ele estiver aberto e não tiver sido herdado de um fork."""
+    if _pid_conexao is not None and _pid_conexao != os.getpid():
+        return None
+    try:
+        cliente = get_connection()
+    except ConnectionFailure:
+        return None
+    return None if getattr(cliente, "_closed", False) else cliente
+
+
+def conectar() -> pymongo.MongoClient:
+    """
+    Abre a conexão padrão do mongoengine, que também é usada pelos repositórios pymongo.
+
+    Se a conexão já estiver aberta neste processo, ela é reaproveitada: os repositórios guardam o
+    cliente, e fechá-lo faria as próximas operações falharem (`InvalidOperation`). Uma conexão
+    herdada de um fork é substituída.
+
+    O tamanho do pool é configurado pelas variáveis de ambiente `MONGO_MAX_POOL_SIZE` e
+    `MONGO_MIN_POOL_SIZE`. Deve ser chamada em cada processo worker (o lifespan do FastAPI
+    faz isso), nunca antes de um fork.
+
+    Returns:
+        pymongo.MongoClient: Cliente da conexão padrão.
+    """
+    global _pid_conexao
+    with _lock:
+        cliente = _conexao_atual()
+        if cliente is not None:
+            return cliente
+        disconnect(alias='default')
+        cliente = connect(db=os.getenv('MONGO_DB_NAME'), host=host_mongo,
+                          maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", 100)),
+                          minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", 0)))
+        _pid_conexao = os.getpid()
+        return cliente
+
+
+def desconectar():
+    """
+    Fecha a conexão padrão e o pool do processo atual.
+    """
+    global _pid_conexao
+    with _lock:
+        disconnect(alias='default')
+        _pid_conexao = None
+
+
+def obter_cliente() -> pymongo.MongoClient:
+    """
+    Retorna o MongoClient compartilhado do processo, abrindo a conexão no primeiro uso
+    (ou depois de um fork).
+
+    Todos os repositórios utilizam este cliente para que cada worker mantenha um único
+    pool de conexões com o MongoDB.
+
+    Returns:
+        pymongo.MongoClient: Cliente da conexão padrão do mongoengine.
+    """
+    return _conexao_atual() or conectar()
+
+
+def obter_cliente_async() -> pymongo.AsyncMongoClient:
+    """
+    Retorna o AsyncMongoClient do processo, usado pelos repositórios assíncronos.
+
+    O cliente é criado no primeiro uso, dentro do event loop do worker, com os mesmos
+    limites de pool da conexão síncrona.
+
+    Returns:
+        pymongo.AsyncMongoClient: Cliente assíncrono do processo.
+    """
+    global _cliente_async
+    with _lock:
+        if _cliente_async is None:
+            _cliente_async = pymongo.AsyncMongoClient(host_mongo,
+                                                      maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", 100)),
+                                                      minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", 0)))
+        return _cliente_async
+
+
+async def desconectar_async():
+    """
+    Fecha o cliente assíncrono do processo, se tiver sido criado.
+    """
+    global _cliente_async
+    with _lock:
+        cliente, _cliente_async = _cliente_async, None
+    if cliente is not None:
+        await cliente.close()
@@ -1,7 +1,6 @@
 from datetime import datetime
 from typing import List, Dict, Any
-import pymongo
-from app import host_mongo
+from app.repository.mongo_client import obter_cliente
 
 
 class MongoConnection:
@@ -20,7 +19,7 @@ class MongoConnection:
             db_name (str): Nome do banco de dados.
             collection_name (str): Nome da coleção.
         """
-        self.client = pymongo.MongoClient(host_mongo)
+        self.client = obter_cliente()
         self.db_name = db_name
         self.collection_name = collection_name
         self.db = self.client[db_name]
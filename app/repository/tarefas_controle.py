@@ -0,0 +1,221 @@
+import logging
+import os
+import threading
+from datetime import datetime
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Intervalo da consulta de fallback quando o MongoDB não suporta change streams (sem replica set).
+CONTROLE_POLL_SEGUNDOS = float(os.getenv("CONTROLE_POLL_SEGUNDOS", 2))
+
+# Campos do documento da tarefa acompanhados pelo canal de controle.
+# O `lease_token` identifica a execução: muda a cada reivindicação da fila.
+CAMPOS_CONTROLE = ("task_name", "force_stop", "business_hours", "scheduled_stop", "is_running", "lease_token")
+
+_canais: list["CanalControleTarefas"] = []
+
+
+class EstadoTarefa:
+    """
+    Estado de controle de uma tarefa mantido em memória pelo `CanalControleTarefas`.
+
+    A leitura dos atributos não acessa o banco. `aguardar` substitui o `time.sleep` dos loops
+    dos workers e retorna assim que uma parada for solicitada.
+
+    Atributos:
+        nome (str): Nome da tarefa.
+        documento (dict): Últimos valores conhecidos de `CAMPOS_CONTROLE`.
+        atualizado_em (datetime): Momento da última atualização recebida.
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.documento: dict = {"task_name": nome}
+        self.atualizado_em: datetime | None = None
+        self._parada = threading.Event()
+        self._parada_local = False
+        self._ouvintes: list = []
+
+    @property
+    def force_stop(self) -> bool:
+        return bool(self.documento.get("force_stop", False))
+
+    @property
+    def interrompido(self) -> bool:
+        """True se uma parada foi solicitada para a tarefa."""
+        return self._parada.is_set()
+
+    def aguardar(self, timeout: float = None) -> bool:
+        """
+        Aguarda até `timeout` segundos ou até uma parada ser solicitada.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera, em segundos.
+
+        Returns:
+            bool: True se a parada foi solicitada.
+        """
+        return self._parada.wait(timeout)
+
+    def ao_alterar(self, callback):
+        """
+        Registra uma função chamada com o estado sempre que o documento de controle mudar.
+        """
+        self._ouvintes.append(callback)
+
+    def solicitar_parada(self):
+        """Marca a tarefa como interrompida neste processo e acorda as esperas em andamento."""
+        self._parada_local = True
+        self._parada.set()
+
+    def reiniciar(self, doc: dict):
+        """
+        Inicia uma nova execução da tarefa: descarta a parada solicitada localmente na execução
+        anterior e aplica os campos gravados na reivindicação.
+
+        Args:
+            doc (dict): Campos de controle da nova execução.
+        """
+        self._parada_local = False
+        self._aplicar(doc)
+
+    def _aplicar(self, doc: dict):
+        if self.atualizado_em is not None and doc.get("lease_token") != self.documento.get("lease_token"):
+            # Outra execução da fila (reivindicada por outro caminho ou processo): a parada local era da anterior.
+            self._parada_local = False
+        self.documento = {campo: doc.get(campo) for campo in CAMPOS_CONTROLE if campo in doc} | {"task_name": self.nome}
+        self.atualizado_em = datetime.now()
+        if self.force_stop or self._parada_local:
+            self._parada.set()
+        else:
+            self._parada.clear()
+        for callback in self._ouvintes:
+            try:
+                callback(self)
+            except Exception:
+                logging.exception("Erro no ouvinte de controle da tarefa %s", self.nome)
+
+
+class CanalControleTarefas:
+    """
+    Canal que mantém em memória o estado de controle (`force_stop`, `scheduled_stop`...) das tarefas
+    acompanhadas por este processo.
+
+    As alterações chegam por change stream; se o MongoDB não suportar change streams, uma única
+    consulta periódica atualiza todas as tarefas acompanhadas.
+    """
+
+    def __init__(self, colecao):
+        """
+        Args:
+            colecao (pymongo.collection.Collection): Coleção de tarefas.
+        """
+        self._colecao = colecao
+        self._estados: dict[str, EstadoTarefa] = {}
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._change_stream_disponivel = True
+        _canais.append(self)
+
+    def registrar(self, nome: str) -> EstadoTarefa:
+        """
+        Passa a acompanhar uma tarefa e retorna seu estado em memória.
+
+        Args:
+            nome (str): Nome da tarefa.
+
+        Returns:
+            EstadoTarefa: Estado atualizado automaticamente enquanto a tarefa estiver registrada.
+        """
+        with self._lock:
+            estado = self._estados.get(nome)
+            if estado is None:
+                estado = self._estados[nome] = EstadoTarefa(nome)
+                novo = True
+            else:
+                novo = False
+        if novo:
+            doc = self._colecao.find_one({"task_name": nome}, {campo: True for campo in CAMPOS_CONTROLE})
+            if doc:
+                estado._aplicar(doc)
+        self._iniciar()
+        return estado
+
+    def remover(self, nome: str):
+        """Deixa de acompanhar uma tarefa."""
+        with self._lock:
+            self._estados.pop(nome, None)
+
+    def estado(self, nome: str) -> EstadoTarefa | None:
+        """Retorna o estado em memória de uma tarefa acompanhada, ou None."""
+        return self._estados.get(nome)
+
+    def encerrar(self):
+        """Interrompe a thread do canal."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _iniciar(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name="canal-controle-tarefas", daemon=True)
+        self._thread.start()
+
+    def _aplicar(self, doc: dict):
+        estado = self._estados.get(doc.get("task_name"))
+        if estado is not None:
+            estado._aplicar(doc)
+
+    def _loop(self):
+        token_retomada = None
+        while not self._parar.is_set():
+            if not self._change_stream_disponivel:
+                self._consultar()
+                self._parar.wait(CONTROLE_POLL_SEGUNDOS)
+                continue
+            try:
+                token_retomada = self._observar(token_retomada)
+            except OperationFailure as e:
+                # Change streams exigem replica set/sharded cluster; usa a consulta periódica.
+                logging.info("Change stream indisponível para o controle de tarefas (%s); usando consulta periódica.", e)
+                self._change_stream_disponivel = False
+            except PyMongoError as e:
+                logging.warning("Change stream do controle de tarefas interrompido: %s", e)
+                self._consultar()
+                self._parar.wait(CONTROLE_POLL_SEGUNDOS)
+            except Exception:
+                logging.exception("Erro no change stream do controle de tarefas; usando consulta periódica.")
+                self._change_stream_disponivel = False
+
+    def _observar(self, token_retomada):
+        pipeline = [{"$match": {"$or": [{"operationType": {"$in": ["insert", "replace"]}}] +
+                                       [{f"updateDescription.updatedFields.{campo}": {"$exists": True}} for campo in CAMPOS_CONTROLE[1:]]}}]
+        with self._colecao.watch(pipeline, full_document="updateLookup", resume_after=token_retomada, max_await_time_ms=1000) as stream:
+            # Recarrega o estado para não perder alterações feitas antes do stream abrir.
+            self._consultar()
+            while not self._parar.is_set() and stream.alive:
+                mudanca = stream.try_next()
+                if mudanca is not None and mudanca.get("fullDocument"):
+                    self._aplicar(mudanca["fullDocument"])
+                token_retomada = stream.resume_token
+        return token_retomada
+
+    def _consultar(self):
+        nomes = list(self._estados)
+        if not nomes:
+            return
+        try:
+            for doc in self._colecao.find({"task_name": {"$in": nomes}}, {campo: True for campo in CAMPOS_CONTROLE}):
+                self._aplicar(doc)
+        except PyMongoError as e:
+            logging.warning("Erro ao consultar o controle das tarefas: %s", e)
+
+
+def encerrar_canais():
+    """Interrompe as threads de todos os canais de controle; chamada no desligamento da aplicação."""
+    for canal in _canais:
+        canal.encerrar()
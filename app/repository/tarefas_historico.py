@@ -0,0 +1,158 @@
+import logging
+import os
+from datetime import datetime, timedelta
+
+import pymongo
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Dias de retenção do histórico de execuções (índice TTL sobre o campo `fim`).
+HISTORICO_RETENCAO_DIAS = int(os.getenv("HISTORICO_RETENCAO_DIAS", 90))
+
+# Percentis da duração das execuções calculados nas estatísticas.
+PERCENTIS = (50, 90, 99)
+
+# Resultado de uma execução bem sucedida; os demais contam como falha nas estatísticas.
+RESULTADO_SUCESSO = "SUCESSO"
+# Resultado das execuções encerradas por lease vencido (worker parou sem finalizar a tarefa).
+RESULTADO_LEASE_EXPIRADO = "LEASE_EXPIRADO"
+
+
+class HistoricoTarefas:
+    """
+    Histórico das execuções das tarefas: um documento por execução finalizada.
+
+    Cada documento guarda a fila, a família da fila (nome sem o número final), o designado, início,
+    fim, duração, quantidade e resultado, além do campo `hora` (fim truncado na hora) usado para
+    agrupar as estatísticas. Os documentos expiram após `HISTORICO_RETENCAO_DIAS`.
+    """
+
+    def __init__(self, colecao):
+        """
+        Args:
+            colecao (pymongo.collection.Collection): Coleção do histórico.
+        """
+        self._colecao = colecao
+        self._garantir_indices()
+
+    def _garantir_indices(self):
+        """
+        Cria os índices por fila/hora e o TTL de retenção, ajustando o TTL se a retenção mudar.
+
+        Falhas (ex.: usuário sem permissão de administração do banco) são apenas registradas no log,
+        para não impedir a criação do repositório de tarefas.
+        """
+        try:
+            self._colecao.create_index([("fila", pymongo.ASCENDING), ("hora", pymongo.ASCENDING)])
+            self._colecao.create_index([("task_name", pymongo.ASCENDING), ("hora", pymongo.ASCENDING)])
+        except PyMongoError as e:
+            logging.warning("Índices do histórico de tarefas não criados: %s", e)
+        retencao = HISTORICO_RETENCAO_DIAS * 86400
+        try:
+            try:
+                self._colecao.create_index("fim", name="ttl_fim", expireAfterSeconds=retencao)
+            except OperationFailure:
+                # O índice já existe com outra retenção: atualiza o TTL sem recriar o índice.
+                self._colecao.database.command("collMod", self._colecao.name,
+                                               index={"name": "ttl_fim", "expireAfterSeconds": retencao})
+        except PyMongoError as e:
+            logging.warning("Índice TTL do histórico de tarefas não criado/ajustado: %s", e)
+
+    def registrar(self, registros: list[dict]):
+        """
+        Grava as execuções finalizadas.
+
+        Falhas de gravação são apenas registradas no log, para não impedir a finalização da tarefa.
+
+        Args:
+            registros (list[dict]): Documentos montados por `_registro_historico` do repositório de tarefas.
+        """
+        if not registros:
+            return
+        try:
+            self._colecao.insert_many(registros, ordered=False)
+        except PyMongoError as e:
+            logging.error("Erro ao gravar o histórico das tarefas %s: %s", [r.get("task_name") for r in registros], e)
+
+    def estatisticas(self, fila: str = None, horas: int = 24) -> dict:
+        """
+        Calcula as estatísticas de vazão das execuções finalizadas nas últimas `horas`
+        (ver `pipeline_estatisticas`).
+
+        Args:
+            fila (str, optional): Família da fila (ex.: "consulta" para consulta1..N). Default são todas.
+            horas (int): Tamanho da janela analisada, em horas. Default é 24.
+
+        Returns:
+            dict: `{"desde", "filas": [...], "por_hora": [...]}`.
+        """
+        desde, pipeline = pipeline_estatisticas(fila, horas)
+        resultado = next(self._colecao.aggregate(pipeline), {"filas": [], "por_hora": []})
+        return {"desde": desde, **resultado}
+
+
+def pipeline_estatisticas(fila: str = None, horas: int = 24) -> tuple[datetime, list[dict]]:
+    """
+    Monta a agregação das estatísticas de vazão das execuções finalizadas nas últimas `horas`.
+
+    Por fila: execuções, falhas, taxa de falha, itens, itens por hora de execução e percentis
+    da duração. A série por hora traz execuções e itens de cada hora. Tudo é calculado no
+    MongoDB, em uma única agregação.
+
+    Args:
+        fila (str, optional): Família da fila (ex.: "consulta" para consulta1..N). Default são todas.
+        horas (int): Tamanho da janela analisada, em horas. Default é 24.
+
+    Returns:
+        tuple[datetime, list[dict]]: O início da janela e o pipeline, que produz um único documento
+        `{"filas": [...], "por_hora": [...]}`.
+    """
+    desde = datetime.now() - timedelta(hours=horas)
+    filtro = {"fim": {"$gte": desde}}
+    if fila:
+        filtro["fila"] = fila
+
+    percentis = {
+        f"p{p}": {"$arrayElemAt": ["$duracoes", {"$floor": {"$multiply": [p / 100, {"$subtract": [{"$size": "$duracoes"}, 1]}]}}]}
+        for p in PERCENTIS
+    }
+    pipeline = [
+        {"$match": filtro},
+        {"$facet": {
+            "filas": [
+                {"$sort": {"duracao_segundos": 1}},
+                {"$group": {
+                    "_id": "$fila",
+                    "execucoes": {"$sum": 1},
+                    "falhas": {"$sum": {"$cond": [{"$eq": ["$resultado", RESULTADO_SUCESSO]}, 0, 1]}},
+                    "itens": {"$sum": {"$ifNull": ["$quantidade", 0]}},
+                    "segundos": {"$sum": "$duracao_segundos"},
+                    "duracoes": {"$push": "$duracao_segundos"},
+                }},
+                # Execuções sem `inicio` têm duração nula: contam nas execuções, mas não nos percentis.
+                {"$addFields": {"duracoes": {"$filter": {"input": "$duracoes", "as": "d", "cond": {"$ne": ["$$d", None]}}}}},
+                {"$project": {
+                    "_id": False,
+                    "fila": "$_id",
+                    "execucoes": True,
+                    "falhas": True,
+                    "taxa_falha": {"$divide": ["$falhas", "$execucoes"]},
+                    "itens": True,
+                    "itens_por_hora": {"$cond": [{"$gt": ["$segundos", 0]},
+                                                 {"$divide": ["$itens", {"$divide": ["$segundos", 3600]}]}, None]},
+                    "duracao_segundos": percentis,
+                }},
+                {"$sort": {"fila": 1}},
+            ],
+            "por_hora": [
+                {"$group": {
+                    "_id": {"fila": "$fila", "hora": "$hora"},
+                    "execucoes": {"$sum": 1},
+                    "falhas": {"$sum": {"$cond": [{"$eq": ["$resultado", RESULTADO_SUCESSO]}, 0, 1]}},
+                    "itens": {"$sum": {"$ifNull": ["$quantidade", 0]}},
+                }},
+                {"$project": {"_id": False, "fila": "$_id.fila", "hora": "$_id.hora", "execucoes": True, "falhas": True, "itens": True}},
+                {"$sort": {"hora": 1, "fila": 1}},
+            ],
+        }},
+    ]
+    return desde, pipeline
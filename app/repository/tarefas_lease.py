@@ -0,0 +1,126 @@
+import logging
+import os
+import time
+from datetime import timedelta
+
+from app.repository.tarefas_repository import LEASE_DURATION, MAX_TASK_DURATION, TarefasRepository
+from app.utils.periodico import ExecutorPeriodico
+
+# Intervalo do reaper que libera em lote as tarefas com lease vencido.
+REAPER_INTERVALO = float(os.getenv("TAREFA_REAPER_SEGUNDOS", 10))
+# Intervalo da manutenção da coleção de tarefas (tarefas presas sem lease e filas paradas).
+MANUTENCAO_INTERVALO = float(os.getenv("TAREFAS_MANUTENCAO_SEGUNDOS", 3600))
+
+_reaper: ExecutorPeriodico | None = None
+_manutencao: ExecutorPeriodico | None = None
+
+
+class HeartbeatTarefa:
+    """
+    Mantém o lease de uma tarefa em execução renovando `lease_until` em segundo plano.
+
+    Enquanto o heartbeat estiver ativo a tarefa não pode ser reivindicada por outro worker; se o
+    processo morrer, o lease vence em `LEASE_DURATION` e o reaper libera a fila. A renovação para
+    depois de `limite` (por padrão `MAX_TASK_DURATION`), para que um worker travado em um processo
+    vivo não prenda a fila indefinidamente.
+
+    O `TarefasRepository` inicia um heartbeat em cada reivindicação (`reivindicar_fila`,
+    `inicializar_tarefa`) e o interrompe em `finalizar_tarefa`; o worker só precisa consultá-lo.
+
+    Exemplo:
+        nome, token = escolher_fila_com_lease("fila", hora_fim)
+        heartbeat = TarefasRepository().heartbeat(nome)
+        try:
+            for item in itens:
+                if heartbeat.perdido:
+                    break
+                ...
+        finally:
+            TarefasRepository().finalizar_tarefa(nome, lease_token=token)
+
+    Atributos:
+        nome (str): Nome da tarefa.
+        lease_token (str): Token recebido ao iniciar a tarefa.
+        perdido (bool): True se o lease não pôde ser renovado (a fila foi liberada ou reivindicada por outro)
+            ou se a execução passou do `limite`.
+    """
+
+    def __init__(self, nome: str, lease_token: str, intervalo: float = None, limite: timedelta = MAX_TASK_DURATION):
+        """
+        Args:
+            nome (str): Nome da tarefa.
+            lease_token (str): Token recebido ao iniciar a tarefa.
+            intervalo (float, optional): Intervalo de renovação em segundos. Default é um terço de `LEASE_DURATION`.
+            limite (timedelta, optional): Duração máxima da execução renovada pelo heartbeat. Default é `MAX_TASK_DURATION`.
+        """
+        self.nome = nome
+        self.lease_token = lease_token
+        self.limite = limite
+        self.perdido = False
+        self._inicio = time.monotonic()
+        self._repositorio = TarefasRepository()
+        self._executor = ExecutorPeriodico(f"heartbeat-{nome}", intervalo or LEASE_DURATION.total_seconds() / 3, self._renovar)
+
+    def _renovar(self):
+        if self.limite is not None and time.monotonic() - self._inicio > self.limite.total_seconds():
+            logging.warning("Tarefa %s passou de %s; lease não será mais renovado.", self.nome, self.limite)
+            self.perdido = True
+            self._executor.parar()
+            return
+        if not self._repositorio.renovar_lease(self.nome, self.lease_token):
+            logging.warning("Lease da tarefa %s perdido; heartbeat encerrado.", self.nome)
+            self.perdido = True
+            self._executor.parar()
+
+    def iniciar(self):
+        """Inicia a renovação periódica do lease (a primeira renovação é imediata)."""
+        self._executor.iniciar()
+
+    def parar(self):
+        """Interrompe a renovação do lease."""
+        self._executor.parar()
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.parar()
+
+
+def _liberar_leases():
+    repositorio = TarefasRepository()
+    liberadas = repositorio.liberar_leases_expirados()
+    if liberadas:
+        logging.warning("Reaper liberou %s tarefa(s) com lease vencido.", liberadas)
+
+
+def _manter_colecao():
+    repositorio = TarefasRepository()
+    repositorio._cleanup_old_tasks()
+    removidas = repositorio.podar_filas_inativas()
+    if removidas:
+        logging.info("Manutenção removeu %s fila(s) sem execução recente.", removidas)
+
+
+def iniciar_reaper():
+    """
+    Inicia a rotina que libera periodicamente as tarefas com lease vencido e a manutenção da coleção
+    (`_cleanup_old_tasks` e remoção das filas paradas há mais que `TAREFAS_RETENCAO_DIAS`).
+
+    Podem rodar em todas as instâncias da aplicação: cada execução é um `update_many`/`delete_many` idempotente.
+    """
+    global _reaper, _manutencao
+    if _reaper is None:
+        _reaper = ExecutorPeriodico("reaper-tarefas", REAPER_INTERVALO, _liberar_leases)
+    if _manutencao is None:
+        _manutencao = ExecutorPeriodico("manutencao-tarefas", MANUTENCAO_INTERVALO, _manter_colecao)
+    _reaper.iniciar()
+    _manutencao.iniciar()
+
+
+def parar_reaper():
+    """Interrompe as rotinas de liberação de leases e de manutenção."""
+    for rotina in (_reaper, _manutencao):
+        if rotina is not None:
+            rotina.parar()
@@ -0,0 +1,115 @@
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+from pymongo import UpdateOne
+
+from app.utils.periodico import ExecutorPeriodico
+
+# Intervalo máximo, em segundos, entre a atualização em memória e a gravação no banco.
+PROGRESSO_FLUSH_SEGUNDOS = float(os.getenv("PROGRESSO_FLUSH_SEGUNDOS", 2))
+# Quantidade de atualizações de uma tarefa que força a gravação imediata.
+PROGRESSO_FLUSH_ITENS = int(os.getenv("PROGRESSO_FLUSH_ITENS", 50))
+
+_buffers: list["BufferProgresso"] = []
+
+
+class BufferProgresso:
+    """
+    Acumula em memória o progresso das tarefas e grava apenas o estado mais recente de cada uma.
+
+    As gravações são feitas em lote (`bulk_write`) a cada `intervalo` segundos ou quando uma tarefa
+    acumula `max_itens` atualizações, reduzindo a escrita na coleção de tarefas de uma por item
+    processado para uma por intervalo.
+
+    Atributos:
+        intervalo (float): Intervalo de gravação, em segundos.
+        max_itens (int): Atualizações de uma tarefa que forçam a gravação.
+    """
+
+    def __init__(self, colecao, intervalo: float = PROGRESSO_FLUSH_SEGUNDOS, max_itens: int = PROGRESSO_FLUSH_ITENS):
+        """
+        Args:
+            colecao (pymongo.collection.Collection): Coleção de tarefas.
+            intervalo (float): Intervalo de gravação, em segundos.
+            max_itens (int): Atualizações de uma tarefa que forçam a gravação.
+        """
+        self._colecao = colecao
+        self.intervalo = intervalo
+        self.max_itens = max_itens
+        self._pendentes: dict[str, dict] = {}
+        self._contagem: dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Serializa as gravações: um lote retirado antes é sempre gravado antes (não sobrescreve um mais novo).
+        self._lock_gravacao = threading.Lock()
+        self._executor = ExecutorPeriodico("flush-progresso", intervalo, self.flush, executar_ao_iniciar=False)
+        _buffers.append(self)
+
+    def registrar(self, nome: str, progresso: dict):
+        """
+        Registra o progresso mais recente de uma tarefa.
+
+        Args:
+            nome (str): Nome da tarefa.
+            progresso (dict): Progresso atual.
+        """
+        with self._lock:
+            self._pendentes[nome] = progresso
+            self._contagem[nome] = self._contagem.get(nome, 0) + 1
+            atingiu_limite = self._contagem[nome] >= self.max_itens
+        self._executor.iniciar()
+        if atingiu_limite:
+            self.flush(nome)
+
+    def obter(self, nome: str) -> Optional[dict]:
+        """
+        Retorna o progresso ainda não gravado de uma tarefa, se houver.
+        """
+        with self._lock:
+            return self._pendentes.get(nome)
+
+    def flush(self, nome: str = None):
+        """
+        Grava o progresso pendente no banco. As gravações são feitas uma de cada vez, para que um flush
+        periódico concorrente com o de `max_itens` ou de `finalizar_tarefa` não grave um estado mais antigo
+        por cima de um mais novo; `registrar` não é bloqueado durante a gravação.
+
+        Args:
+            nome (str, optional): Grava apenas esta tarefa. Se None, grava todas.
+        """
+        with self._lock_gravacao:
+            with self._lock:
+                nomes = [nome] if nome is not None else list(self._pendentes)
+                lote = {n: self._pendentes.pop(n) for n in nomes if n in self._pendentes}
+                for n in lote:
+                    self._contagem.pop(n, None)
+            if not lote:
+                return
+
+            agora = datetime.now()
+            try:
+                self._colecao.bulk_write([UpdateOne({"task_name": n}, {"$set": {"progresso": p, "progresso_em": agora}}) for n, p in lote.items()],
+                                         ordered=False)
+            except Exception as e:
+                logging.error("Erro ao gravar o progresso das tarefas %s: %s", list(lote), e)
+                with self._lock:
+                    # Devolve ao buffer, sem sobrescrever atualizações que chegaram durante a gravação.
+                    for n, p in lote.items():
+                        self._pendentes.setdefault(n, p)
+
+    def encerrar(self):
+        """Interrompe a gravação periódica e grava o que estiver pendente."""
+        self._executor.parar()
+        self.flush()
+
+
+@atexit.register
+def descarregar_buffers():
+    """
+    Grava o progresso pendente de todos os buffers; chamada no desligamento da aplicação.
+    """
+    for buffer in _buffers:
+        buffer.encerrar()
@@ -1,18 +1,189 @@
 import os
+import re
+import logging
+import uuid
 import atexit
 import signal
-import pymongo
 import threading
+import pymongo
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException
+from pymongo import IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 
-from app import host_mongo
-from app.data.models.processo import Processo
+from app.repository.mongo_client import obter_cliente
+from app.repository.tarefas_controle import CanalControleTarefas, EstadoTarefa, CAMPOS_CONTROLE
+from app.repository.tarefas_historico import HistoricoTarefas, RESULTADO_LEASE_EXPIRADO, RESULTADO_SUCESSO
+from app.repository.tarefas_progresso import BufferProgresso
+from app.utils.agenda import compilar_janela, obter_agendador
 
 # Define a duração máxima para uma tarefa, após a qual será marcada como finalizada.
+# Vale para documentos sem lease (gravados antes do lease existir) e limita a renovação pelo heartbeat.
 MAX_TASK_DURATION = timedelta(hours=28)
 
+# Validade do lease renovado pelo heartbeat (iniciado em cada reivindicação); uma tarefa sem renovação
+# nesse período pode ser reivindicada.
+LEASE_DURATION = timedelta(seconds=int(os.getenv("TAREFA_LEASE_SEGUNDOS", 30)))
+
+# Filas paradas há mais que este período (sem execução) são removidas pela manutenção.
+TAREFAS_RETENCAO = timedelta(days=int(os.getenv("TAREFAS_RETENCAO_DIAS", 30)))
+
+# Índices da coleção de tarefas, cada um atendendo às consultas indicadas.
+INDICES_TAREFAS = [
+    # Uma fila por nome; atende todas as consultas por task_name.
+    IndexModel([("task_name", pymongo.ASCENDING)], name="task_name_unico", unique=True),
+    # designado_rodando_em_outra_fila e contar_filas_do_designado (distinct coberto pelo índice).
+    IndexModel([("designado", pymongo.ASCENDING), ("is_running", pymongo.ASCENDING), ("task_name", pymongo.ASCENDING)],
+               name="designado_is_running_task_name"),
+    # ultimo_uso_usuario.
+    IndexModel([("designado", pymongo.ASCENDING), ("start_time", pymongo.DESCENDING)], name="designado_start_time"),
+    # tarefa_recente_concluida.
+    IndexModel([("task_name", pymongo.ASCENDING), ("is_running", pymongo.ASCENDING), ("end_time", pymongo.DESCENDING)],
+               name="task_name_is_running_end_time"),
+    # painel e ativas por família.
+    IndexModel([("fila_familia", pymongo.ASCENDING), ("ordem_fila", pymongo.ASCENDING)], name="fila_familia_ordem_fila"),
+    # Reaper de leases vencidos e manutenção das filas paradas.
+    IndexModel([("is_running", pymongo.ASCENDING), ("lease_until", pymongo.ASCENDING)], name="is_running_lease_until"),
+    IndexModel([("is_running", pymongo.ASCENDING), ("end_time", pymongo.ASCENDING)], name="is_running_end_time"),
+]
+
+
+def _filtro_fila_livre(agora: datetime) -> dict:
+    """
+    Filtro das tarefas que podem ser reivindicadas: paradas, com lease vencido ou,
+    para documentos sem lease, rodando há mais que `MAX_TASK_DURATION`.
+    """
+    return {"$or": [
+        {"is_running": {"$ne": True}},
+        {"lease_until": {"$lt": agora}},
+        {"lease_until": {"$exists": False}, "start_time": {"$lt": agora - MAX_TASK_DURATION}}
+    ]}
+
+
+def _ordem_da_fila(nome: str) -> int:
+    """Retorna o número no final do nome da fila (ex.: "fila12" -> 12), usado para ordenar as candidatas."""
+    numero = re.search(r"(\d+)$", nome)
+    return int(numero.group(1)) if numero else 0
+
+
+def familia_da_fila(nome: str) -> str:
+    """Retorna o nome da fila sem o número final (ex.: "consulta3" -> "consulta"), agrupando as filas 1..N."""
+    return re.sub(r"\d+$", "", nome) or nome
+
+
+def _resultado_execucao(doc: dict, erro_login: bool = False) -> str:
+    """Classifica o término de uma execução para o histórico."""
+    if erro_login:
+        return "ERRO_LOGIN"
+    if doc.get("force_stop"):
+        return "INTERROMPIDA"
+    return RESULTADO_SUCESSO
+
+
+def _registro_historico(doc: dict, fim: datetime, resultado: str) -> dict:
+    """
+    Monta o documento do histórico a partir do documento da tarefa antes da finalização.
+
+    Args:
+        doc (dict): Documento da tarefa ainda em execução.
+        fim (datetime): Momento do término.
+        resultado (str): Resultado da execução (ex.: "SUCESSO", "ERRO_LOGIN", "LEASE_EXPIRADO").
+
+    Returns:
+        dict: Documento para a coleção `core_security.tarefas_historico`.
+    """
+    inicio = doc.get("start_time")
+    return {
+        "task_name": doc["task_name"],
+        "fila": familia_da_fila(doc["task_name"]),
+        "designado": doc.get("designado"),
+        "solicitante": doc.get("solicitante"),
+        "inicio": inicio,
+        "fim": fim,
+        "hora": fim.replace(minute=0, second=0, microsecond=0),
+        "duracao_segundos": (fim - inicio).total_seconds() if inicio else None,
+        "quantidade": doc.get("amount"),
+        "resultado": resultado,
+    }
+
+
+def sincronizar_indices(colecao) -> list[str]:
+    """
+    Cria os índices de `INDICES_TAREFAS` que não existem.
+
+    Cada índice é criado separadamente: se o índice único de `task_name` não puder ser criado por
+    haver filas duplicadas, as duplicadas são registradas no log e os demais índices são criados.
+
+    Args:
+        colecao (pymongo.collection.Collection): Coleção de tarefas.
+
+    Returns:
+        list[str]: Os nomes dos índices que não puderam ser criados.
+    """
+    existentes = colecao.index_information()
+    falhas = []
+    for indice in INDICES_TAREFAS:
+        nome = indice.document["name"]
+        if nome in existentes:
+            continue
+        try:
+            colecao.create_indexes([indice])
+        except OperationFailure as e:
+            falhas.append(nome)
+            if e.code == 11000:
+                duplicadas = [doc["_id"] for doc in colecao.aggregate([
+                    {"$group": {"_id": "$task_name", "total": {"$sum": 1}}},
+                    {"$match": {"total": {"$gt": 1}}},
+                    {"$limit": 20}
+                ])]
+                logging.error("Índice %s não criado: existem filas duplicadas %s.", nome, duplicadas)
+            else:
+                logging.error("Índice %s não criado: %s", nome, e)
+    return falhas
+
+
+def _filtro_familia(familia: str) -> dict:
+    """
+    Filtro das filas de uma família pelo campo indexado `fila_familia`.
+
+    Documentos antigos, gravados antes do campo existir, são encontrados por um regex ancorado no
+    início do nome (que também usa o índice de `task_name`).
+    """
+    return {"$or": [
+        {"fila_familia": familia},
+        {"fila_familia": {"$exists": False}, "task_name": {"$regex": f"^{re.escape(familia)}\\d*$"}}
+    ]}
+
+
+# Campos das filas exibidos no painel de monitoramento.
+_CAMPOS_PAINEL = {"_id": False, "task_name": True, "fila_familia": True, "is_running": True, "designado": True,
+                  "solicitante": True, "start_time": True, "end_time": True, "amount": True, "progresso": True,
+                  "progresso_em": True, "business_hours": True, "scheduled_stop": True, "force_stop": True,
+                  "erro_login": True, "lease_until": True, "heartbeat": True}
+
+# Campos lidos do documento da tarefa para montar o histórico.
+_CAMPOS_HISTORICO = {"task_name": True, "is_running": True, "designado": True, "solicitante": True,
+                     "start_time": True, "amount": True, "force_stop": True}
+
+
+def _campos_inicializacao(designado=None, session_id=None, qtd=None, hora_fim=None, solicitante=None) -> dict:
+    """
+    Monta os campos gravados ao iniciar uma tarefa, incluindo um novo token de lease. O lease vale por
+    `LEASE_DURATION` e é mantido pelo heartbeat iniciado pelo repositório.
+
+    Returns:
+        dict: Campos para o `$set` da tarefa.
+    """
+    agora = datetime.now()
+    campos = {"is_running": True, "erro_login": False, "force_stop": False, "start_time": agora, 'designado': designado, 'id_driver_session': session_id,
+              'amount': qtd, "solicitante": solicitante, "lease_token": uuid.uuid4().hex, "lease_until": agora + LEASE_DURATION}
+    if hora_fim is not None:
+        campos.update({"business_hours": True, "scheduled_stop": {"start": agora.strftime("%H:%M"), "stop": hora_fim}})
+    else:
+        campos.update({"business_hours": False, "scheduled_stop": None})
+    return campos
+
 
 class TarefasRepository:
     """
@@ -23,7 +194,8 @@ class TarefasRepository:
     """
 
     _instance = None
-    _handlers_registered = False
+    _atexit_registrado = False
+    _sigterm_registrado = False
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -36,60 +208,208 @@ class TarefasRepository:
             return
 
         """Inicializa uma instância de `TarefasRepository`, conectando-se ao banco MongoDB."""
-        self._db = pymongo.MongoClient(host_mongo)
+        self._db = obter_cliente()
         self._banco = self._db[os.getenv('MONGO_DB_NAME')]
         self._colecao = self._banco["core_security.tarefas"]
-
-        # Registra handlers apenas uma vez
-        if not TarefasRepository._handlers_registered:
-            self._register_shutdown_handlers()
-            TarefasRepository._handlers_registered = True
+        self._filas_conhecidas: set[str] = set()
+        self._progresso = BufferProgresso(self._colecao)
+        self._controle = CanalControleTarefas(self._colecao)
+        self._historico = HistoricoTarefas(self._banco["core_security.tarefas_historico"])
+        # Filas reivindicadas por este processo e ainda não finalizadas (nome -> token de lease).
+        self._leases_locais: dict[str, str] = {}
+        # Heartbeats que renovam os leases reivindicados por este processo (nome -> HeartbeatTarefa).
+        self._heartbeats: dict = {}
+        self._garantir_indices()
+
+        # O desligamento é tratado pelo lifespan da aplicação; o atexit e o SIGTERM cobrem scripts que não sobem a API.
+        if not TarefasRepository._atexit_registrado:
+            atexit.register(self.interromper_execucoes_locais)
+            TarefasRepository._atexit_registrado = True
+        self._registrar_sigterm()
 
         self._initialized = True
 
-    def _register_shutdown_handlers(self):
-        """Registra handlers para eventos de desligamento (apenas uma vez) """
-
-        # Only register signals in main thread
-        if threading.current_thread() is not threading.main_thread():
-            return  # Sai se não for a thread principal
-
-        def handle_shutdown(signum=None, frame=None):
-            print("Sinal de desligamento recebido, marcando tarefas como interrompidas")
-            self._mark_running_tasks_as_interrupted()
-            # Garante saída após tratamento
-            if signum is not None:
-                exit(0)
-
-        # Armazena o handler original para restauração se necessário
-        if not hasattr(TarefasRepository, '_original_handlers'):
-            TarefasRepository._original_handlers = {
-                signal.SIGTERM: signal.getsignal(signal.SIGTERM),
-                signal.SIGINT: signal.getsignal(signal.SIGINT)
-            }
-
-        # Registra apenas se não estiver registrado
-        if signal.getsignal(signal.SIGTERM) != handle_shutdown:
-            signal.signal(signal.SIGTERM, handle_shutdown)
-        if signal.getsignal(signal.SIGINT) != handle_shutdown:
-            signal.signal(signal.SIGINT, handle_shutdown)
-
-        atexit.register(handle_shutdown)
-
-    def _mark_running_tasks_as_interrupted(self):
-        """Marca todas as tarefas em execução como interrompidas"""
-        Processo.objects(status_proc="INICIADO").update(status="PENDENTE")
+    def _registrar_sigterm(self):
+        """
+        Libera as filas deste processo ao receber SIGTERM, que não executa o `atexit`.
+
+        Só é registrado na thread principal e se ninguém tratar o sinal (SIG_DFL): no processo da API
+        o servidor (uvicorn/gunicorn) trata o SIGTERM e o lifespan libera as filas. O SIGINT já
+        encerra pelo `KeyboardInterrupt`, passando pelo `atexit`.
+        """
+        if TarefasRepository._sigterm_registrado or threading.current_thread() is not threading.main_thread():
+            return
+        if signal.getsignal(signal.SIGTERM) is not signal.SIG_DFL:
+            return
+
+        def ao_receber_sigterm(signum, frame):
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            logging.info("SIGTERM recebido, liberando as filas deste processo.")
+            self.interromper_execucoes_locais()
+            raise SystemExit(128 + signum)
+
+        signal.signal(signal.SIGTERM, ao_receber_sigterm)
+        TarefasRepository._sigterm_registrado = True
+
+    def _garantir_indices(self):
+        """Sincroniza os índices declarados em `INDICES_TAREFAS` (idempotente)."""
+        sincronizar_indices(self._colecao)
+
+    def _garantir_filas(self, nomes: list[str]):
+        """
+        Garante que exista um documento para cada fila candidata, para que a reivindicação
+        possa ser feita com um único `find_one_and_update`.
+
+        Executado uma vez por fila em cada processo.
+        """
+        novas = [nome for nome in nomes if nome not in self._filas_conhecidas]
+        if not novas:
+            return
+        operacoes = [UpdateOne({"task_name": nome},
+                               {"$set": {"ordem_fila": _ordem_da_fila(nome), "fila_familia": familia_da_fila(nome)}, "$setOnInsert": {"is_running": False}},
+                               upsert=True)
+                     for nome in novas]
         try:
-            self._colecao.update_many(
-                {"is_running": True},
-                {"$set": {
-                    "is_running": False,
-                    "end_time": datetime.now(),
-                    "force_stop": True
-                }}
+            self._colecao.bulk_write(operacoes, ordered=False)
+        except BulkWriteError as e:
+            # Outra instância criou o mesmo documento ao mesmo tempo; qualquer outro erro é repassado.
+            if any(erro.get("code") != 11000 for erro in e.details.get("writeErrors", [])):
+                raise
+        self._filas_conhecidas.update(novas)
+
+    def reivindicar_fila(self, nomes: list[str], designado=None, session_id=None, qtd=None, hora_fim=None, solicitante=None) -> tuple[str, str] | None:
+        """
+        Reivindica atomicamente a primeira fila livre entre as candidatas.
+
+        Uma fila está livre se não estiver em execução ou se o lease da execução atual estiver vencido.
+        A escolha e a inicialização são feitas em um único `find_one_and_update`, então duas instâncias
+        da aplicação nunca recebem a mesma fila.
+
+        Args:
+            nomes (list[str]): Nomes (task_name) das filas candidatas, em ordem de preferência.
+
+        Returns:
+            tuple[str, str] | None: O nome da fila reivindicada e o token de lease, ou None se todas estiverem ocupadas.
+        """
+        for tentativa in range(2):
+            self._garantir_filas(nomes)
+            campos = _campos_inicializacao(designado, session_id, qtd, hora_fim, solicitante)
+            doc = self._colecao.find_one_and_update(
+                {"task_name": {"$in": nomes}, **_filtro_fila_livre(campos["start_time"])},
+                {"$set": campos},
+                sort=[("ordem_fila", pymongo.ASCENDING), ("task_name", pymongo.ASCENDING)],
+                projection={"task_name": True},
+                return_document=ReturnDocument.AFTER
             )
+            if doc is not None:
+                self._leases_locais[doc["task_name"]] = campos["lease_token"]
+                self._iniciar_heartbeat(doc["task_name"], campos["lease_token"])
+                self._reiniciar_controle(doc["task_name"], campos)
+                return doc["task_name"], campos["lease_token"]
+            if tentativa or self._colecao.count_documents({"task_name": {"$in": nomes}}) == len(nomes):
+                return None
+            # Alguma fila foi removida pela manutenção depois de entrar no cache: recria e tenta de novo (uma vez).
+            self._filas_conhecidas.difference_update(nomes)
+        return None
+
+    def _iniciar_heartbeat(self, nome: str, lease_token: str):
+        """Inicia a renovação do lease reivindicado, substituindo o heartbeat de uma execução anterior da fila."""
+        from app.repository.tarefas_lease import HeartbeatTarefa
+
+        heartbeat = HeartbeatTarefa(nome, lease_token)
+        anterior = self._heartbeats.pop(nome, None)
+        self._heartbeats[nome] = heartbeat
+        if anterior is not None:
+            anterior.parar()
+        heartbeat.iniciar()
+
+    def _parar_heartbeat(self, nome: str, lease_token: str = None):
+        """Interrompe a renovação do lease da fila (apenas o do token informado, se houver)."""
+        heartbeat = self._heartbeats.get(nome)
+        if heartbeat is not None and (lease_token is None or heartbeat.lease_token == lease_token):
+            if self._heartbeats.pop(nome, None) is heartbeat:
+                heartbeat.parar()
+
+    def heartbeat(self, nome: str):
+        """
+        Retorna o heartbeat que renova o lease da fila reivindicada por este processo.
+
+        Args:
+            nome (str): Nome da tarefa.
+
+        Returns:
+            HeartbeatTarefa | None: O heartbeat (`perdido` indica que o worker deve parar), ou None se a
+            fila não foi reivindicada por este processo.
+        """
+        return self._heartbeats.get(nome)
+
+    def renovar_lease(self, nome: str, lease_token: str) -> bool:
+        """
+        Renova o lease de uma tarefa em execução por mais `LEASE_DURATION`.
+
+        Args:
+            nome (str): O nome da tarefa.
+            lease_token (str): O token recebido ao iniciar a tarefa.
+
+        Returns:
+            bool: False se a tarefa não estiver mais em execução com este token (lease perdido).
+        """
+        agora = datetime.now()
+        result = self._colecao.update_one(
+            {"task_name": nome, "lease_token": lease_token, "is_running": True},
+            {"$set": {"lease_until": agora + LEASE_DURATION, "heartbeat": agora}}
+        )
+        return result.matched_count > 0
+
+    def liberar_leases_expirados(self) -> int:
+        """
+        Libera em lote as tarefas cujo lease venceu (worker parado sem finalizar a tarefa).
+
+        Returns:
+            int: A quantidade de tarefas liberadas.
+        """
+        agora = datetime.now()
+        expiradas = list(self._colecao.find({"is_running": True, "lease_until": {"$lt": agora}}, _CAMPOS_HISTORICO))
+        if not expiradas:
+            return 0
+        result = self._colecao.update_many(
+            {"_id": {"$in": [doc["_id"] for doc in expiradas]}, "is_running": True, "lease_until": {"$lt": agora}},
+            {"$set": {"is_running": False, "end_time": agora, "force_stop": True, "lease_expirado": True}}
+        )
+        self._historico.registrar([_registro_historico(doc, agora, RESULTADO_LEASE_EXPIRADO) for doc in expiradas])
+        return result.modified_count
+
+    def interromper_execucoes_locais(self) -> int:
+        """
+        Marca como interrompidas apenas as tarefas reivindicadas por este processo.
+
+        Chamada no desligamento da aplicação (lifespan) e, como fallback, no atexit. As tarefas de
+        outras instâncias não são afetadas: continuam com seus leases.
+
+        Returns:
+            int: A quantidade de tarefas interrompidas.
+        """
+        leases = dict(self._leases_locais)
+        self._leases_locais.clear()
+        for nome in list(self._heartbeats):
+            self._parar_heartbeat(nome)
+        if not leases:
+            return 0
+        from app.data.models.processo import Processo
+
+        try:
+            self._progresso.flush()
+            Processo.objects(status_proc="INICIADO").update(status="PENDENTE")
+            filtro = {"$or": [{"task_name": nome, "lease_token": token} for nome, token in leases.items()], "is_running": True}
+            execucoes = list(self._colecao.find(filtro, _CAMPOS_HISTORICO))
+            agora = datetime.now()
+            result = self._colecao.update_many(filtro, {"$set": {"is_running": False, "end_time": agora, "force_stop": True}})
+            self._historico.registrar([_registro_historico(doc, agora, "INTERROMPIDA") for doc in execucoes])
+            logging.info("Desligamento: %s tarefa(s) deste processo marcadas como interrompidas.", result.modified_count)
+            return result.modified_count
         except Exception as e:
-            print(f"Erro ao marcar tarefas como interrompidas: {str(e)}")
+            logging.error("Erro ao marcar tarefas como interrompidas: %s", e)
+            return 0
 
     def _cleanup_old_tasks(self):
         """Limpa tarefas antigas que podem ter ficado 'presas'"""
@@ -97,6 +417,7 @@ class TarefasRepository:
         self._colecao.update_many(
             {
                 "is_running": True,
+                "lease_until": {"$exists": False},
                 "start_time": {"$lt": threshold}
             },
             {"$set": {
@@ -106,6 +427,26 @@ class TarefasRepository:
             }}
         )
 
+    def podar_filas_inativas(self, retencao: timedelta = TAREFAS_RETENCAO) -> int:
+        """
+        Remove os documentos das filas paradas que não executam há mais que `retencao`.
+
+        As filas removidas são recriadas automaticamente na próxima reivindicação. O histórico
+        das execuções fica em `core_security.tarefas_historico`.
+
+        Args:
+            retencao (timedelta): Tempo sem execução após o qual a fila é removida. Default é `TAREFAS_RETENCAO_DIAS`.
+
+        Returns:
+            int: A quantidade de filas removidas.
+        """
+        limite = datetime.now() - retencao
+        result = self._colecao.delete_many({"is_running": {"$ne": True}, "$or": [
+            {"end_time": {"$lt": limite}},
+            {"end_time": {"$exists": False}, "start_time": {"$lt": limite}}
+        ]})
+        return result.deleted_count
+
     def designado_rodando_em_outra_fila(self, nome_atual: str, designado: str = None) -> bool:
         """
         Verifica se o designado está rodando em outra fila diferente da atual.
@@ -160,6 +501,63 @@ class TarefasRepository:
         )
         return tarefa["start_time"] if tarefa else None
 
+    def acompanhar(self, nome: str) -> EstadoTarefa:
+        """
+        Passa a receber as alterações de controle da tarefa (`force_stop`, `scheduled_stop`) em memória.
+
+        Depois de chamado, `verificar_interrupcao` e `verificar_finalizado` não consultam mais o banco
+        para esta tarefa, e `EstadoTarefa.aguardar` retorna assim que uma parada for solicitada.
+
+        Args:
+            nome (str): Nome da tarefa.
+
+        Se a tarefa tiver horário de funcionamento (`business_hours`), a parada é agendada para o
+        fim da janela e o estado é marcado como interrompido nesse momento, sem consultar o banco.
+
+        Returns:
+            EstadoTarefa: Estado da tarefa mantido pelo canal de controle.
+        """
+        estado = self._controle.registrar(nome)
+        if self._agendar_parada not in estado._ouvintes:
+            estado.ao_alterar(self._agendar_parada)
+            self._agendar_parada(estado)
+        return estado
+
+    def deixar_de_acompanhar(self, nome: str):
+        """Deixa de acompanhar as alterações de controle da tarefa."""
+        self._controle.remover(nome)
+        obter_agendador().cancelar(nome)
+
+    def _agendar_parada(self, estado: EstadoTarefa):
+        """Agenda (ou cancela) a parada da tarefa conforme o schedule atual do documento."""
+        schedule = estado.documento.get("scheduled_stop")
+        if not estado.documento.get("business_hours") or not schedule:
+            obter_agendador().cancelar(estado.nome)
+            return
+        janela = compilar_janela(schedule["start"], schedule["stop"])
+        if not janela.esta_no_periodo():
+            estado.solicitar_parada()
+
+        def ao_transicionar(_nome: str, dentro_da_janela: bool):
+            if not dentro_da_janela:
+                logging.info("Fim do horário de funcionamento da tarefa %s.", estado.nome)
+                estado.solicitar_parada()
+
+        obter_agendador().seguir_janela(estado.nome, janela, ao_transicionar)
+
+    def _reiniciar_controle(self, nome: str, campos: dict):
+        """Descarta a parada local da execução anterior da fila, se ela estiver sendo acompanhada."""
+        estado = self._controle.estado(nome)
+        if estado is not None:
+            estado.reiniciar({campo: campos[campo] for campo in CAMPOS_CONTROLE if campo in campos})
+
+    def _documento_controle(self, nome: str) -> Optional[dict]:
+        """Retorna os campos de controle da tarefa, da memória se ela estiver sendo acompanhada."""
+        estado = self._controle.estado(nome)
+        if estado is not None and estado.atualizado_em is not None:
+            return estado.documento
+        return self._colecao.find_one({"task_name": nome}, {campo: True for campo in CAMPOS_CONTROLE})
+
     def verificar_finalizado(self, nome: str) -> bool:
         """
         Verifica se a tarefa está no período de funcionamento ou se deve ser finalizada.
@@ -173,32 +571,15 @@ class TarefasRepository:
         :raises ValueError: Se o documento não for encontrado ou campos esperados estiverem ausentes.
         """
         # Recupera o documento uma única vez
-        doc = self._colecao.find_one({"task_name": nome})
+        doc = self._documento_controle(nome)
         if not doc:
             raise ValueError(f"Tarefa '{nome}' não encontrada no banco de dados.")
 
-        def esta_no_periodo(schedule: dict) -> bool:
-            """
-            Verifica se o horário atual está dentro do período definido em schedule.
-
-            :param schedule: Dicionário com o formato {"start": "HH:MM", "stop": "HH:MM"}.
-            :return: True se estiver no período, False caso contrário.
-            """
-            agora = datetime.now().time()
-            hora_inicio = datetime.strptime(schedule["start"], "%H:%M").time()
-            hora_parada = datetime.strptime(schedule["stop"], "%H:%M").time()
-
-            # Se o período não cruza a meia-noite
-            if hora_inicio < hora_parada:
-                return hora_inicio <= agora <= hora_parada
-
-            # Período que cruza a meia-noite (ex: 19:30 a 07:30)
-            return agora >= hora_inicio or agora <= hora_parada
-
         if "business_hours" in doc and doc['business_hours'] is not None:
             schedule = doc.get("scheduled_stop")
             if schedule:
-                return esta_no_periodo(schedule)
+                # A janela é compilada uma vez por par de horários (sem strptime a cada chamada).
+                return compilar_janela(schedule["start"], schedule["stop"]).esta_no_periodo()
 
         # Retorna o valor de 'force_stop', ou False se não estiver definido
         return doc.get("force_stop", True)
@@ -216,26 +597,38 @@ class TarefasRepository:
                 {"task_name": nome},
                 {"$set": {"force_stop": True}}
             )
+            estado = self._controle.estado(nome)
+            if estado is not None:
+                # Acorda imediatamente os workers deste processo, sem esperar o canal de controle.
+                estado.solicitar_parada()
             return result.modified_count > 0
         except Exception as e:
-            print(f"Erro ao solicitar interrupção: {str(e)}")
+            logging.error("Erro ao solicitar interrupção: %s", e)
             raise
 
     def verificar_interrupcao(self, nome: str) -> bool:
         """Verifica se há solicitação de interrupção para a tarefa"""
-        doc = self._colecao.find_one({"task_name": nome})
+        estado = self._controle.estado(nome)
+        if estado is not None and estado.atualizado_em is not None:
+            return estado.interrompido
+        doc = self._colecao.find_one({"task_name": nome}, {"force_stop": True})
         return doc and doc.get("force_stop", False)
 
     def atualizar_progresso(self, nome: str, progresso: dict):
-        """Atualiza o progresso da tarefa"""
-        self._colecao.update_one(
-            {"task_name": nome},
-            {"$set": {"progresso": progresso}}
-        )
+        """
+        Atualiza o progresso da tarefa.
+
+        A gravação é agrupada pelo `BufferProgresso`: o banco recebe o estado mais recente a cada
+        `PROGRESSO_FLUSH_SEGUNDOS` ou `PROGRESSO_FLUSH_ITENS` atualizações.
+        """
+        self._progresso.registrar(nome, progresso)
 
     def obter_progresso(self, nome: str) -> Optional[dict]:
-        """Obtém o progresso atual da tarefa"""
-        doc = self._colecao.find_one({"task_name": nome})
+        """Obtém o progresso atual da tarefa (o ainda não gravado deste processo tem prioridade)"""
+        pendente = self._progresso.obter(nome)
+        if pendente is not None:
+            return pendente
+        doc = self._colecao.find_one({"task_name": nome}, {"progresso": True})
         return doc.get("progresso") if doc else None
 
     def verificar_em_execucao(self, nome: str) -> bool:
@@ -253,22 +646,47 @@ class TarefasRepository:
         })
         return doc is not None
 
-    def finalizar_tarefa(self, nome, erro_login: bool = False):
+    def finalizar_tarefa(self, nome, erro_login: bool = False, lease_token: str = None, resultado: str = None):
         """
         Finaliza uma tarefa marcando-a como concluída.
 
         Atualiza o status de uma tarefa no banco de dados, marcando-a como "is_running" False,
-        e registrando o horário de término.
+        e registrando o horário de término. Se a tarefa estava em execução, a execução é
+        adicionada ao histórico (`core_security.tarefas_historico`).
 
         Args:
             nome (str): O nome da tarefa a ser finalizada.
             :param nome:
             :param erro_login:
+            :param lease_token: Se informado, só finaliza se a fila ainda pertencer a este lease.
+            :param resultado: Resultado gravado no histórico. Default é deduzido de `erro_login`/`force_stop`.
         """
-        self._colecao.update_one(
-            {"task_name": nome},
-            {"$set": {"is_running": False, "end_time": datetime.now(), "erro_login": erro_login}}
+        self._progresso.flush(nome)
+        if lease_token is None or self._leases_locais.get(nome) == lease_token:
+            self._leases_locais.pop(nome, None)
+        self._parar_heartbeat(nome, lease_token)
+        filtro = {"task_name": nome}
+        if lease_token is not None:
+            filtro["lease_token"] = lease_token
+        fim = datetime.now()
+        doc = self._colecao.find_one_and_update(
+            filtro,
+            {"$set": {"is_running": False, "end_time": fim, "erro_login": erro_login}},
+            projection=_CAMPOS_HISTORICO,
+            return_document=ReturnDocument.BEFORE
         )
+        if doc and doc.get("is_running"):
+            self._historico.registrar([_registro_historico(doc, fim, resultado or _resultado_execucao(doc, erro_login))])
+
+    def estatisticas(self, fila: str = None, horas: int = 24) -> dict:
+        """
+        Estatísticas de vazão das execuções finalizadas (ver `HistoricoTarefas.estatisticas`).
+
+        Args:
+            fila (str, optional): Família da fila (nome sem o número final). Default são todas.
+            horas (int): Tamanho da janela analisada, em horas.
+        """
+        return self._historico.estatisticas(fila, horas)
 
     def atualizar_designado(self, nome, designado=None):
         self._colecao.update_one({"task_name": nome}, {"$set": {'designado': designado}}, upsert=True)
@@ -287,27 +705,23 @@ class TarefasRepository:
             :param qtd:
             :param session_id:
             :param designado:
+            :return: O token de lease da execução iniciada.
         """
-        if (hora_fim is not None):
-            self._colecao.update_one({"task_name": nome},
-                                     {"$set": {"is_running": True, "erro_login": False, "force_stop": False, "start_time": datetime.now(), 'designado': designado, 'id_driver_session': session_id,
-                                               'amount': qtd,
-                                               "business_hours": True, "solicitante": solicitante, "scheduled_stop": {"start": datetime.now().strftime("%H:%M"), "stop": hora_fim}}},
-                                     upsert=True)
-        else:
-            self._colecao.update_one({"task_name": nome},
-                                     {"$set": {"is_running": True, "erro_login": False, "force_stop": False, "start_time": datetime.now(), 'designado': designado, 'id_driver_session': session_id,
-                                               'amount': qtd,
-                                               "business_hours": False, "solicitante": solicitante, "scheduled_stop": None}},
-                                     upsert=True)
+        campos = _campos_inicializacao(designado, session_id, qtd, hora_fim, solicitante)
+        campos["fila_familia"] = familia_da_fila(nome)
+        self._colecao.update_one({"task_name": nome}, {"$set": campos}, upsert=True)
+        self._leases_locais[nome] = campos["lease_token"]
+        self._iniciar_heartbeat(nome, campos["lease_token"])
+        self._reiniciar_controle(nome, campos)
+        return campos["lease_token"]
 
     def disponivel(self, nome):
         """
         Verifica se uma tarefa está disponível para ser executada.
 
-        Se uma tarefa estiver em execução e sua duração exceder `MAX_TASK_DURATION`,
-        a tarefa será marcada como finalizada. Caso contrário, uma exceção será levantada
-        se a tarefa ainda estiver em execução.
+        Se uma tarefa estiver em execução e seu lease estiver vencido (ou, sem lease, sua duração
+        exceder `MAX_TASK_DURATION`), a tarefa será marcada como finalizada. Caso contrário, uma
+        exceção será levantada se a tarefa ainda estiver em execução.
 
         Args:
             nome (str): O nome da tarefa a ser verificada.
@@ -317,17 +731,55 @@ class TarefasRepository:
         """
         task_status = self._colecao.find_one({"task_name": nome})
         if task_status and task_status.get("is_running"):
+            agora = datetime.now()
+            lease_until = task_status.get("lease_until")
             start_time = task_status.get("start_time")
-            if start_time and (datetime.now() - start_time) > MAX_TASK_DURATION:
-                # Marca a tarefa como finalizada se exceder o tempo máximo permitido.
-                self.finalizar_tarefa(nome)
+            if (lease_until and lease_until < agora) or (not lease_until and start_time and (agora - start_time) > MAX_TASK_DURATION):
+                # Marca a tarefa como finalizada se exceder o tempo máximo permitido (registrada como lease vencido).
+                self.finalizar_tarefa(nome, lease_token=task_status.get("lease_token"), resultado=RESULTADO_LEASE_EXPIRADO)
                 return True
             else:
                 # Lança exceção se a tarefa ainda estiver rodando.
                 raise HTTPException(status_code=409, detail="Existe um processo rodando em background!")
 
     def ativas(self, nome):
-        return self._colecao.find({"is_running": True, "task_name": {"$regex": nome, "$options": "i"}})
+        """Retorna as tarefas em execução da família de filas `nome` (ex.: "consulta" para consulta1..N)."""
+        return self._colecao.find({"is_running": True, **_filtro_familia(nome)})
+
+    def painel(self, familia: str) -> list[dict]:
+        """
+        Retorna o status, progresso, designado e horário de todas as filas de uma família em uma única consulta.
+
+        Args:
+            familia (str): Família das filas (nome sem o número final).
+
+        Returns:
+            list[dict]: As filas, ordenadas pelo número da fila.
+        """
+        filas = list(self._colecao.find(_filtro_familia(familia), _CAMPOS_PAINEL,
+                                        sort=[("ordem_fila", pymongo.ASCENDING), ("task_name", pymongo.ASCENDING)]))
+        for fila in filas:
+            pendente = self._progresso.obter(fila["task_name"])
+            if pendente is not None:
+                fila["progresso"] = pendente
+        return filas
+
+
+def escolher_fila_com_lease(nome_fila, hora_fim, quantidade_filas: int = 5) -> tuple[str, str]:
+    """
+    Reivindica atomicamente a primeira fila disponível entre `nome_fila1..N`.
+
+    Returns:
+        tuple[str, str]: O nome da fila reivindicada e o token de lease da execução.
+
+    Raises:
+        HTTPException: 409 se todas as filas estiverem em execução.
+    """
+    nomes = [nome_fila + str(i) for i in range(1, quantidade_filas + 1)]
+    reivindicada = TarefasRepository().reivindicar_fila(nomes, hora_fim=hora_fim)
+    if reivindicada is None:
+        raise HTTPException(status_code=409, detail="Todas as filas estão em execução.")
+    return reivindicada
 
 
 def escolher_fila_disponivel(nome_fila, hora_fim, quantidade_filas: int = 5) -> str:
@@ -335,26 +787,11 @@ def escolher_fila_disponivel(nome_fila, hora_fim, quantidade_filas: int = 5) ->
     Verifica as 4 (ou quantidade do parametro) filas definidas e retorna a primeira disponível.
     Se nenhuma fila estiver disponível, gera uma exceção HTTP 409.
     """
-    repositorio = TarefasRepository()
-    # Lista dos nomes de filas a serem verificados.
-    for i in range(1, quantidade_filas + 1):
-        task_name = nome_fila + str(i)
-        try:
-            repositorio.disponivel(task_name)
-            repositorio.inicializar_tarefa(task_name, hora_fim=hora_fim)
-            return task_name
-        except HTTPException:
-            # Se a fila estiver ocupada, passa para a próxima.
-            continue
-    # Se todas estiverem ocupadas, lança exceção.
-    raise HTTPException(status_code=409, detail="Todas as filas estão em execução.")
+    task_name, _ = escolher_fila_com_lease(nome_fila, hora_fim, quantidade_filas)
+    return task_name
 
 
 def escolher_fila(task_name, hora_fim) -> bool:
-    repositorio = TarefasRepository()
-    try:
-        repositorio.disponivel(task_name)
-        repositorio.inicializar_tarefa(task_name, hora_fim=hora_fim)
-        return True
-    except HTTPException:
+    if TarefasRepository().reivindicar_fila([task_name], hora_fim=hora_fim) is None:
         raise HTTPException(status_code=409, detail="Todas as filas estão em execução.")
+    return True
@@ -0,0 +1,436 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pymongo
+from fastapi import HTTPException
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+
+from app.repository.mongo_client import obter_cliente_async
+from app.repository.tarefas_historico import RESULTADO_LEASE_EXPIRADO, pipeline_estatisticas
+from app.repository.tarefas_progresso import PROGRESSO_FLUSH_ITENS, PROGRESSO_FLUSH_SEGUNDOS
+from app.repository.tarefas_repository import (INDICES_TAREFAS, LEASE_DURATION, MAX_TASK_DURATION, _CAMPOS_HISTORICO, _CAMPOS_PAINEL, _campos_inicializacao,
+                                               _filtro_familia, _filtro_fila_livre, _ordem_da_fila, _registro_historico,
+                                               _resultado_execucao, familia_da_fila)
+from app.utils.agenda import compilar_janela
+
+# Tempo, em segundos, em que o painel de uma família é reaproveitado entre requisições.
+PAINEL_CACHE_SEGUNDOS = float(os.getenv("PAINEL_CACHE_SEGUNDOS", 2))
+# Famílias mantidas no cache do painel (a família vem da URL).
+PAINEL_CACHE_MAX = int(os.getenv("PAINEL_CACHE_MAX", 256))
+
+
+class AsyncTarefasRepository:
+    """
+    Versão assíncrona do `TarefasRepository`, para uso em endpoints `async def`.
+
+    Usa o `AsyncMongoClient` do pymongo, então nenhuma operação bloqueia o event loop. Os documentos,
+    leases, histórico e regras de reivindicação são os mesmos do repositório síncrono, e as duas
+    versões podem ser usadas ao mesmo tempo sobre a mesma coleção.
+
+    O desligamento é feito pelo lifespan da aplicação (`encerrar`), que grava o progresso pendente e
+    interrompe apenas as tarefas reivindicadas por este processo.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(AsyncTarefasRepository, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        """Inicializa uma instância de `AsyncTarefasRepository` sobre o cliente assíncrono do processo."""
+        self._db = obter_cliente_async()
+        self._banco = self._db[os.getenv('MONGO_DB_NAME')]
+        self._colecao = self._banco["core_security.tarefas"]
+        self._historico = self._banco["core_security.tarefas_historico"]
+        self._filas_conhecidas: set[str] = set()
+        self._leases_locais: dict[str, str] = {}
+        # Renovação dos leases reivindicados por este processo (nome -> (token, task do heartbeat)).
+        self._heartbeats: dict[str, tuple[str, asyncio.Task]] = {}
+        self._progresso_pendente: dict[str, dict] = {}
+        self._contagem_progresso: dict[str, int] = {}
+        self._tarefa_flush: asyncio.Task | None = None
+        self._indices_criados = False
+        self._painel_cache: dict[str, tuple[float, asyncio.Future]] = {}
+        self._initialized = True
+
+    async def _garantir_indices(self):
+        """
+        Cria os índices de `INDICES_TAREFAS`, uma vez por processo.
+
+        A sincronização completa (diagnóstico de filas duplicadas) é feita pelo
+        repositório síncrono; aqui uma falha apenas é registrada no log.
+        """
+        if not self._indices_criados:
+            try:
+                await self._colecao.create_indexes(INDICES_TAREFAS)
+            except OperationFailure as e:
+                logging.error("Erro ao criar os índices das tarefas: %s", e)
+            self._indices_criados = True
+
+    async def _garantir_filas(self, nomes: list[str]):
+        """Garante um documento para cada fila candidata (ver `TarefasRepository._garantir_filas`)."""
+        await self._garantir_indices()
+        novas = [nome for nome in nomes if nome not in self._filas_conhecidas]
+        if not novas:
+            return
+        operacoes = [UpdateOne({"task_name": nome},
+                               {"$set": {"ordem_fila": _ordem_da_fila(nome), "fila_familia": familia_da_fila(nome)}, "$setOnInsert": {"is_running": False}},
+                               upsert=True)
+                     for nome in novas]
+        try:
+            await self._colecao.bulk_write(operacoes, ordered=False)
+        except BulkWriteError as e:
+            if any(erro.get("code") != 11000 for erro in e.details.get("writeErrors", [])):
+                raise
+        self._filas_conhecidas.update(novas)
+
+    async def reivindicar_fila(self, nomes: list[str], designado=None, session_id=None, qtd=None, hora_fim=None, solicitante=None) -> tuple[str, str] | None:
+        """
+        Reivindica atomicamente a primeira fila livre entre as candidatas.
+
+        Args:
+            nomes (list[str]): Nomes (task_name) das filas candidatas, em ordem de preferência.
+
+        Returns:
+            tuple[str, str] | None: O nome da fila reivindicada e o token de lease, ou None se todas estiverem ocupadas.
+        """
+        for tentativa in range(2):
+            await self._garantir_filas(nomes)
+            campos = _campos_inicializacao(designado, session_id, qtd, hora_fim, solicitante)
+            doc = await self._colecao.find_one_and_update(
+                {"task_name": {"$in": nomes}, **_filtro_fila_livre(campos["start_time"])},
+                {"$set": campos},
+                sort=[("ordem_fila", pymongo.ASCENDING), ("task_name", pymongo.ASCENDING)],
+                projection={"task_name": True},
+                return_document=ReturnDocument.AFTER
+            )
+            if doc is not None:
+                self._leases_locais[doc["task_name"]] = campos["lease_token"]
+                self._iniciar_heartbeat(doc["task_name"], campos["lease_token"])
+                return doc["task_name"], campos["lease_token"]
+            if tentativa or await self._colecao.count_documents({"task_name": {"$in": nomes}}) == len(nomes):
+                return None
+            # Alguma fila foi removida pela manutenção depois de entrar no cache: recria e tenta de novo (uma vez).
+            self._filas_conhecidas.difference_update(nomes)
+        return None
+
+    async def inicializar_tarefa(self, nome, designado=None, session_id=None, qtd=None, hora_fim=None, solicitante=None) -> str:
+        """
+        Inicializa uma tarefa marcando-a como em execução.
+
+        Returns:
+            str: O token de lease da execução iniciada.
+        """
+        campos = _campos_inicializacao(designado, session_id, qtd, hora_fim, solicitante)
+        campos["fila_familia"] = familia_da_fila(nome)
+        await self._colecao.update_one({"task_name": nome}, {"$set": campos}, upsert=True)
+        self._leases_locais[nome] = campos["lease_token"]
+        self._iniciar_heartbeat(nome, campos["lease_token"])
+        return campos["lease_token"]
+
+    def _iniciar_heartbeat(self, nome: str, lease_token: str):
+        """Renova o lease reivindicado em segundo plano (ver `HeartbeatTarefa`), substituindo o de uma execução anterior."""
+        self._parar_heartbeat(nome)
+        self._heartbeats[nome] = (lease_token, asyncio.create_task(self._renovar_periodicamente(nome, lease_token)))
+
+    def _parar_heartbeat(self, nome: str, lease_token: str = None):
+        """Interrompe a renovação do lease da fila (apenas o do token informado, se houver)."""
+        atual = self._heartbeats.get(nome)
+        if atual is not None and (lease_token is None or atual[0] == lease_token):
+            del self._heartbeats[nome]
+            atual[1].cancel()
+
+    async def _renovar_periodicamente(self, nome: str, lease_token: str):
+        limite = time.monotonic() + MAX_TASK_DURATION.total_seconds()
+        while time.monotonic() < limite:
+            try:
+                if not await self.renovar_lease(nome, lease_token):
+                    logging.warning("Lease da tarefa %s perdido; heartbeat encerrado.", nome)
+                    break
+            except PyMongoError as e:
+                logging.error("Erro ao renovar o lease da tarefa %s: %s", nome, e)
+            await asyncio.sleep(LEASE_DURATION.total_seconds() / 3)
+        else:
+            logging.warning("Tarefa %s passou de %s; lease não será mais renovado.", nome, MAX_TASK_DURATION)
+        if self._heartbeats.get(nome, (None,))[0] == lease_token:
+            del self._heartbeats[nome]
+
+    async def renovar_lease(self, nome: str, lease_token: str) -> bool:
+        """
+        Renova o lease de uma tarefa em execução por mais `LEASE_DURATION`.
+
+        Returns:
+            bool: False se a tarefa não estiver mais em execução com este token (lease perdido).
+        """
+        agora = datetime.now()
+        result = await self._colecao.update_one(
+            {"task_name": nome, "lease_token": lease_token, "is_running": True},
+            {"$set": {"lease_until": agora + LEASE_DURATION, "heartbeat": agora}}
+        )
+        return result.matched_count > 0
+
+    async def finalizar_tarefa(self, nome, erro_login: bool = False, lease_token: str = None, resultado: str = None):
+        """
+        Finaliza uma tarefa e adiciona a execução ao histórico (ver `TarefasRepository.finalizar_tarefa`).
+
+        Args:
+            nome (str): O nome da tarefa a ser finalizada.
+            erro_login (bool): Se a execução terminou por erro de login.
+            lease_token (str, optional): Se informado, só finaliza se a fila ainda pertencer a este lease.
+            resultado (str, optional): Resultado gravado no histórico.
+        """
+        await self.flush_progresso(nome)
+        if lease_token is None or self._leases_locais.get(nome) == lease_token:
+            self._leases_locais.pop(nome, None)
+        self._parar_heartbeat(nome, lease_token)
+        filtro = {"task_name": nome}
+        if lease_token is not None:
+            filtro["lease_token"] = lease_token
+        fim = datetime.now()
+        doc = await self._colecao.find_one_and_update(
+            filtro,
+            {"$set": {"is_running": False, "end_time": fim, "erro_login": erro_login}},
+            projection=_CAMPOS_HISTORICO,
+            return_document=ReturnDocument.BEFORE
+        )
+        if doc and doc.get("is_running"):
+            await self._registrar_historico([_registro_historico(doc, fim, resultado or _resultado_execucao(doc, erro_login))])
+
+    async def _registrar_historico(self, registros: list[dict]):
+        if not registros:
+            return
+        try:
+            await self._historico.insert_many(registros, ordered=False)
+        except PyMongoError as e:
+            logging.error("Erro ao gravar o histórico das tarefas %s: %s", [r.get("task_name") for r in registros], e)
+
+    async def disponivel(self, nome):
+        """
+        Verifica se uma tarefa está disponível para ser executada (ver `TarefasRepository.disponivel`).
+
+        Raises:
+            HTTPException: Se a tarefa estiver em execução e dentro da duração permitida.
+        """
+        task_status = await self._colecao.find_one({"task_name": nome})
+        if task_status and task_status.get("is_running"):
+            agora = datetime.now()
+            lease_until = task_status.get("lease_until")
+            start_time = task_status.get("start_time")
+            if (lease_until and lease_until < agora) or (not lease_until and start_time and (agora - start_time) > MAX_TASK_DURATION):
+                await self.finalizar_tarefa(nome, lease_token=task_status.get("lease_token"), resultado=RESULTADO_LEASE_EXPIRADO)
+                return True
+            else:
+                raise HTTPException(status_code=409, detail="Existe um processo rodando em background!")
+
+    async def verificar_em_execucao(self, nome: str) -> bool:
+        """Verifica se a tarefa está em execução"""
+        doc = await self._colecao.find_one({"task_name": nome}, {"is_running": True})
+        return bool(doc and doc.get("is_running", False))
+
+    async def tarefa_recente_concluida(self, nome: str, horas: int = 1) -> bool:
+        """Verifica se a tarefa foi concluída recentemente"""
+        threshold = datetime.now() - timedelta(hours=horas)
+        doc = await self._colecao.find_one({"task_name": nome, "is_running": False, "end_time": {"$gt": threshold}})
+        return doc is not None
+
+    async def designado_rodando_em_outra_fila(self, nome_atual: str, designado: str = None) -> bool:
+        """Verifica se o designado está rodando em outra fila diferente da atual."""
+        tarefa = await self._colecao.find_one({"designado": designado, "is_running": True, "task_name": {"$ne": nome_atual}})
+        return tarefa is not None
+
+    async def contar_filas_do_designado(self, designado: str) -> int:
+        """Retorna a quantidade de filas diferentes em que o designado está sendo usado."""
+        return len(await self._colecao.distinct("task_name", {"designado": designado, "is_running": True}))
+
+    async def ultimo_uso_usuario(self, usuario: str) -> datetime | None:
+        """Obtém a data e hora da última vez que o usuário foi utilizado em uma tarefa."""
+        tarefa = await self._colecao.find_one({"designado": usuario}, sort=[("start_time", pymongo.DESCENDING)])
+        return tarefa["start_time"] if tarefa else None
+
+    async def verificar_finalizado(self, nome: str) -> bool:
+        """
+        Verifica se a tarefa está no período de funcionamento ou se deve ser finalizada
+        (ver `TarefasRepository.verificar_finalizado`).
+
+        :raises ValueError: Se o documento não for encontrado.
+        """
+        doc = await self._colecao.find_one({"task_name": nome}, {"business_hours": True, "scheduled_stop": True, "force_stop": True})
+        if not doc:
+            raise ValueError(f"Tarefa '{nome}' não encontrada no banco de dados.")
+        if doc.get("business_hours") is not None:
+            schedule = doc.get("scheduled_stop")
+            if schedule:
+                return compilar_janela(schedule["start"], schedule["stop"]).esta_no_periodo()
+        return doc.get("force_stop", True)
+
+    async def solicitar_interrupcao(self, nome: str) -> bool:
+        """Solicita a interrupção de uma tarefa específica"""
+        result = await self._colecao.update_one({"task_name": nome}, {"$set": {"force_stop": True}})
+        return result.modified_count > 0
+
+    async def verificar_interrupcao(self, nome: str) -> bool:
+        """Verifica se há solicitação de interrupção para a tarefa"""
+        doc = await self._colecao.find_one({"task_name": nome}, {"force_stop": True})
+        return bool(doc and doc.get("force_stop", False))
+
+    async def atualizar_progresso(self, nome: str, progresso: dict):
+        """
+        Atualiza o progresso da tarefa.
+
+        Como no repositório síncrono, apenas o estado mais recente é gravado, a cada
+        `PROGRESSO_FLUSH_SEGUNDOS` ou `PROGRESSO_FLUSH_ITENS` atualizações.
+        """
+        self._progresso_pendente[nome] = progresso
+        self._contagem_progresso[nome] = self._contagem_progresso.get(nome, 0) + 1
+        if self._contagem_progresso[nome] >= PROGRESSO_FLUSH_ITENS:
+            await self.flush_progresso(nome)
+        elif self._tarefa_flush is None or self._tarefa_flush.done():
+            self._tarefa_flush = asyncio.create_task(self._flush_periodico())
+
+    async def _flush_periodico(self):
+        while self._progresso_pendente:
+            await asyncio.sleep(PROGRESSO_FLUSH_SEGUNDOS)
+            await self.flush_progresso()
+
+    async def flush_progresso(self, nome: str = None):
+        """
+        Grava o progresso pendente no banco.
+
+        Args:
+            nome (str, optional): Grava apenas esta tarefa. Se None, grava todas.
+        """
+        nomes = [nome] if nome is not None else list(self._progresso_pendente)
+        lote = {n: self._progresso_pendente.pop(n) for n in nomes if n in self._progresso_pendente}
+        for n in lote:
+            self._contagem_progresso.pop(n, None)
+        if not lote:
+            return
+        agora = datetime.now()
+        try:
+            await self._colecao.bulk_write([UpdateOne({"task_name": n}, {"$set": {"progresso": p, "progresso_em": agora}}) for n, p in lote.items()],
+                                           ordered=False)
+        except PyMongoError as e:
+            logging.error("Erro ao gravar o progresso das tarefas %s: %s", list(lote), e)
+            for n, p in lote.items():
+                self._progresso_pendente.setdefault(n, p)
+
+    async def obter_progresso(self, nome: str) -> Optional[dict]:
+        """Obtém o progresso atual da tarefa (o ainda não gravado deste processo tem prioridade)"""
+        if nome in self._progresso_pendente:
+            return self._progresso_pendente[nome]
+        doc = await self._colecao.find_one({"task_name": nome}, {"progresso": True})
+        return doc.get("progresso") if doc else None
+
+    async def ativas(self, nome) -> list[dict]:
+        """Retorna as tarefas em execução da família de filas `nome`."""
+        return await self._colecao.find({"is_running": True, **_filtro_familia(nome)}).to_list()
+
+    async def painel(self, familia: str) -> list[dict]:
+        """
+        Retorna o status, progresso, designado e horário de todas as filas de uma família (ver `TarefasRepository.painel`).
+
+        O resultado é reaproveitado por `PAINEL_CACHE_SEGUNDOS`, e requisições simultâneas para a mesma
+        família aguardam a mesma consulta, então muitos navegadores no mesmo painel geram no máximo uma
+        consulta por intervalo.
+
+        Args:
+            familia (str): Família das filas (nome sem o número final).
+
+        Returns:
+            list[dict]: As filas, ordenadas pelo número da fila.
+        """
+        agora = time.monotonic()
+        em_cache = self._painel_cache.get(familia)
+        if em_cache is not None and agora - em_cache[0] < PAINEL_CACHE_SEGUNDOS:
+            return await asyncio.shield(em_cache[1])
+        futuro = asyncio.ensure_future(self._consultar_painel(familia))
+        self._podar_painel_cache(agora)
+        self._painel_cache[familia] = (agora, futuro)
+        try:
+            return await asyncio.shield(futuro)
+        except Exception:
+            # Não mantém erros em cache (sem remover uma consulta mais nova de outra requisição).
+            em_cache = self._painel_cache.get(familia)
+            if em_cache is not None and em_cache[1] is futuro:
+                del self._painel_cache[familia]
+            raise
+
+    def _podar_painel_cache(self, agora: float):
+        """Remove as famílias vencidas do cache e, acima de `PAINEL_CACHE_MAX`, as mais antigas."""
+        for familia in [f for f, (momento, _) in self._painel_cache.items() if agora - momento >= PAINEL_CACHE_SEGUNDOS]:
+            del self._painel_cache[familia]
+        while len(self._painel_cache) >= PAINEL_CACHE_MAX:
+            # Quem já aguarda uma consulta removida mantém a referência ao futuro.
+            del self._painel_cache[next(iter(self._painel_cache))]
+
+    async def _consultar_painel(self, familia: str) -> list[dict]:
+        filas = await self._colecao.find(_filtro_familia(familia), _CAMPOS_PAINEL,
+                                         sort=[("ordem_fila", pymongo.ASCENDING), ("task_name", pymongo.ASCENDING)]).to_list()
+        for fila in filas:
+            if fila["task_name"] in self._progresso_pendente:
+                fila["progresso"] = self._progresso_pendente[fila["task_name"]]
+        return filas
+
+    async def estatisticas(self, fila: str = None, horas: int = 24) -> dict:
+        """
+        Estatísticas de vazão das execuções finalizadas (ver `pipeline_estatisticas`).
+        """
+        desde, pipeline = pipeline_estatisticas(fila, horas)
+        cursor = await self._historico.aggregate(pipeline)
+        resultado = await cursor.to_list()
+        return {"desde": desde, **(resultado[0] if resultado else {"filas": [], "por_hora": []})}
+
+    async def interromper_execucoes_locais(self) -> int:
+        """
+        Marca como interrompidas apenas as tarefas reivindicadas por este processo.
+
+        Returns:
+            int: A quantidade de tarefas interrompidas.
+        """
+        leases = dict(self._leases_locais)
+        self._leases_locais.clear()
+        for nome in list(self._heartbeats):
+            self._parar_heartbeat(nome)
+        if not leases:
+            return 0
+        filtro = {"$or": [{"task_name": nome, "lease_token": token} for nome, token in leases.items()], "is_running": True}
+        execucoes = await self._colecao.find(filtro, _CAMPOS_HISTORICO).to_list()
+        agora = datetime.now()
+        result = await self._colecao.update_many(filtro, {"$set": {"is_running": False, "end_time": agora, "force_stop": True}})
+        await self._registrar_historico([_registro_historico(doc, agora, "INTERROMPIDA") for doc in execucoes])
+        return result.modified_count
+
+    async def encerrar(self):
+        """
+        Grava o progresso pendente e interrompe as tarefas deste processo; chamada pelo lifespan.
+        """
+        if self._tarefa_flush is not None:
+            self._tarefa_flush.cancel()
+        try:
+            await self.flush_progresso()
+            interrompidas = await self.interromper_execucoes_locais()
+            if interrompidas:
+                logging.info("Desligamento: %s tarefa(s) assíncronas deste processo marcadas como interrompidas.", interrompidas)
+        except PyMongoError as e:
+            logging.error("Erro ao encerrar o repositório assíncrono de tarefas: %s", e)
+
+
+async def encerrar_repositorio_async():
+    """Encerra o `AsyncTarefasRepository` (se foi usado neste processo) e fecha o cliente assíncrono."""
+    from app.repository.mongo_client import desconectar_async
+
+    if AsyncTarefasRepository._instance is not None and AsyncTarefasRepository._instance._initialized:
+        await AsyncTarefasRepository._instance.encerrar()
+        AsyncTarefasRepository._instance = None
+    await desconectar_async()
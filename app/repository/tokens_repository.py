@@ -1,7 +1,7 @@
 import os
 
-import pymongo
-from app import host_mongo, APP_TITLE
+from app import APP_TITLE
+from app.repository.mongo_client import obter_cliente
 
 
 class TokensRepository:
@@ -19,7 +19,7 @@ class TokensRepository:
 
         Conecta-se ao banco de dados MongoDB e define a coleção de tokens.
         """
-        _db = pymongo.MongoClient(host_mongo)
+        _db = obter_cliente()
         self._banco = _db[os.getenv('MONGO_DB_NAME')]
         self._colecao = self._banco["tokens_api.tokens"]
 
@@ -22,5 +22,5 @@ class ExampleService:
         try:
             return self.atributo1
         except Exception as e:
-            logging.error(f"Erro xyz... ERRO: {e}")
+            logging.error("Erro xyz... ERRO: %s", e)
             raise e
@@ -0,0 +1,258 @@
+import logging
+import os
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable
+
+from fastapi import HTTPException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from app.page.selenium import SeleniumAbstract, iniciar_driver_local, iniciar_driver_prod
+from app.repository.tarefas_repository import TarefasRepository, escolher_fila_com_lease
+
+# Quantidade padrão de navegadores (e filas) usados por execução.
+EXECUTOR_PARALELO_DRIVERS = int(os.getenv("EXECUTOR_PARALELO_DRIVERS", 4))
+# Tentativas de um item antes de ser registrado como falha (um item interrompido pela queda do navegador é devolvido à fila).
+EXECUTOR_PARALELO_TENTATIVAS_ITEM = int(os.getenv("EXECUTOR_PARALELO_TENTATIVAS_ITEM", 2))
+# Vezes que um worker recria o navegador que morreu antes de desistir.
+EXECUTOR_PARALELO_REINICIOS_DRIVER = int(os.getenv("EXECUTOR_PARALELO_REINICIOS_DRIVER", 2))
+
+
+class ResultadoExecucao:
+    """
+    Resultado agregado de uma execução paralela.
+
+    Atributos:
+        resultados (dict[int, Any]): Retorno de `processar` por índice do item na lista original.
+        falhas (dict[int, str]): Erro de cada item que falhou em todas as tentativas.
+        pendentes (list[int]): Índices dos itens não processados (todos os workers pararam antes).
+        filas (list[str]): Filas reivindicadas pelos workers.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.resultados: dict[int, Any] = {}
+        self.falhas: dict[int, str] = {}
+        self.pendentes: list[int] = []
+        self.filas: list[str] = []
+        self.inicio = datetime.now()
+        self.fim: datetime | None = None
+
+    @property
+    def processados(self) -> int:
+        return len(self.resultados) + len(self.falhas)
+
+    def progresso(self) -> dict:
+        return {"total": self.total, "processados": self.processados, "sucesso": len(self.resultados),
+                "falhas": len(self.falhas), "filas": list(self.filas)}
+
+
+class _ItemTrabalho:
+    __slots__ = ("indice", "item", "tentativas")
+
+    def __init__(self, indice: int, item: Any):
+        self.indice = indice
+        self.item = item
+        self.tentativas = 0
+
+
+class ExecutorParalelo:
+    """
+    Distribui uma lista de itens entre N navegadores, cada um em uma thread com sua própria página
+    (`SeleniumAbstract`), sua sessão e sua fila (`nome_fila1..N`, reivindicada com lease).
+
+    Os itens ficam em uma fila compartilhada e cada worker pega o próximo assim que termina o
+    anterior, de modo que a carga se equilibra sozinha. Se o navegador de um worker morrer, o item
+    em andamento volta para a fila (até `tentativas_item` vezes) e o worker recria o navegador; se
+    não conseguir, encerra sua fila e os demais workers continuam com os itens restantes.
+
+    A quantidade de workers é limitada pelas filas livres: um worker que não consegue reivindicar
+    fila (todas em execução) não é iniciado. O progresso agregado é gravado em todas as filas da execução.
+
+    Exemplo:
+        executor = ExecutorParalelo(ConsultaPage, lambda pagina, cpf: pagina.consultar(cpf),
+                                    nome_fila="consulta", hora_fim=hora_fim, drivers=4)
+        resultado = executor.executar(cpfs)
+
+    Atributos:
+        nome_fila (str): Família das filas (`nome_fila1..N`).
+        drivers (int): Quantidade máxima de navegadores em paralelo.
+        tentativas_item (int): Tentativas de cada item.
+        reinicios_driver (int): Vezes que um worker recria o navegador.
+    """
+
+    def __init__(self, criar_pagina: Callable[[WebDriver], SeleniumAbstract], processar: Callable[[SeleniumAbstract, Any], Any],
+                 nome_fila: str, hora_fim=None, drivers: int = EXECUTOR_PARALELO_DRIVERS, quantidade_filas: int = None,
+                 driver_prod: bool = True, projeto: str = None, fabrica_driver: Callable[[], WebDriver] = None,
+                 tentativas_item: int = EXECUTOR_PARALELO_TENTATIVAS_ITEM, reinicios_driver: int = EXECUTOR_PARALELO_REINICIOS_DRIVER):
+        """
+        Args:
+            criar_pagina (Callable[[WebDriver], SeleniumAbstract]): Cria a página de um worker (ex.: a própria classe da página).
+            processar (Callable[[SeleniumAbstract, Any], Any]): Processa um item com a página do worker; o retorno vai para o resultado.
+            nome_fila (str): Família das filas (`nome_fila1..N`).
+            hora_fim (optional): Horário de término gravado nas filas.
+            drivers (int): Navegadores em paralelo. Default é `EXECUTOR_PARALELO_DRIVERS`.
+            quantidade_filas (int, optional): Filas da família. Default é `drivers`.
+            driver_prod (bool): True para sessões no Selenoid, False para Chrome local.
+            projeto (str, optional): Nome do projeto no Selenoid.
+            fabrica_driver (Callable[[], WebDriver], optional): Cria os navegadores. Default conforme `driver_prod`.
+            tentativas_item (int): Tentativas de cada item. Default é `EXECUTOR_PARALELO_TENTATIVAS_ITEM`.
+            reinicios_driver (int): Vezes que um worker recria o navegador. Default é `EXECUTOR_PARALELO_REINICIOS_DRIVER`.
+        """
+        self.criar_pagina = criar_pagina
+        self.processar = processar
+        self.nome_fila = nome_fila
+        self.hora_fim = hora_fim
+        self.drivers = max(1, drivers)
+        self.quantidade_filas = quantidade_filas or self.drivers
+        self.tentativas_item = max(1, tentativas_item)
+        self.reinicios_driver = reinicios_driver
+        if fabrica_driver is None:
+            fabrica_driver = (lambda: iniciar_driver_prod(projeto)) if driver_prod else iniciar_driver_local
+        self.fabrica_driver = fabrica_driver
+        self._repositorio = TarefasRepository()
+        self._lock = threading.Lock()
+        # Avisa os workers ociosos quando um item é devolvido ou o último em andamento termina.
+        self._mudou = threading.Condition(self._lock)
+        self._pendentes: deque[_ItemTrabalho] = deque()
+        self._em_andamento = 0
+        self._resultado: ResultadoExecucao | None = None
+
+    def executar(self, itens: list) -> ResultadoExecucao:
+        """
+        Processa os itens em paralelo e aguarda o término de todos os workers.
+
+        Args:
+            itens (list): Itens de trabalho.
+
+        Returns:
+            ResultadoExecucao: Resultados, falhas e itens não processados.
+
+        Raises:
+            HTTPException: 409 se nenhuma fila estiver disponível.
+        """
+        self._resultado = resultado = ResultadoExecucao(len(itens))
+        self._pendentes = deque(_ItemTrabalho(indice, item) for indice, item in enumerate(itens))
+        self._em_andamento = 0
+        if not itens:
+            resultado.fim = datetime.now()
+            return resultado
+
+        leases = self._reivindicar_filas(min(self.drivers, len(itens)))
+        resultado.filas = [nome for nome, _ in leases]
+        logging.info("Execução paralela de %s itens em %s navegador(es): %s", len(itens), len(leases), ", ".join(resultado.filas))
+        with ThreadPoolExecutor(len(leases), thread_name_prefix=f"executor-{self.nome_fila}") as executor:
+            for futuro in [executor.submit(self._worker, nome, token) for nome, token in leases]:
+                futuro.result()
+
+        resultado.pendentes = sorted(trabalho.indice for trabalho in self._pendentes)
+        resultado.fim = datetime.now()
+        logging.info("Execução paralela finalizada: %s", resultado.progresso())
+        return resultado
+
+    def _reivindicar_filas(self, quantidade: int) -> list[tuple[str, str]]:
+        leases = []
+        for _ in range(quantidade):
+            try:
+                leases.append(escolher_fila_com_lease(self.nome_fila, self.hora_fim, self.quantidade_filas))
+            except HTTPException:
+                break
+        if not leases:
+            raise HTTPException(status_code=409, detail="Todas as filas estão em execução.")
+        return leases
+
+    def _proximo(self) -> _ItemTrabalho | None:
+        """
+        Retorna o próximo item, aguardando enquanto outros workers ainda podem devolver itens à fila.
+
+        Retirar o item e contá-lo como em andamento é atômico: um worker só encerra quando não há itens
+        pendentes nem em andamento (que poderiam ser devolvidos).
+        """
+        with self._mudou:
+            while True:
+                if self._pendentes:
+                    self._em_andamento += 1
+                    return self._pendentes.popleft()
+                if self._em_andamento == 0:
+                    return None
+                self._mudou.wait()
+
+    def _concluir(self, trabalho: _ItemTrabalho, retorno: Any = None, erro: str = None, devolver: bool = False):
+        with self._mudou:
+            if devolver:
+                self._pendentes.append(trabalho)
+            elif erro is not None:
+                self._resultado.falhas[trabalho.indice] = erro
+            else:
+                self._resultado.resultados[trabalho.indice] = retorno
+            self._em_andamento -= 1
+            self._mudou.notify_all()
+            progresso = self._resultado.progresso()
+        for nome in self._resultado.filas:
+            self._repositorio.atualizar_progresso(nome, progresso)
+
+    def _worker(self, nome: str, token: str):
+        reinicios = 0
+        motivo = None
+        driver = None
+        try:
+            # Heartbeat iniciado pelo repositório na reivindicação da fila.
+            heartbeat = self._repositorio.heartbeat(nome)
+            while not heartbeat.perdido and not self._repositorio.verificar_interrupcao(nome):
+                trabalho = self._proximo()
+                if trabalho is None:
+                    break
+                if driver is None:
+                    # O navegador só é criado quando há trabalho (uma lista vazia não abre sessões).
+                    try:
+                        driver = self.fabrica_driver()
+                        pagina = self.criar_pagina(driver)
+                    except Exception as e:
+                        self._concluir(trabalho, devolver=True)
+                        self._encerrar_driver(driver)
+                        driver = None
+                        motivo = f"Falha ao iniciar o navegador: {e}"
+                        logging.error("Fila %s: %s", nome, motivo)
+                        break
+                trabalho.tentativas += 1
+                try:
+                    self._concluir(trabalho, retorno=self.processar(pagina, trabalho.item))
+                except Exception as e:
+                    morto = isinstance(e, WebDriverException) and not self._driver_vivo(driver)
+                    ultima = trabalho.tentativas >= self.tentativas_item
+                    logging.error("Fila %s: erro no item %s (tentativa %s/%s): %s", nome, trabalho.indice,
+                                  trabalho.tentativas, self.tentativas_item, e)
+                    self._concluir(trabalho, erro=None if morto and not ultima else traceback.format_exc(limit=3),
+                                   devolver=morto and not ultima)
+                    if morto:
+                        self._encerrar_driver(driver)
+                        driver = None
+                        reinicios += 1
+                        if reinicios > self.reinicios_driver:
+                            motivo = "Navegador reiniciado mais vezes que o permitido."
+                            logging.error("Fila %s: %s Os itens restantes seguem nos demais navegadores.", nome, motivo)
+                            break
+                        logging.warning("Fila %s: navegador morreu; recriando (%s/%s).", nome, reinicios, self.reinicios_driver)
+        finally:
+            self._encerrar_driver(driver)
+            self._repositorio.finalizar_tarefa(nome, lease_token=token, resultado="FALHA_DRIVER" if motivo else None)
+
+    @staticmethod
+    def _driver_vivo(driver: WebDriver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _encerrar_driver(driver: WebDriver | None):
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.debug("Erro ao encerrar o navegador: %s", e)
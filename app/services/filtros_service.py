@@ -71,5 +71,5 @@ def busca_filtrado(filtros: ProcessoFiltroQuery):
             }
 
     except Exception as e:
-        logging.error(f'reportar_contatos_service[busca_filtrado]: {str(e)}')
+        logging.error('reportar_contatos_service[busca_filtrado]: %s', e)
         raise erro_400(f"Erro ao buscar registros: {str(e)}")
\ No newline at end of file
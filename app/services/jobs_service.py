@@ -0,0 +1,241 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.data.enums.status_job import StatusJob
+from app.repository.jobs_repository import JOBS_LEASE, JobsRepository
+from app.utils.periodico import ExecutorPeriodico
+
+# Quantidade de jobs executados em paralelo pelo pool do processo (0 desativa o pool na API).
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", 0))
+# "thread" (automação Selenium/IO) ou "processo" (jobs que usam CPU).
+JOBS_MODO = os.getenv("JOBS_MODO", "thread")
+# Execuções simultâneas permitidas por designado, somando jobs e filas de tarefas (vazio = sem limite).
+JOBS_LIMITE_POR_DESIGNADO = int(os.getenv("JOBS_LIMITE_POR_DESIGNADO")) if os.getenv("JOBS_LIMITE_POR_DESIGNADO") else None
+# Espera entre buscas quando a fila está vazia, em segundos.
+JOBS_OCIOSO_SEGUNDOS = float(os.getenv("JOBS_OCIOSO_SEGUNDOS", 2))
+# Tempo máximo que o encerramento do pool aguarda os jobs em execução, em segundos.
+JOBS_PARADA_TIMEOUT_SEGUNDOS = float(os.getenv("JOBS_PARADA_TIMEOUT_SEGUNDOS", 30))
+
+_handlers: dict[str, Callable[[dict], Any]] = {}
+_pool: "PoolJobs | None" = None
+
+
+def registrar_handler(tipo: str):
+    """
+    Decorator que registra a função que executa os jobs de um tipo.
+
+    O handler recebe o payload do job e seu retorno é gravado em `resultado`. Uma exceção conta como
+    falha da tentativa. No modo "processo" o handler deve ser uma função de módulo (serializável).
+
+    Exemplo:
+        @registrar_handler("consulta_processos")
+        def consultar(payload: dict):
+            ...
+
+    Args:
+        tipo (str): Tipo do job.
+    """
+    def decorator(funcao: Callable[[dict], Any]):
+        _handlers[tipo] = funcao
+        return funcao
+    return decorator
+
+
+def _inicializar_processo():
+    """
+    Reabre a conexão do MongoDB em cada processo do pool: o MongoClient herdado do fork não é seguro
+    (mesmo tratamento do `post_fork` do gunicorn).
+    """
+    from app.repository.mongo_client import conectar, desconectar
+
+    desconectar()
+    conectar()
+
+
+def enfileirar(tipo: str, payload: dict = None, **kwargs):
+    """Atalho para `JobsRepository().enfileirar`."""
+    return JobsRepository().enfileirar(tipo, payload, **kwargs)
+
+
+class PoolJobs:
+    """
+    Pool de workers que consome a fila de jobs do MongoDB.
+
+    Uma thread de despacho reivindica jobs enquanto houver vagas no executor (threads ou processos),
+    e uma rotina periódica renova o lease dos jobs em execução e devolve à fila os jobs de workers
+    que morreram. Vários pools, em processos ou máquinas diferentes, podem consumir a mesma fila.
+
+    Atributos:
+        max_workers (int): Jobs executados em paralelo.
+        tipos (list[str] | None): Tipos de job consumidos. None consome todos os tipos registrados.
+        limite_por_designado (int | None): Execuções simultâneas permitidas por designado.
+    """
+
+    def __init__(self, max_workers: int = None, processos: bool = None, tipos: list[str] = None,
+                 limite_por_designado: int = None):
+        """
+        Args:
+            max_workers (int, optional): Jobs em paralelo. Default é `JOBS_WORKERS` (ou a quantidade de CPUs).
+            processos (bool, optional): Se True, usa `ProcessPoolExecutor`. Default conforme `JOBS_MODO`.
+            tipos (list[str], optional): Tipos de job consumidos (apenas os que têm handler registrado são
+                reivindicados). Default são os tipos com handler registrado.
+            limite_por_designado (int, optional): Default é `JOBS_LIMITE_POR_DESIGNADO`.
+        """
+        self.max_workers = max_workers or JOBS_WORKERS or os.cpu_count() or 1
+        self.processos = JOBS_MODO == "processo" if processos is None else processos
+        self.tipos = tipos
+        self.limite_por_designado = limite_por_designado if limite_por_designado is not None else JOBS_LIMITE_POR_DESIGNADO
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._repositorio = JobsRepository()
+        self._executor: Executor | None = None
+        self._em_execucao: dict = {}
+        self._vaga = threading.Condition()
+        self._parar = threading.Event()
+        self._despacho: threading.Thread | None = None
+        self._manutencao = ExecutorPeriodico("leases-jobs", JOBS_LEASE.total_seconds() / 3, self._renovar_leases)
+
+    @property
+    def ativo(self) -> bool:
+        return self._despacho is not None and self._despacho.is_alive()
+
+    def iniciar(self):
+        """Cria o executor e inicia o despacho e a renovação de leases."""
+        if self.ativo:
+            return
+        self._parar.clear()
+        self._executor = ProcessPoolExecutor(self.max_workers, initializer=_inicializar_processo) if self.processos else \
+            ThreadPoolExecutor(self.max_workers, thread_name_prefix="job")
+        self._despacho = threading.Thread(target=self._loop, name="despacho-jobs", daemon=True)
+        self._despacho.start()
+        self._manutencao.iniciar()
+
+    def parar(self, aguardar: bool = True, timeout: float = JOBS_PARADA_TIMEOUT_SEGUNDOS):
+        """
+        Interrompe o despacho de novos jobs.
+
+        Args:
+            aguardar (bool): Se True, aguarda os jobs em execução terminarem, por até `timeout` segundos.
+            timeout (float): Tempo máximo de espera. Default é `JOBS_PARADA_TIMEOUT_SEGUNDOS`.
+
+        Os jobs que não terminarem a tempo deixam de ter o lease renovado e voltam para a fila quando ele vencer.
+        """
+        self._parar.set()
+        with self._vaga:
+            self._vaga.notify_all()
+        if self._despacho is not None:
+            self._despacho.join()
+            self._despacho = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if aguardar:
+            with self._vaga:
+                if not self._vaga.wait_for(lambda: not self._em_execucao, timeout):
+                    logging.warning("%s job(s) ainda em execução após %ss; voltarão para a fila quando o lease vencer.",
+                                    len(self._em_execucao), timeout)
+        self._manutencao.parar()
+
+    def _tipos_reivindicados(self) -> list[str]:
+        """Tipos que este pool pode executar: os informados (ou todos os registrados) que têm handler."""
+        return [tipo for tipo in (self.tipos if self.tipos is not None else list(_handlers)) if tipo in _handlers]
+
+    def _loop(self):
+        while not self._parar.is_set():
+            with self._vaga:
+                while len(self._em_execucao) >= self.max_workers and not self._parar.is_set():
+                    self._vaga.wait()
+            if self._parar.is_set():
+                return
+            tipos = self._tipos_reivindicados()
+            if not tipos:
+                # Sem handlers registrados neste processo: os jobs pertencem a outros pools.
+                self._parar.wait(JOBS_OCIOSO_SEGUNDOS)
+                continue
+            try:
+                job = self._repositorio.reivindicar(tipos, self.worker, self.limite_por_designado)
+            except Exception:
+                logging.exception("Erro ao reivindicar job")
+                job = None
+            if job is None:
+                self._parar.wait(JOBS_OCIOSO_SEGUNDOS)
+                continue
+            self._despachar(job)
+
+    def _despachar(self, job: dict):
+        handler = _handlers.get(job["tipo"])
+        if handler is None:
+            # Só ocorre se o handler foi removido entre a reivindicação e o despacho.
+            self._repositorio.falhar(job, f"Nenhum handler registrado para o tipo '{job['tipo']}'.")
+            return
+        with self._vaga:
+            self._em_execucao[job["_id"]] = job
+        logging.info("Executando job %s (%s), tentativa %s.", job["_id"], job["tipo"], job["tentativas"])
+        try:
+            futuro = self._executor.submit(handler, job["payload"])
+        except RuntimeError as e:
+            # Executor encerrado durante o despacho; o job volta para a fila.
+            self._finalizar(job, erro=str(e))
+            return
+        futuro.add_done_callback(lambda f: self._ao_terminar(job, f))
+
+    def _ao_terminar(self, job: dict, futuro: Future):
+        if futuro.cancelled():
+            self._finalizar(job, erro="Cancelado no encerramento do pool")
+            return
+        erro = futuro.exception()
+        if erro is None:
+            self._finalizar(job, resultado=futuro.result())
+        else:
+            self._finalizar(job, erro="".join(traceback.format_exception(erro)).strip())
+
+    def _finalizar(self, job: dict, resultado=None, erro: str = None):
+        try:
+            if erro is None:
+                if not self._repositorio.concluir(job["_id"], job["lease_token"], resultado):
+                    logging.warning("Job %s concluído após perder o lease.", job["_id"])
+            else:
+                status = self._repositorio.falhar(job, erro)
+                logging.warning("Job %s (%s) falhou na tentativa %s: %s", job["_id"], job["tipo"], job["tentativas"],
+                                "nova tentativa agendada" if status is StatusJob.PENDENTE else status)
+        except Exception:
+            logging.exception("Erro ao registrar o término do job %s", job["_id"])
+        finally:
+            with self._vaga:
+                self._em_execucao.pop(job["_id"], None)
+                self._vaga.notify_all()
+
+    def _renovar_leases(self):
+        with self._vaga:
+            leases = {job_id: job["lease_token"] for job_id, job in self._em_execucao.items()}
+        for job_id in self._repositorio.renovar_leases(leases):
+            logging.warning("Lease do job %s perdido; o resultado desta execução será descartado.", job_id)
+        liberados = self._repositorio.liberar_leases_expirados()
+        if liberados:
+            logging.warning("%s job(s) com lease vencido devolvidos à fila.", liberados)
+
+
+def iniciar_pool_jobs() -> PoolJobs | None:
+    """
+    Inicia o pool de jobs do processo se `JOBS_WORKERS` for maior que zero.
+
+    Returns:
+        PoolJobs | None: O pool iniciado, ou None se estiver desativado.
+    """
+    global _pool
+    if JOBS_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = PoolJobs()
+    _pool.iniciar()
+    return _pool
+
+
+def parar_pool_jobs():
+    """Interrompe o pool de jobs do processo, aguardando os jobs em execução por até `JOBS_PARADA_TIMEOUT_SEGUNDOS`."""
+    if _pool is not None:
+        _pool.parar()
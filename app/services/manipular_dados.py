@@ -64,7 +64,7 @@ class Manipular_dados:
                 setor_doc = Setor.objects(nome_setor=setor).first()
 
             if setor and not setor_doc:
-                logging.error(f"Setor '{setor}' não encontrado.")
+                logging.error("Setor '%s' não encontrado.", setor)
                 return False
 
             self.log = Dados(
@@ -83,7 +83,7 @@ class Manipular_dados:
             return True  # novo documento criado
 
         except Exception as e:
-            logging.exception(f"Erro ao criar/atualizar registro: {e}")
+            logging.exception("Erro ao criar/atualizar registro: %s", e)
             return False
 
     def deletar_registro(self, id: str) -> bool:
@@ -92,8 +92,8 @@ class Manipular_dados:
             registro.delete()
             return True
         except DoesNotExist:
-            logging.warning(f"Registro com ID {id} não encontrado para exclusão.")
+            logging.warning("Registro com ID %s não encontrado para exclusão.", id)
             return False
         except Exception as e:
-            logging.exception(f"Erro ao excluir registro: {e}")
+            logging.exception("Erro ao excluir registro: %s", e)
             return False
@@ -0,0 +1,227 @@
+import io
+import logging
+import os
+import queue
+import threading
+import time
+
+from bson import ObjectId
+
+from app.utils.metricas import metricas
+
+# Backend do blob: "azure" (AzureBlob) ou "local" (BlobLocal, em disco).
+BLOB_BACKEND = os.getenv("BLOB_BACKEND", "azure")
+# Screenshots aguardando envio; com a fila cheia novas capturas são descartadas (a automação não espera).
+SCREENSHOT_FILA_MAX = int(os.getenv("SCREENSHOT_FILA_MAX", 100))
+# Tentativas de envio de cada screenshot e espera base entre elas (dobra a cada tentativa).
+SCREENSHOT_UPLOAD_TENTATIVAS = int(os.getenv("SCREENSHOT_UPLOAD_TENTATIVAS", 3))
+SCREENSHOT_UPLOAD_BACKOFF_SEGUNDOS = float(os.getenv("SCREENSHOT_UPLOAD_BACKOFF_SEGUNDOS", 2))
+# Formato do arquivo enviado: "png" (sem conversão), "jpeg" ou "webp" (requer Pillow).
+SCREENSHOT_FORMATO = os.getenv("SCREENSHOT_FORMATO", "png").lower()
+SCREENSHOT_QUALIDADE = int(os.getenv("SCREENSHOT_QUALIDADE", 70))
+# Tempo máximo de espera pelo envio dos screenshots pendentes no desligamento.
+SCREENSHOT_FLUSH_SEGUNDOS = float(os.getenv("SCREENSHOT_FLUSH_SEGUNDOS", 30))
+
+_uploader: "UploaderScreenshots | None" = None
+_lock_uploader = threading.Lock()
+
+
+def criar_blob(container_name: str):
+    """
+    Cria o cliente do blob conforme `BLOB_BACKEND`.
+
+    Args:
+        container_name (str): Nome do container.
+
+    Returns:
+        AzureBlob | BlobLocal: Cliente com `upload_file(nome, bytes)` e `connection_string`.
+    """
+    if BLOB_BACKEND == "local":
+        from app.data.api.blob_local import BlobLocal
+
+        return BlobLocal(container_name)
+    from app.data.api.api_blob_storage import AzureBlob
+
+    return AzureBlob(container_name=container_name)
+
+
+def converter_imagem(png: bytes, formato: str = SCREENSHOT_FORMATO, qualidade: int = SCREENSHOT_QUALIDADE) -> tuple[bytes, str]:
+    """
+    Converte o PNG capturado para um formato menor.
+
+    Args:
+        png (bytes): Imagem PNG.
+        formato (str): "png", "jpeg" ou "webp".
+        qualidade (int): Qualidade da compressão (1 a 100).
+
+    Returns:
+        tuple[bytes, str]: A imagem e sua extensão. Mantém o PNG se o formato for "png", se o Pillow
+        não estiver instalado ou se a conversão falhar.
+    """
+    if formato in ("png", ""):
+        return png, "png"
+    try:
+        from PIL import Image
+    except ImportError:
+        logging.debug("Pillow não instalado; screenshot enviado em PNG.")
+        return png, "png"
+    try:
+        with Image.open(io.BytesIO(png)) as imagem:
+            saida = io.BytesIO()
+            imagem.convert("RGB").save(saida, format=formato.upper(), quality=qualidade)
+        return saida.getvalue(), "jpg" if formato == "jpeg" else formato
+    except Exception as e:
+        logging.warning("Falha ao converter screenshot para %s; enviado em PNG: %s", formato, e)
+        return png, "png"
+
+
+class UploaderScreenshots:
+    """
+    Envia os screenshots de erro para o blob em uma thread de segundo plano.
+
+    A automação entrega os bytes e recebe na hora o `Arquivo`, já gravado com `status_upload`
+    "PENDENTE"; a conversão de formato e o envio (com novas tentativas) acontecem depois, fora do passo
+    que falhou, e o documento passa a "ENVIADO" (com nome, extensão e blob finais) ou "FALHOU" (com
+    `erro_upload`). A thread só altera o documento no banco, nunca a instância devolvida à automação.
+    A fila é limitada: se o blob estiver lento demais, novas capturas são descartadas.
+
+    Atributos:
+        container_name (str): Container dos screenshots.
+        tentativas (int): Tentativas de envio de cada screenshot.
+    """
+
+    def __init__(self, container_name: str = "screenshots", tamanho_fila: int = SCREENSHOT_FILA_MAX,
+                 tentativas: int = SCREENSHOT_UPLOAD_TENTATIVAS, blob=None):
+        """
+        Args:
+            container_name (str): Container dos screenshots. Default é "screenshots".
+            tamanho_fila (int): Screenshots aguardando envio. Default é `SCREENSHOT_FILA_MAX`.
+            tentativas (int): Tentativas de envio. Default é `SCREENSHOT_UPLOAD_TENTATIVAS`.
+            blob (optional): Cliente do blob. Default é criado por `criar_blob` no primeiro envio.
+        """
+        self.container_name = container_name
+        self.tentativas = max(1, tentativas)
+        self._blob = blob
+        self._fila: queue.Queue = queue.Queue(maxsize=max(1, tamanho_fila))
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def blob(self):
+        if self._blob is None:
+            self._blob = criar_blob(self.container_name)
+        return self._blob
+
+    def enviar(self, png: bytes, prefixo: str):
+        """
+        Grava o documento do screenshot como PENDENTE, agenda o envio e retorna imediatamente.
+
+        Args:
+            png (bytes): Imagem capturada.
+            prefixo (str): Início do nome do arquivo (ex.: projeto e horário).
+
+        Returns:
+            Arquivo | None: O documento do screenshot (atualizado no banco pelo envio); None se a fila estiver cheia.
+        """
+        from app.data.models.arquivo import Arquivo
+
+        if self._fila.full():
+            self._descartado(prefixo)
+            return None
+        arquivo = Arquivo(id=ObjectId(), nome_arquivo=f"{prefixo}.png", extensao="png", categoria="SCREENSHOT",
+                          blob_bucket_name=self.container_name, status_upload="PENDENTE")
+        arquivo.save(force_insert=True)
+        try:
+            self._fila.put_nowait((arquivo.id, png, prefixo))
+        except queue.Full:
+            # Outra thread ocupou a última vaga entre a verificação e a gravação.
+            arquivo.update(set__status_upload="FALHOU", set__erro_upload="Fila de envio cheia")
+            self._descartado(prefixo)
+            return None
+        self._iniciar()
+        return arquivo
+
+    def _descartado(self, prefixo: str):
+        metricas.incrementar("screenshots.descartados")
+        logging.warning("Fila de screenshots cheia (%s); screenshot %s descartado.", self._fila.maxsize, prefixo)
+
+    def descarregar(self, timeout: float = SCREENSHOT_FLUSH_SEGUNDOS) -> bool:
+        """
+        Aguarda o envio dos screenshots pendentes.
+
+        Args:
+            timeout (float): Tempo máximo de espera, em segundos.
+
+        Returns:
+            bool: True se todos foram processados dentro do tempo.
+        """
+        limite = time.monotonic() + timeout
+        while self._fila.unfinished_tasks:
+            if time.monotonic() >= limite:
+                logging.warning("%s screenshot(s) não enviados no desligamento.", self._fila.unfinished_tasks)
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _iniciar(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar, name="upload-screenshots", daemon=True)
+                self._thread.start()
+
+    def _executar(self):
+        while True:
+            arquivo_id, png, prefixo = self._fila.get()
+            try:
+                self._processar(arquivo_id, png, prefixo)
+            except Exception as e:
+                logging.error("Erro ao registrar o envio do screenshot %s: %s", prefixo, e)
+            finally:
+                self._fila.task_done()
+
+    def _processar(self, arquivo_id: ObjectId, png: bytes, prefixo: str):
+        from app.data.models.arquivo import Arquivo
+
+        # Referência própria da thread ao documento (só o id): a instância devolvida por `enviar` não é alterada.
+        arquivo = Arquivo(id=arquivo_id)
+        dados, extensao = converter_imagem(png)
+        nome = f"{prefixo}.{extensao}"
+        inicio = time.perf_counter()
+        try:
+            self._enviar_com_tentativas(nome, dados)
+        except Exception as e:
+            metricas.incrementar("screenshots.falhas")
+            logging.error("Erro ao enviar screenshot de erro para o blob: %s", e)
+            arquivo.update(set__status_upload="FALHOU", set__erro_upload=str(e)[:1000])
+            return
+        metricas.registrar_tempo("screenshots.upload", time.perf_counter() - inicio, formato=extensao)
+        arquivo.update(set__nome_arquivo=nome, set__extensao=extensao, set__blob_connection_string=self.blob.connection_string,
+                       set__status_upload="ENVIADO")
+        metricas.incrementar("screenshots.enviados")
+        logging.info("Screenshot de erro enviado para o blob com sucesso: %s (%s bytes)", nome, len(dados))
+
+    def _enviar_com_tentativas(self, nome: str, dados: bytes):
+        """Envia ao blob, com até `tentativas` tentativas e espera exponencial a partir de `SCREENSHOT_UPLOAD_BACKOFF_SEGUNDOS`."""
+        for tentativa in range(1, self.tentativas + 1):
+            try:
+                self.blob.upload_file(nome, dados)
+                return
+            except Exception as e:
+                if tentativa >= self.tentativas:
+                    raise
+                logging.warning("Falha ao enviar screenshot %s (tentativa %s/%s): %s", nome, tentativa, self.tentativas, e)
+                time.sleep(SCREENSHOT_UPLOAD_BACKOFF_SEGUNDOS * 2 ** (tentativa - 1))
+
+
+def obter_uploader_screenshots() -> UploaderScreenshots:
+    """Retorna o uploader de screenshots do processo, criando-o no primeiro uso."""
+    global _uploader
+    with _lock_uploader:
+        if _uploader is None:
+            _uploader = UploaderScreenshots()
+        return _uploader
+
+
+def descarregar_screenshots(timeout: float = SCREENSHOT_FLUSH_SEGUNDOS) -> bool:
+    """Aguarda o envio dos screenshots pendentes; chamada no desligamento da aplicação."""
+    return _uploader.descarregar(timeout) if _uploader is not None else True
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from typing import Callable
+
+
+class JanelaFuncionamento:
+    """
+    Janela diária de funcionamento ("HH:MM" a "HH:MM"), compilada uma única vez.
+
+    Janelas em que o início é maior que o fim cruzam a meia-noite (ex.: 19:30 a 07:30).
+    O horário de fim é inclusivo, como na verificação original de `verificar_finalizado`.
+
+    Atributos:
+        inicio (time): Horário de início.
+        fim (time): Horário de fim.
+    """
+
+    __slots__ = ("inicio", "fim")
+
+    def __init__(self, inicio: time, fim: time):
+        self.inicio = inicio
+        self.fim = fim
+
+    def __repr__(self):
+        return f"JanelaFuncionamento({self.inicio:%H:%M}-{self.fim:%H:%M})"
+
+    def esta_no_periodo(self, agora: datetime = None) -> bool:
+        """
+        Verifica se o horário informado (ou o atual) está dentro da janela.
+
+        Args:
+            agora (datetime, optional): Momento verificado. Default é o momento atual.
+
+        Returns:
+            bool: True se estiver no período, False caso contrário.
+        """
+        hora = (agora or datetime.now()).time()
+        # Se o período não cruza a meia-noite
+        if self.inicio < self.fim:
+            return self.inicio <= hora <= self.fim
+        # Período que cruza a meia-noite (ex: 19:30 a 07:30)
+        return hora >= self.inicio or hora <= self.fim
+
+    def proxima_transicao(self, agora: datetime = None) -> tuple[datetime, bool]:
+        """
+        Calcula o próximo momento em que a janela abre ou fecha.
+
+        Args:
+            agora (datetime, optional): Momento de referência. Default é o momento atual.
+
+        Returns:
+            tuple[datetime, bool]: O momento da transição e True se a janela abre nele (False se fecha).
+        """
+        agora = agora or datetime.now()
+        candidatos = []
+        for dias in (0, 1):
+            dia = agora.date() + timedelta(days=dias)
+            candidatos.append((datetime.combine(dia, self.inicio), True))
+            # O fim é inclusivo: a janela fecha logo depois do horário de parada.
+            candidatos.append((datetime.combine(dia, self.fim) + timedelta(microseconds=1), False))
+        return min((c for c in candidatos if c[0] > agora), key=lambda c: c[0])
+
+
+@lru_cache(maxsize=512)
+def compilar_janela(inicio: str, fim: str) -> JanelaFuncionamento:
+    """
+    Converte um schedule {"start": "HH:MM", "stop": "HH:MM"} em `JanelaFuncionamento`, com cache.
+
+    Args:
+        inicio (str): Horário de início no formato "HH:MM".
+        fim (str): Horário de fim no formato "HH:MM".
+
+    Returns:
+        JanelaFuncionamento: A janela compilada (a mesma instância para os mesmos horários).
+    """
+    return JanelaFuncionamento(datetime.strptime(inicio, "%H:%M").time(), datetime.strptime(fim, "%H:%M").time())
+
+
+class AgendadorParadas:
+    """
+    Agendador que dispara callbacks nas transições das janelas de funcionamento das filas.
+
+    Usa um heap de timers atendido por uma única thread, de modo que muitas filas seguem suas
+    janelas sem consultar o banco nem reprocessar horários.
+    """
+
+    def __init__(self):
+        self._heap: list = []
+        self._sequencia = itertools.count()
+        self._agendados: dict[str, tuple[int, JanelaFuncionamento]] = {}
+        self._condicao = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def seguir_janela(self, chave: str, janela: JanelaFuncionamento, callback: Callable[[str, bool], None]):
+        """
+        Agenda `callback(chave, dentro_da_janela)` para cada transição da janela, reagendando após cada disparo.
+
+        Chamar novamente com a mesma janela não altera o agendamento; com outra janela, substitui o anterior.
+
+        Args:
+            chave (str): Identificador do agendamento (ex.: nome da tarefa).
+            janela (JanelaFuncionamento): Janela seguida.
+            callback (Callable[[str, bool], None]): Função chamada com a chave e True quando a janela abre, False quando fecha.
+        """
+        with self._condicao:
+            atual = self._agendados.get(chave)
+            if atual is not None and atual[1] is janela:
+                return
+            self._agendar(chave, janela, callback)
+
+    def cancelar(self, chave: str):
+        """Cancela o agendamento da chave, se existir."""
+        with self._condicao:
+            self._agendados.pop(chave, None)
+
+    def _agendar(self, chave, janela, callback):
+        quando, abre = janela.proxima_transicao()
+        sequencia = next(self._sequencia)
+        self._agendados[chave] = (sequencia, janela)
+        heapq.heappush(self._heap, (quando, sequencia, chave, janela, callback, abre))
+        self._condicao.notify()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="agendador-paradas", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            with self._condicao:
+                while not self._heap or self._heap[0][0] > datetime.now():
+                    espera = (self._heap[0][0] - datetime.now()).total_seconds() if self._heap else None
+                    self._condicao.wait(espera)
+                _, sequencia, chave, janela, callback, abre = heapq.heappop(self._heap)
+                if self._agendados.get(chave, (None,))[0] != sequencia:
+                    # Agendamento cancelado ou substituído.
+                    continue
+                self._agendar(chave, janela, callback)
+            try:
+                callback(chave, abre)
+            except Exception:
+                logging.exception("Erro no callback de agenda da chave %s", chave)
+
+
+_agendador: AgendadorParadas | None = None
+_lock_agendador = threading.Lock()
+
+
+def obter_agendador() -> AgendadorParadas:
+    """Retorna o agendador de paradas compartilhado do processo."""
+    global _agendador
+    with _lock_agendador:
+        if _agendador is None:
+            _agendador = AgendadorParadas()
+        return _agendador
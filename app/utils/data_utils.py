@@ -53,7 +53,7 @@ class DataUtils:
                 return cpf.mask(digits_only)
             return None
         except Exception as e:
-            logging.error(f'Erro no método validate_cpf: {e}')
+            logging.error('Erro no método validate_cpf: %s', e)
             return None
 
     @staticmethod
@@ -114,7 +114,7 @@ class DataUtils:
                 return datetime.combine(input_date, datetime.min.time()).strftime("%d/%m/%Y %H:%M:%S")
             return None
         except (ValueError, TypeError) as e:
-            logging.error(f"Erro ao formatar data: {e}")
+            logging.error("Erro ao formatar data: %s", e)
             return None
 
     @staticmethod
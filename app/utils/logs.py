@@ -0,0 +1,184 @@
+import copy
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+# Identificador da requisição atual, propagado pelo contexto da task/thread que a atende.
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Atributos padrão de um LogRecord; o que não estiver aqui é tratado como campo extra.
+_CAMPOS_PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_listener: logging.handlers.QueueListener | None = None
+_handlers_originais: list[logging.Handler] = []
+
+
+class FiltroRequestId(logging.Filter):
+    """
+    Adiciona o `request_id` do contexto atual ao registro de log.
+
+    Deve rodar na thread que gerou o log (antes da fila), pois o contexto não atravessa a fila.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class FiltroAmostragem(logging.Filter):
+    """
+    Mantém apenas uma fração dos logs INFO/DEBUG de alto volume.
+
+    São amostrados os registros dos loggers informados e os registros com `extra={"amostrar": True}`.
+    A decisão é feita pelo `request_id` quando existir, para que todas as linhas de uma mesma
+    requisição sejam mantidas ou descartadas juntas.
+
+    Args:
+        taxa (float): Fração dos registros mantidos, entre 0 e 1.
+        loggers (tuple[str, ...]): Prefixos dos loggers amostrados.
+    """
+
+    def __init__(self, taxa: float, loggers: tuple[str, ...] = ()):
+        super().__init__()
+        self.taxa = max(0.0, min(1.0, taxa))
+        self.loggers = loggers
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.taxa >= 1.0 or record.levelno > logging.INFO:
+            return True
+        if not (getattr(record, "amostrar", False) or (self.loggers and record.name.startswith(self.loggers))):
+            return True
+        rid = getattr(record, "request_id", "-")
+        if rid != "-":
+            return zlib.crc32(rid.encode()) % 10000 < self.taxa * 10000
+        return random.random() < self.taxa
+
+
+class FormatadorJson(logging.Formatter):
+    """
+    Formata cada registro como uma linha JSON com data, nível, logger, mensagem, `request_id` e campos extras.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "thread": record.threadName,
+        }
+        for chave, valor in record.__dict__.items():
+            if chave not in _CAMPOS_PADRAO and not chave.startswith("_"):
+                dados[chave] = valor
+        if record.exc_info:
+            dados["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            dados["exception"] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class QueueHandlerEstruturado(logging.handlers.QueueHandler):
+    """
+    QueueHandler que preserva os campos extras do registro e nunca bloqueia quem loga.
+
+    A mensagem e o traceback são resolvidos na thread de origem; se a fila estiver cheia,
+    o registro é descartado e contabilizado em `descartados`.
+    """
+
+    def __init__(self, fila: queue.Queue):
+        super().__init__(fila)
+        self.descartados = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+def _handlers_padrao() -> list[logging.Handler]:
+    """
+    Handlers usados quando não existe `logging.json`: JSON lines no stdout e, se `LOG_ARQUIVO`
+    estiver definido, também em arquivo.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(FormatadorJson())
+    handlers: list[logging.Handler] = [handler]
+    if os.getenv("LOG_ARQUIVO"):
+        handler_arquivo = logging.handlers.WatchedFileHandler(os.getenv("LOG_ARQUIVO"), encoding="utf-8")
+        handler_arquivo.setFormatter(FormatadorJson())
+        handlers.append(handler_arquivo)
+    return handlers
+
+
+def iniciar_logging():
+    """
+    Configura o logging da aplicação com escrita em segundo plano.
+
+    Aplica o `logging.json` se existir (ou JSON lines no stdout), move os handlers do logger raiz
+    para um `QueueListener` e deixa no raiz apenas um `QueueHandler`, que adiciona o `request_id`
+    e aplica a amostragem antes de enfileirar.
+
+    Variáveis de ambiente:
+        LOG_LEVEL: Nível do logger raiz. Default é INFO.
+        LOG_FILA_TAMANHO: Capacidade da fila de logs. Default é 10000.
+        LOG_AMOSTRAGEM: Fração dos logs INFO de alto volume mantidos. Default é 1 (todos).
+        LOG_AMOSTRAGEM_LOGGERS: Loggers amostrados, separados por vírgula. Default é "app.requests".
+    """
+    global _listener, _handlers_originais
+    if _listener is not None:
+        return
+
+    raiz = logging.getLogger()
+    try:
+        if os.path.exists('logging.json'):
+            with open('logging.json', 'rt') as f:
+                logging.config.dictConfig(json.load(f))
+        else:
+            raiz.handlers = _handlers_padrao()
+            raiz.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    except Exception:
+        raiz.handlers = _handlers_padrao()
+        raiz.setLevel(logging.INFO)
+
+    fila = queue.Queue(maxsize=int(os.getenv("LOG_FILA_TAMANHO", 10000)))
+    handler_fila = QueueHandlerEstruturado(fila)
+    handler_fila.addFilter(FiltroRequestId())
+    loggers_amostrados = tuple(nome.strip() for nome in os.getenv("LOG_AMOSTRAGEM_LOGGERS", "app.requests").split(",") if nome.strip())
+    handler_fila.addFilter(FiltroAmostragem(float(os.getenv("LOG_AMOSTRAGEM", 1)), loggers_amostrados))
+
+    _handlers_originais = raiz.handlers[:]
+    raiz.handlers = [handler_fila]
+    _listener = logging.handlers.QueueListener(fila, *_handlers_originais, respect_handler_level=True)
+    _listener.start()
+
+
+def encerrar_logging():
+    """
+    Esvazia a fila de logs e devolve os handlers originais ao logger raiz.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    logging.getLogger().handlers = _handlers_originais[:]
@@ -0,0 +1,118 @@
+import threading
+from collections import deque
+
+
+class EstatisticaTempo:
+    """
+    Estatísticas de uma série de durações: contagem, soma, mínimo, máximo e percentis
+    sobre as últimas `amostras` medições.
+
+    Atributos:
+        contagem (int): Quantidade de medições.
+        total (float): Soma das durações, em segundos.
+        minimo (float | None): Menor duração.
+        maximo (float | None): Maior duração.
+    """
+
+    __slots__ = ("contagem", "total", "minimo", "maximo", "_recentes")
+
+    def __init__(self, amostras: int = 1024):
+        self.contagem = 0
+        self.total = 0.0
+        self.minimo: float | None = None
+        self.maximo: float | None = None
+        self._recentes: deque[float] = deque(maxlen=amostras)
+
+    def registrar(self, segundos: float):
+        self.contagem += 1
+        self.total += segundos
+        self.minimo = segundos if self.minimo is None else min(self.minimo, segundos)
+        self.maximo = segundos if self.maximo is None else max(self.maximo, segundos)
+        self._recentes.append(segundos)
+
+    def percentil(self, p: float) -> float | None:
+        """Percentil `p` (0 a 100) das medições recentes."""
+        if not self._recentes:
+            return None
+        ordenadas = sorted(self._recentes)
+        return ordenadas[min(len(ordenadas) - 1, int(p / 100 * len(ordenadas)))]
+
+    def resumo(self) -> dict:
+        return {
+            "contagem": self.contagem,
+            "total_segundos": round(self.total, 6),
+            "media_segundos": round(self.total / self.contagem, 6) if self.contagem else None,
+            "min_segundos": self.minimo,
+            "max_segundos": self.maximo,
+            "p50_segundos": self.percentil(50),
+            "p95_segundos": self.percentil(95),
+        }
+
+
+class RegistroMetricas:
+    """
+    Registro em memória de contadores e tempos do processo, agrupados por nome e rótulos.
+
+    Exemplo:
+        metricas.registrar_tempo("espera", 0.42, helper="_existe_id", resultado="ok")
+        metricas.incrementar("aquisicao.falhas", endpoint="selenoid-1")
+        metricas.resumo()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tempos: dict[tuple, EstatisticaTempo] = {}
+        self._contadores: dict[tuple, float] = {}
+
+    @staticmethod
+    def _chave(nome: str, rotulos: dict) -> tuple:
+        return (nome, tuple(sorted(rotulos.items())))
+
+    def registrar_tempo(self, nome: str, segundos: float, **rotulos):
+        """
+        Registra uma duração.
+
+        Args:
+            nome (str): Nome da métrica.
+            segundos (float): Duração medida.
+            **rotulos: Rótulos que separam a série (ex.: helper, resultado).
+        """
+        chave = self._chave(nome, rotulos)
+        with self._lock:
+            estatistica = self._tempos.get(chave)
+            if estatistica is None:
+                estatistica = self._tempos[chave] = EstatisticaTempo()
+            estatistica.registrar(segundos)
+
+    def incrementar(self, nome: str, valor: float = 1, **rotulos):
+        """Soma `valor` ao contador `nome` com os rótulos informados."""
+        chave = self._chave(nome, rotulos)
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def resumo(self, prefixo: str = "") -> dict:
+        """
+        Retorna os contadores e tempos registrados.
+
+        Args:
+            prefixo (str): Retorna apenas as métricas cujo nome começa com o prefixo.
+
+        Returns:
+            dict: `{"contadores": [...], "tempos": [...]}`, cada item com nome, rótulos e valores.
+        """
+        with self._lock:
+            contadores = [{"nome": nome, "rotulos": dict(rotulos), "valor": valor}
+                          for (nome, rotulos), valor in self._contadores.items() if nome.startswith(prefixo)]
+            tempos = [{"nome": nome, "rotulos": dict(rotulos), **estatistica.resumo()}
+                      for (nome, rotulos), estatistica in self._tempos.items() if nome.startswith(prefixo)]
+        return {"contadores": contadores, "tempos": tempos}
+
+    def limpar(self):
+        """Remove todas as métricas registradas."""
+        with self._lock:
+            self._tempos.clear()
+            self._contadores.clear()
+
+
+# Registro compartilhado do processo.
+metricas = RegistroMetricas()
@@ -0,0 +1,64 @@
+import logging
+import threading
+from typing import Callable
+
+
+class ExecutorPeriodico:
+    """
+    Executa uma função em intervalos regulares em uma thread daemon.
+
+    Erros da função são registrados no log e não interrompem as próximas execuções.
+
+    Atributos:
+        nome (str): Nome da rotina, usado na thread e nos logs.
+        intervalo (float): Intervalo entre execuções, em segundos.
+    """
+
+    def __init__(self, nome: str, intervalo: float, funcao: Callable[[], None], executar_ao_iniciar: bool = True):
+        """
+        Args:
+            nome (str): Nome da rotina.
+            intervalo (float): Intervalo entre execuções, em segundos.
+            funcao (Callable[[], None]): Função executada a cada intervalo.
+            executar_ao_iniciar (bool): Se True, executa a função logo ao iniciar. Default é True.
+        """
+        self.nome = nome
+        self.intervalo = intervalo
+        self._funcao = funcao
+        self._executar_ao_iniciar = executar_ao_iniciar
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def ativo(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self):
+        """Inicia a thread da rotina, se ainda não estiver rodando."""
+        if self.ativo:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.nome, daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout: float = None):
+        """
+        Sinaliza a parada e aguarda a thread terminar.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera, em segundos.
+        """
+        self._parar.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self):
+        if not self._executar_ao_iniciar and self._parar.wait(self.intervalo):
+            return
+        while not self._parar.is_set():
+            try:
+                self._funcao()
+            except Exception:
+                logging.exception("Erro na rotina periódica %s", self.nome)
+            self._parar.wait(self.intervalo)
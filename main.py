@@ -1,4 +1,106 @@
+import argparse
+import importlib.util
+import os
 
-if __name__ == "__main__":
+
+def _disponivel(modulo: str) -> bool:
+    """Indica se um módulo opcional (uvloop, httptools, gunicorn) está instalado."""
+    return importlib.util.find_spec(modulo) is not None
+
+
+LOOP = "uvloop" if _disponivel("uvloop") else "asyncio"
+HTTP = "httptools" if _disponivel("httptools") else "h11"
+GUNICORN = os.name == "posix" and _disponivel("gunicorn")
+
+if GUNICORN:
+    from uvicorn.workers import UvicornWorker
+
+    class WorkerUvicorn(UvicornWorker):
+        """Worker do gunicorn com uvloop/httptools quando instalados."""
+        CONFIG_KWARGS = {"loop": LOOP, "http": HTTP}
+
+
+def _configuracao_servidor() -> dict:
+    """
+    Lê a configuração do servidor de produção a partir das variáveis de ambiente.
+
+    Returns:
+        dict: Host, porta, quantidade de workers, keep-alive, backlog e event loop/protocolo HTTP.
+    """
+    return {
+        "host": os.getenv("HOST", "0.0.0.0"),
+        "port": int(os.getenv("PORT", 8000)),
+        "workers": int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        "keep_alive": int(os.getenv("KEEP_ALIVE", 5)),
+        "backlog": int(os.getenv("BACKLOG", 2048)),
+        "max_requests": int(os.getenv("MAX_REQUESTS", 0)),
+        "loop": LOOP,
+        "http": HTTP,
+    }
+
+
+def rodar_gunicorn(config: dict):
+    """
+    Sobe o gunicorn com workers uvicorn, carregando a aplicação antes do fork (preload).
+
+    O preload é seguro porque importar `app` não abre conexões: o pool do MongoDB é criado
+    no lifespan de cada worker, depois do fork.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    def post_fork(_server, _worker):
+        # Garante que nenhum pool aberto no processo master seja herdado pelo worker.
+        from app.repository.mongo_client import desconectar
+        desconectar()
+
+    class Servidor(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{config['host']}:{config['port']}")
+            self.cfg.set("workers", config["workers"])
+            self.cfg.set("worker_class", f"{__name__}.WorkerUvicorn")
+            self.cfg.set("keepalive", config["keep_alive"])
+            self.cfg.set("backlog", config["backlog"])
+            self.cfg.set("max_requests", config["max_requests"])
+            self.cfg.set("max_requests_jitter", config["max_requests"] // 10)
+            self.cfg.set("preload_app", True)
+            self.cfg.set("post_fork", post_fork)
+
+        def load(self):
+            from app import app
+            return app
+
+    Servidor().run()
+
+
+def rodar_uvicorn(config: dict):
+    """
+    Sobe o uvicorn com múltiplos workers (usado quando o gunicorn não está disponível, ex.: Windows).
+    """
     import uvicorn
-    uvicorn.run("app:app", port=8000, reload=True)
\ No newline at end of file
+
+    uvicorn.run("app:app", host=config["host"], port=config["port"], workers=config["workers"],
+                loop=config["loop"], http=config["http"], backlog=config["backlog"],
+                timeout_keep_alive=config["keep_alive"], limit_max_requests=config["max_requests"] or None,
+                proxy_headers=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor da API.")
+    parser.add_argument("--dev", action="store_true", default=os.getenv("APP_DEV", "").lower() in ("1", "true"),
+                        help="Modo desenvolvimento: um processo com reload automático (ou APP_DEV=true).")
+    args = parser.parse_args()
+
+    if args.dev:
+        import uvicorn
+        uvicorn.run("app:app", port=int(os.getenv("PORT", 8000)), reload=True)
+        return
+
+    config = _configuracao_servidor()
+    if GUNICORN:
+        rodar_gunicorn(config)
+    else:
+        rodar_uvicorn(config)
+
+
+if __name__ == "__main__":
+    main()
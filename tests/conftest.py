@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+# O FastAPI exige uma versão para montar o OpenAPI (importar `app` cria a aplicação).
+os.environ.setdefault("VERSION", "0.0.0")
+os.environ.setdefault("MONGO_DB_NAME", "testes")
+
+
+@pytest.fixture
+def mongo():
+    """Conexão padrão do mongoengine em um MongoDB em memória (mongomock)."""
+    mongomock = pytest.importorskip("mongomock")
+    from mongoengine import connect, disconnect
+
+    disconnect(alias="default")
+    cliente = connect(db=os.environ["MONGO_DB_NAME"], host="mongodb://localhost", mongo_client_class=mongomock.MongoClient)
+    yield cliente[os.environ["MONGO_DB_NAME"]]
+    disconnect(alias="default")
@@ -0,0 +1,67 @@
+import pytest
+
+from app.page.selenium import aquisicao
+from app.page.selenium.aquisicao import Disjuntor, DisjuntorAberto, EndpointSelenoid, adquirir_driver
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Relógio falso: `time.sleep` apenas avança `time.monotonic`."""
+    agora = [0.0]
+    monkeypatch.setattr(aquisicao.time, "monotonic", lambda: agora[0])
+    monkeypatch.setattr(aquisicao.time, "sleep", lambda segundos: agora.__setitem__(0, agora[0] + segundos))
+    return agora
+
+
+def endpoint(monkeypatch, status_ok: bool) -> EndpointSelenoid:
+    monkeypatch.setattr(EndpointSelenoid, "capacidade", lambda self, atualizar=False: 2 if status_ok else None)
+    return EndpointSelenoid("http://selenoid:4444/wd/hub")
+
+
+def falhar(mensagem: str):
+    chamadas = []
+
+    def criar(url):
+        chamadas.append(url)
+        raise RuntimeError(mensagem)
+
+    return criar, chamadas
+
+
+@pytest.mark.parametrize("mensagem, status_ok", [("Queue is full", False), ("session not created", True)])
+def test_selenoid_ocupado_nao_abre_o_disjuntor(relogio, monkeypatch, mensagem, status_ok):
+    selenoid = endpoint(monkeypatch, status_ok)
+    criar, chamadas = falhar(mensagem)
+
+    with pytest.raises(RuntimeError) as erro:
+        adquirir_driver(criar, tentativas=6, endpoints=[selenoid])
+
+    assert not isinstance(erro.value, DisjuntorAberto)
+    assert len(chamadas) == 6
+    assert selenoid.disjuntor.estado == Disjuntor.FECHADO
+
+
+def test_selenoid_fora_do_ar_aguarda_a_reabertura_ate_a_ultima_tentativa(relogio, monkeypatch):
+    selenoid = endpoint(monkeypatch, status_ok=False)
+    criar, chamadas = falhar("connection refused")
+
+    with pytest.raises(DisjuntorAberto):
+        adquirir_driver(criar, tentativas=8, endpoints=[selenoid])
+
+    # 3 falhas abrem o disjuntor; depois, uma tentativa de teste a cada reabertura.
+    assert len(chamadas) > selenoid.disjuntor.falhas_para_abrir
+    assert relogio[0] >= selenoid.disjuntor.aberto_segundos
+
+
+def test_selenoid_volta_durante_a_espera(relogio, monkeypatch):
+    selenoid = endpoint(monkeypatch, status_ok=False)
+    chamadas = []
+
+    def criar(url):
+        chamadas.append(url)
+        if len(chamadas) <= 3:
+            raise RuntimeError("connection refused")
+        return "driver"
+
+    assert adquirir_driver(criar, tentativas=6, endpoints=[selenoid]) == "driver"
+    assert selenoid.disjuntor.estado == Disjuntor.FECHADO
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.page.selenium import downloads as modulo
+from app.page.selenium.downloads import GerenciadorDownloads
+
+URL_SESSAO = "http://selenoid:4444/download/abc123/"
+
+
+class SelenoidFalso:
+    """Endpoint `/download/<sessão>/` do Selenoid: HTML sem `?json`, lista de nomes com `?json`."""
+
+    def __init__(self, arquivos: dict[str, int]):
+        self.arquivos = arquivos
+        self.listagens = []
+        # Alterações aplicadas aos arquivos a cada listagem (simula o andamento do download).
+        self.eventos = []
+        # Arquivos cujo HEAD falha (ex.: sendo renomeados).
+        self.falhas_head: set[str] = set()
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.listagens.append((url, params))
+        if self.eventos:
+            self.eventos.pop(0)(self.arquivos)
+        if params is None or "json" not in params:
+            return SimpleNamespace(status_code=200, raise_for_status=lambda: None,
+                                   json=lambda: pytest.fail("listagem sem ?json é HTML"))
+        return SimpleNamespace(status_code=200, raise_for_status=lambda: None, json=lambda: list(self.arquivos))
+
+    def head(self, url, timeout=None):
+        nome = url.rsplit("/", 1)[-1]
+        if nome in self.falhas_head:
+            self.falhas_head.discard(nome)
+            raise modulo.requests.ConnectionError(f"falha ao consultar {nome}")
+        return SimpleNamespace(ok=nome in self.arquivos, headers={"Content-Length": str(self.arquivos.get(nome, 0))})
+
+
+@pytest.fixture
+def selenoid(monkeypatch):
+    falso = SelenoidFalso({})
+    monkeypatch.setattr(modulo.requests, "get", falso.get)
+    monkeypatch.setattr(modulo.requests, "head", falso.head)
+    monkeypatch.setattr(modulo, "DOWNLOAD_POLL_SEGUNDOS", 0)
+    return falso
+
+
+def gerenciador() -> GerenciadorDownloads:
+    return GerenciadorDownloads(SimpleNamespace(session_id="abc123"), url_selenoid="http://selenoid:4444/wd/hub")
+
+
+def test_listar_remoto_usa_listagem_json(selenoid):
+    selenoid.arquivos.update({"relatorio.xlsx": 2048, "outro.pdf.crdownload": 10})
+
+    assert gerenciador().listar() == {"relatorio.xlsx": 2048, "outro.pdf.crdownload": -1}
+    assert selenoid.listagens == [(URL_SESSAO, {"json": ""})]
+
+
+def test_listar_remoto_sessao_sem_downloads(monkeypatch):
+    monkeypatch.setattr(modulo.requests, "get", lambda *args, **kwargs: SimpleNamespace(status_code=404))
+
+    assert gerenciador().listar() == {}
+
+
+def test_aguardar_remoto_ignora_parciais_e_arquivos_anteriores(selenoid):
+    selenoid.arquivos.update({"antigo.csv": 5})
+    downloads = gerenciador()
+    downloads.marcar()
+    selenoid.eventos = [
+        lambda arquivos: arquivos.update({"novo.csv.crdownload": 100}),
+        lambda arquivos: arquivos.update({"novo.csv": 300, "novo.csv.crdownload": 300}),
+        lambda arquivos: arquivos.pop("novo.csv.crdownload"),
+    ]
+
+    assert downloads.aguardar(estabilidade=0, timeout=5) == ["novo.csv"]
+
+
+def test_aguardar_remoto_continua_apos_falhas_transitorias(selenoid):
+    downloads = gerenciador()
+    downloads.marcar()
+
+    def falhar_listagem(_arquivos):
+        raise modulo.requests.ConnectionError("selenoid indisponível")
+
+    def concluir_com_falha_no_head(arquivos):
+        arquivos["novo.csv"] = 300
+        selenoid.falhas_head.add("novo.csv")
+
+    selenoid.eventos = [falhar_listagem, concluir_com_falha_no_head]
+
+    assert downloads.aguardar(estabilidade=0, timeout=5) == ["novo.csv"]
+    assert len(selenoid.listagens) >= 4
+
+
+def test_iniciar_driver_prod_rejeita_pasta_nao_servida_pelo_selenoid():
+    from app.page.selenium import iniciar_driver_prod
+
+    with pytest.raises(ValueError):
+        iniciar_driver_prod(diretorio_download="/tmp/outra")
@@ -0,0 +1,16 @@
+from app.page.selenium.perfil_leve import PerfilLeve
+
+
+def test_bloqueio_de_imagens_usa_padrao_do_usuario_com_excecoes():
+    prefs = PerfilLeve(sites_permitidos=["https://captcha.exemplo.gov.br/login"]).aplicar_preferencias({})
+
+    # O padrão "managed" (política) tem precedência sobre as exceções por site e as anularia.
+    assert "profile.managed_default_content_settings.images" not in prefs
+    assert prefs["profile.default_content_setting_values.images"] == 2
+    assert prefs["profile.content_settings.exceptions.images"] == {"[*.]captcha.exemplo.gov.br,*": {"setting": 1}}
+
+
+def test_sem_bloqueio_de_imagens_nao_altera_imagens():
+    prefs = PerfilLeve(bloquear_imagens=False, sites_permitidos=[]).aplicar_preferencias({})
+
+    assert "profile.default_content_setting_values.images" not in prefs
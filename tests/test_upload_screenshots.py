@@ -0,0 +1,120 @@
+import io
+import sys
+import threading
+import time
+
+import pytest
+
+from app.data.api.blob_local import BlobLocal
+from app.services import upload_screenshots
+from app.services.upload_screenshots import UploaderScreenshots, converter_imagem
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+class BlobInstavel(BlobLocal):
+    """BlobLocal que falha nos primeiros `falhas` envios."""
+
+    def __init__(self, container_name: str, diretorio: str, falhas: int):
+        super().__init__(container_name, diretorio)
+        self.falhas = falhas
+        self.chamadas = 0
+
+    def upload_file(self, nome_arquivo: str, dados: bytes):
+        self.chamadas += 1
+        if self.chamadas <= self.falhas:
+            raise ConnectionError("blob indisponível")
+        super().upload_file(nome_arquivo, dados)
+
+
+@pytest.fixture
+def esperas(monkeypatch):
+    """Registra as esperas do backoff (thread de envio) sem dormir; as demais esperas seguem normais."""
+    registradas = []
+    dormir = time.sleep
+
+    def sleep(segundos):
+        if threading.current_thread().name == "upload-screenshots":
+            registradas.append(segundos)
+        else:
+            dormir(segundos)
+
+    monkeypatch.setattr(upload_screenshots.time, "sleep", sleep)
+    return registradas
+
+
+def _documento(mongo, arquivo):
+    return mongo["arquivos"].find_one({"_id": arquivo.id})
+
+
+def test_converter_imagem_png_mantem_bytes():
+    assert converter_imagem(PNG, "png") == (PNG, "png")
+
+
+def test_converter_imagem_sem_pillow_mantem_png(monkeypatch):
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    assert converter_imagem(PNG, "webp") == (PNG, "png")
+
+
+def test_converter_imagem_jpeg():
+    imagem = pytest.importorskip("PIL.Image")
+    saida = io.BytesIO()
+    imagem.new("RGB", (8, 8), "red").save(saida, format="PNG")
+    dados, extensao = converter_imagem(saida.getvalue(), "jpeg", 50)
+    assert extensao == "jpg"
+    assert dados[:2] == b"\xff\xd8"
+
+
+def test_enviar_grava_pendente_e_marca_enviado(mongo, tmp_path):
+    blob = BlobLocal("screenshots", str(tmp_path))
+    uploader = UploaderScreenshots(blob=blob)
+
+    arquivo = uploader.enviar(PNG, "projeto-20240101")
+
+    assert arquivo is not None
+    assert _documento(mongo, arquivo)["status_upload"] in ("PENDENTE", "ENVIADO")
+    assert uploader.descarregar(5)
+    documento = _documento(mongo, arquivo)
+    assert documento["status_upload"] == "ENVIADO"
+    assert documento["nome_arquivo"] == "projeto-20240101.png"
+    assert documento["blob_connection_string"] == blob.connection_string
+    assert blob.download_file("projeto-20240101.png") == PNG
+    # A thread de envio não altera a instância devolvida.
+    assert arquivo.status_upload == "PENDENTE"
+
+
+def test_enviar_tenta_novamente_com_backoff(mongo, tmp_path, esperas, monkeypatch):
+    monkeypatch.setattr(upload_screenshots, "SCREENSHOT_UPLOAD_BACKOFF_SEGUNDOS", 2)
+    blob = BlobInstavel("screenshots", str(tmp_path), falhas=2)
+    uploader = UploaderScreenshots(tentativas=3, blob=blob)
+
+    arquivo = uploader.enviar(PNG, "instavel")
+
+    assert uploader.descarregar(5)
+    assert blob.chamadas == 3
+    assert esperas == [2, 4]
+    assert _documento(mongo, arquivo)["status_upload"] == "ENVIADO"
+
+
+def test_enviar_marca_falhou_apos_esgotar_tentativas(mongo, tmp_path, esperas):
+    blob = BlobInstavel("screenshots", str(tmp_path), falhas=10)
+    uploader = UploaderScreenshots(tentativas=2, blob=blob)
+
+    arquivo = uploader.enviar(PNG, "fora-do-ar")
+
+    assert uploader.descarregar(5)
+    assert blob.chamadas == 2
+    assert len(esperas) == 1
+    documento = _documento(mongo, arquivo)
+    assert documento["status_upload"] == "FALHOU"
+    assert "blob indisponível" in documento["erro_upload"]
+
+
+def test_enviar_com_fila_cheia_descarta(mongo, tmp_path, monkeypatch):
+    uploader = UploaderScreenshots(tamanho_fila=1, blob=BlobLocal("screenshots", str(tmp_path)))
+    # Sem a thread de envio, a primeira captura ocupa a única vaga da fila.
+    monkeypatch.setattr(uploader, "_iniciar", lambda: None)
+
+    assert uploader.enviar(PNG, "primeiro") is not None
+    assert uploader.enviar(PNG, "segundo") is None
+    assert mongo["arquivos"].count_documents({}) == 1
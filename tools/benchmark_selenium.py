@@ -0,0 +1,273 @@
+"""
+Benchmark offline dos helpers de página do Selenium (`IdAbstract`, `XpathAbstract`, `CssSelectorAbstract`,
+`ClassNameAbstract` e a leitura de tabelas).
+
+Serve as páginas de `tools/fixtures_benchmark` (formulário, renderização lenta, select dinâmico e
+tabela grande) em um servidor HTTP local, abre um Chrome headless local e executa cada caso
+algumas vezes, reportando a latência (mediana e p95) e as idas e voltas ao driver por chamada,
+medidas pela instrumentação da sessão (`app.page.selenium.instrumentacao`). Não usa o Selenoid,
+permitindo comparar alterações de espera e de leitura em lote antes e depois, na própria máquina.
+
+Uso:
+    python tools/benchmark_selenium.py
+    python tools/benchmark_selenium.py --filtro xpath --repeticoes 10
+    python tools/benchmark_selenium.py --salvar antes.json
+    python tools/benchmark_selenium.py --comparar antes.json --page-load-strategy eager
+"""
+import argparse
+import functools
+import json
+import logging
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_FIXTURES = os.path.join(RAIZ_PROJETO, "tools", "fixtures_benchmark")
+
+
+class _ManipuladorSilencioso(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def servidor_fixtures(diretorio: str = DIRETORIO_FIXTURES) -> Iterator[str]:
+    """
+    Serve as páginas de teste em uma porta livre de 127.0.0.1 durante o bloco.
+
+    Args:
+        diretorio (str): Pasta com as páginas. Default é `tools/fixtures_benchmark`.
+
+    Yields:
+        str: URL base do servidor (ex.: http://127.0.0.1:51234).
+    """
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_ManipuladorSilencioso, directory=diretorio))
+    thread = threading.Thread(target=servidor.serve_forever, name="benchmark-fixtures", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+class Caso:
+    """
+    Um caso do benchmark: a página aberta antes de cada repetição e a ação medida.
+
+    Atributos:
+        grupo (str): Mixin (ou recurso) exercitado, usado no relatório e no `--filtro`.
+        nome (str): Descrição do caso.
+        pagina (str): Página de `tools/fixtures_benchmark`, com a query string (ex.: "lento.html?atraso=800").
+        acao (Callable): Recebe a página (`SeleniumAbstract`) e executa o(s) helper(s) medido(s).
+    """
+
+    __slots__ = ("grupo", "nome", "pagina", "acao")
+
+    def __init__(self, grupo: str, nome: str, pagina: str, acao: Callable):
+        self.grupo = grupo
+        self.nome = nome
+        self.pagina = pagina
+        self.acao = acao
+
+
+def _ler_celulas(pagina, linhas: int, colunas: int) -> list[list[str]]:
+    return [[pagina._obter_texto_por_xpath(f"//table[@id='tabela']/tbody/tr[{linha}]/td[{coluna}]")
+             for coluna in range(1, colunas + 1)] for linha in range(1, linhas + 1)]
+
+
+def _ler_celulas_em_lote(pagina) -> list[dict]:
+    from selenium.webdriver.common.by import By
+
+    from app.page.selenium.lote import ConsultaDom
+
+    return pagina._consultar_lote([ConsultaDom("celulas", By.CSS_SELECTOR, "#tabela tbody td", ("texto",), todos=True)])["celulas"]
+
+
+def montar_casos(atraso_ms: int = 800, linhas_tabela: int = 200) -> list[Caso]:
+    """
+    Casos cobrindo os helpers mais usados dos fluxos, por estratégia de localização.
+
+    Args:
+        atraso_ms (int): Atraso da renderização das páginas lentas e do select dinâmico, em ms.
+        linhas_tabela (int): Linhas da tabela grande.
+
+    Returns:
+        list[Caso]: Os casos, na ordem do relatório.
+    """
+    from selenium.webdriver.common.by import By
+
+    formulario = "formulario.html"
+    lento = f"lento.html?atraso={atraso_ms}"
+    select = f"select_dinamico.html?atraso={atraso_ms}"
+    tabela = f"tabela.html?linhas={linhas_tabela}&colunas=8"
+    return [
+        Caso("id", "_preencher_input_por_id", formulario, lambda p: p._preencher_input_por_id("nome", "Fulano de Tal")),
+        Caso("id", "_click_por_id", formulario, lambda p: p._click_por_id("btnEnviar")),
+        Caso("id", "_obter_texto_por_id", formulario, lambda p: p._obter_texto_por_id("titulo")),
+        Caso("id", "_verificar_texto_por_id", formulario, lambda p: p._verificar_texto_por_id("titulo", "Formulário de Teste")),
+        Caso("id", "_selecionar_valor_por_id", formulario, lambda p: p._selecionar_valor_por_id("uf", "PR")),
+        Caso("id", "_existe_id (renderização lenta)", lento, lambda p: p._existe_id("atrasado")),
+        Caso("id", "_esperar_elemento_visivel_por_id (renderização lenta)", lento, lambda p: p._esperar_elemento_visivel_por_id("atrasado")),
+        Caso("id", "_selecionar_option_por_id_visible_text_loop (select dinâmico)", select,
+             lambda p: p._selecionar_option_por_id_visible_text_loop("uf", "Paraná") is None),
+        Caso("xpath", "_preencher_input_por_xpath", formulario, lambda p: p._preencher_input_por_xpath("//input[@name='nome']", "Fulano de Tal")),
+        Caso("xpath", "_click_por_xpath", formulario, lambda p: p._click_por_xpath("//button[@id='btnEnviar']")),
+        Caso("xpath", "_obter_texto_por_xpath", formulario, lambda p: p._obter_texto_por_xpath("//h1")),
+        Caso("xpath", "_existe_xpath", formulario, lambda p: p._existe_xpath("//input[@name='nome']")),
+        Caso("xpath", "_esperar_elemento_visivel_por_xpath (renderização lenta)", lento,
+             lambda p: p._esperar_elemento_visivel_por_xpath("//div[@id='atrasado']")),
+        Caso("css", "_preencher_input_por_css_selector", formulario, lambda p: p._preencher_input_por_css_selector("#nome", "Fulano de Tal")),
+        Caso("css", "_obter_texto_por_css_selector", formulario, lambda p: p._obter_texto_por_css_selector("#titulo")),
+        Caso("css", "_existe_css_selector_text", formulario, lambda p: p._existe_css_selector_text("li.item", "Item 25")),
+        Caso("css", "_esperar_elemento_visivel_por_css_selector (renderização lenta)", lento,
+             lambda p: p._esperar_elemento_visivel_por_css_selector("#atrasado")),
+        Caso("class", "_click_por_class", formulario, lambda p: p._click_por_class("botao")),
+        Caso("class", "_obter_texto_por_class", formulario, lambda p: p._obter_texto_por_class("titulo")),
+        Caso("class", "_verificar_texto_por_class", formulario, lambda p: p._verificar_texto_por_class("item", "Item 25")),
+        Caso("class", "_esperar_elemento_visivel_por_class (renderização lenta)", lento,
+             lambda p: p._esperar_elemento_visivel_por_class("atrasado")),
+        Caso("tabela", f"_extrair_tabela ({linhas_tabela}x8)", tabela, lambda p: len(p._extrair_tabela(By.ID, "grade")) == linhas_tabela),
+        Caso("tabela", f"_consultar_lote ({linhas_tabela}x8 células)", tabela, lambda p: len(_ler_celulas_em_lote(p)) == linhas_tabela * 8),
+        Caso("tabela", "_obter_texto_por_xpath célula a célula (20x8)", tabela, lambda p: all(all(linha) for linha in _ler_celulas(p, 20, 8))),
+    ]
+
+
+def _percentil(valores: list[float], percentil: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, max(0, math.ceil(percentil / 100 * len(ordenados)) - 1))]
+
+
+def medir_caso(pagina, url_base: str, caso: Caso, repeticoes: int) -> dict:
+    """
+    Executa o caso `repeticoes` vezes, reabrindo a página antes de cada uma (fora da medição).
+
+    Args:
+        pagina (SeleniumAbstract): Página ligada a uma sessão instrumentada.
+        url_base (str): URL do servidor de fixtures.
+        caso (Caso): Caso medido.
+        repeticoes (int): Quantidade de execuções.
+
+    Returns:
+        dict: grupo, caso, mediana_ms, p95_ms, espera_ms (mediana do tempo em `WebDriverWait`),
+        idas_e_voltas (comandos WebDriver por execução, mediana) e falhas.
+    """
+    instrumentacao = pagina.webbot.instrumentacao
+    tempos, esperas, comandos, falhas = [], [], [], 0
+    for _ in range(repeticoes):
+        pagina._abrir_pagina(f"{url_base}/{caso.pagina}", aguardar="documento")
+        instrumentacao.reiniciar()
+        inicio = time.perf_counter()
+        try:
+            if not caso.acao(pagina):
+                falhas += 1
+        except Exception as e:
+            logging.warning("%s: %s", caso.nome, e)
+            falhas += 1
+        tempos.append(time.perf_counter() - inicio)
+        helpers = instrumentacao.resumo()["helpers"].values()
+        esperas.append(sum(dados["espera_segundos"] for dados in helpers))
+        comandos.append(sum(dados["comandos"] + dados["comandos_na_espera"] for dados in helpers))
+    return {
+        "grupo": caso.grupo,
+        "caso": caso.nome,
+        "mediana_ms": round(statistics.median(tempos) * 1000, 1),
+        "p95_ms": round(_percentil(tempos, 95) * 1000, 1),
+        "espera_ms": round(statistics.median(esperas) * 1000, 1),
+        "idas_e_voltas": statistics.median(comandos),
+        "falhas": falhas,
+    }
+
+
+def executar_benchmark(casos: list[Caso], repeticoes: int = 5, page_load_strategy: str = None, headless: bool = True) -> list[dict]:
+    """
+    Sobe o servidor de fixtures e um Chrome local e mede todos os casos na mesma sessão.
+
+    Args:
+        casos (list[Caso]): Casos medidos.
+        repeticoes (int): Execuções por caso.
+        page_load_strategy (str, optional): "normal", "eager" ou "none". Default é `SELENIUM_PAGE_LOAD_STRATEGY`.
+        headless (bool): Se True, o Chrome roda sem janela.
+
+    Returns:
+        list[dict]: O resultado de `medir_caso` para cada caso.
+    """
+    from app.page.selenium import SeleniumAbstract, iniciar_driver_local
+    from app.page.selenium.instrumentacao import instrumentar_driver
+
+    with servidor_fixtures() as url_base:
+        driver = instrumentar_driver(iniciar_driver_local(headless=headless, perfil_leve=False, page_load_strategy=page_load_strategy))
+        try:
+            pagina = SeleniumAbstract(driver, "Benchmark Selenium")
+            return [medir_caso(pagina, url_base, caso, repeticoes) for caso in casos]
+        finally:
+            driver.quit()
+
+
+def imprimir_relatorio(resultados: list[dict], referencia: list[dict] = None):
+    """Imprime a tabela de resultados; com `referencia`, inclui a variação da mediana e das idas e voltas."""
+    anteriores = {resultado["caso"]: resultado for resultado in referencia or []}
+    cabecalho = f"{'grupo':<7} {'caso':<66} {'mediana ms':>11} {'p95 ms':>9} {'espera ms':>10} {'comandos':>9}"
+    if anteriores:
+        cabecalho += f" {'Δ mediana':>10} {'Δ comandos':>11}"
+    print(cabecalho)
+    for resultado in resultados:
+        linha = (f"{resultado['grupo']:<7} {resultado['caso'][:66]:<66} {resultado['mediana_ms']:>11.1f} {resultado['p95_ms']:>9.1f} "
+                 f"{resultado['espera_ms']:>10.1f} {resultado['idas_e_voltas']:>9g}")
+        anterior = anteriores.get(resultado["caso"])
+        if anterior:
+            variacao = (resultado["mediana_ms"] / anterior["mediana_ms"] - 1) * 100 if anterior["mediana_ms"] else 0.0
+            linha += f" {variacao:>+9.0f}% {resultado['idas_e_voltas'] - anterior['idas_e_voltas']:>+11g}"
+        if resultado["falhas"]:
+            linha += f"  ({resultado['falhas']} falha(s))"
+        print(linha)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline dos helpers Selenium com um Chrome local.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções por caso. Default é 5.")
+    parser.add_argument("--filtro", help="Executa apenas os casos cujo grupo ou nome contém o texto (ex.: xpath, tabela).")
+    parser.add_argument("--page-load-strategy", choices=("normal", "eager", "none"), help="Estratégia de carregamento da sessão.")
+    parser.add_argument("--atraso", type=int, default=800, help="Atraso das páginas lentas e do select dinâmico, em ms. Default é 800.")
+    parser.add_argument("--linhas-tabela", type=int, default=200, help="Linhas da tabela grande. Default é 200.")
+    parser.add_argument("--janela", action="store_true", help="Abre o Chrome com janela (sem headless).")
+    parser.add_argument("--salvar", help="Grava os resultados em JSON, para comparar depois.")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior (--salvar) para comparar.")
+    args = parser.parse_args()
+
+    # O FastAPI exige uma versão para montar o OpenAPI
+    os.environ.setdefault("VERSION", "0.0.0")
+    sys.path.insert(0, RAIZ_PROJETO)
+    logging.basicConfig(level=logging.WARNING)
+
+    casos = montar_casos(args.atraso, args.linhas_tabela)
+    if args.filtro:
+        filtro = args.filtro.lower()
+        casos = [caso for caso in casos if filtro in caso.grupo or filtro in caso.nome.lower()]
+    if not casos:
+        parser.error(f"nenhum caso corresponde ao filtro '{args.filtro}'")
+
+    referencia = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            referencia = json.load(arquivo)["resultados"]
+
+    resultados = executar_benchmark(casos, args.repeticoes, args.page_load_strategy, headless=not args.janela)
+    print(f"{len(casos)} casos, {args.repeticoes} repetições, page_load_strategy={args.page_load_strategy or 'padrão'}")
+    imprimir_relatorio(resultados, referencia)
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump({"page_load_strategy": args.page_load_strategy, "repeticoes": args.repeticoes, "resultados": resultados},
+                      arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
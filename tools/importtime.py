@@ -0,0 +1,69 @@
+"""
+Relatório de tempo de importação de um módulo da aplicação.
+
+Executa `python -X importtime -c "import <modulo>"` em um processo separado e lista
+os módulos com maior tempo acumulado, permitindo comparar o custo de inicialização
+antes e depois de uma alteração.
+
+Uso:
+    python tools/importtime.py                 # mede "import app"
+    python tools/importtime.py app.page.selenium --top 30
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_importacao(modulo: str) -> list[tuple[int, int, str]]:
+    """
+    Mede o tempo de importação de um módulo em um interpretador novo.
+
+    Args:
+        modulo (str): Nome do módulo a ser importado.
+
+    Returns:
+        list[tuple[int, int, str]]: Lista de (tempo próprio em µs, tempo acumulado em µs, módulo).
+
+    Raises:
+        RuntimeError: Se a importação falhar no processo filho.
+    """
+    env = dict(os.environ)
+    # O FastAPI exige uma versão para montar o OpenAPI
+    env.setdefault("VERSION", "0.0.0")
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                              cwd=RAIZ_PROJETO, env=env, capture_output=True, text=True)
+    if processo.returncode != 0:
+        raise RuntimeError(f"Erro ao importar '{modulo}':\n{processo.stderr[-2000:]}")
+
+    linhas = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|", 2)
+        linhas.append((int(proprio), int(acumulado), nome.rstrip()))
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório de tempo de importação (-X importtime).")
+    parser.add_argument("modulo", nargs="?", default="app", help="Módulo a ser medido. Default é 'app'.")
+    parser.add_argument("--top", type=int, default=20, help="Quantidade de módulos listados. Default é 20.")
+    args = parser.parse_args()
+
+    linhas = medir_importacao(args.modulo)
+    total = max((acumulado for _, acumulado, nome in linhas if nome.strip() == args.modulo), default=0)
+    pesados = [nome.strip() for nome in ("selenium", "azure", "cryptography", "pandas")
+               if any(n.strip() == nome for _, _, n in linhas)]
+
+    print(f"import {args.modulo}: {total / 1000:.1f} ms ({len(linhas)} módulos)")
+    print(f"subsistemas pesados carregados: {', '.join(pesados) or 'nenhum'}")
+    print(f"{'acumulado (ms)':>15} {'próprio (ms)':>13}  módulo")
+    for proprio, acumulado, nome in sorted(linhas, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{acumulado / 1000:>15.1f} {proprio / 1000:>13.1f}  {nome}")
+
+
+if __name__ == "__main__":
+    main()